@@ -0,0 +1,216 @@
+"""Local agenda alignment for transcript segments.
+
+Parses the agenda into numbered items and routes each timestamped transcript
+line to an agenda item using TF-IDF keyword similarity with a monotonic
+constraint (meetings only move forward through the agenda). The first segment
+routed to an item gives that section's start time, so section timestamps are
+deterministic instead of inferred by the model.
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sample_index import tokenize
+
+# Numbered agenda lines: "1. Opening", "2) Old Business", "\t3.\tClosing"
+_ITEM_RE = re.compile(r'^\s*(\d+)[.)]\s+(.+)$')
+# Markdown headers: "## 2. Opening (7:32 PM)" or "## Old Business"
+_HEADER_RE = re.compile(r'^#{1,3}\s+(?:(\d+)[.)]\s+)?(.+?)\s*$')
+# Timestamped transcript lines: "[7:34 PM] text" or "[00:01:23.456] text"
+_SEGMENT_RE = re.compile(r'^\[(\d{1,2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:\s*[AP]M)?)\]\s*(.*)$')
+
+# A segment must score at least this much against an item to move to it
+MIN_SCORE = 0.2
+# ...and beat the current item by this margin
+SWITCH_MARGIN = 0.05
+# How many agenda items may be skipped in one jump, and the score cost per skip
+MAX_SKIP = 3
+SKIP_PENALTY = 0.15
+# Lines pooled with each line when scoring: short lines say little, and a
+# topic change should hold for a few lines rather than a single mention
+LOOK_BEHIND = 1
+LOOK_AHEAD = 4
+
+
+@dataclass
+class AgendaItem:
+    """A top-level numbered agenda item."""
+    number: str
+    title: str
+    body: list[str] = field(default_factory=list)
+    start_time: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        return "\n".join([self.title] + self.body)
+
+    @property
+    def label(self) -> str:
+        return f"{self.number}. {self.title}"
+
+
+def parse_agenda(agenda_text: str) -> list[AgendaItem]:
+    """Split agenda text into numbered top-level items with their sub-points."""
+    items: list[AgendaItem] = []
+    lines = agenda_text.splitlines()
+
+    for line in lines:
+        match = _ITEM_RE.match(line)
+        if match and not line.startswith((" " * 4, "\t\t")):
+            items.append(AgendaItem(number=match.group(1), title=match.group(2).strip()))
+        elif items and line.strip():
+            items[-1].body.append(line.strip())
+
+    if items:
+        return items
+
+    # Fall back to markdown headers
+    for line in lines:
+        match = _HEADER_RE.match(line)
+        if match:
+            number = match.group(1) or str(len(items) + 1)
+            items.append(AgendaItem(number=number, title=match.group(2).strip()))
+        elif items and line.strip():
+            items[-1].body.append(line.strip())
+
+    return items
+
+
+def parse_segments(timestamped_text: str) -> list[tuple[Optional[str], str]]:
+    """Split timestamped transcript into (timestamp, text) pairs."""
+    segments = []
+    for line in timestamped_text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        match = _SEGMENT_RE.match(line)
+        if match:
+            segments.append((match.group(1), match.group(2)))
+        else:
+            segments.append((None, line))
+    return segments
+
+
+class AgendaAligner:
+    """Routes transcript segments to agenda items, keeping state across chunks."""
+
+    def __init__(self, agenda_text: str):
+        self.items = parse_agenda(agenda_text)
+        self.current = 0
+
+        # TF-IDF weights per item, with agenda items as the document collection
+        item_tokens = [Counter(tokenize(item.text)) for item in self.items]
+        doc_freq = Counter()
+        for tokens in item_tokens:
+            doc_freq.update(tokens.keys())
+        n_items = len(self.items) or 1
+        self._idf = {t: math.log(1 + n_items / df) for t, df in doc_freq.items()}
+        self._weights = []
+        for tokens in item_tokens:
+            weights = {t: (1 + math.log(c)) * self._idf[t] for t, c in tokens.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            self._weights.append({t: w / norm for t, w in weights.items()})
+
+    @property
+    def enabled(self) -> bool:
+        return len(self.items) > 1
+
+    def _score(self, tokens: Counter, index: int) -> float:
+        if not tokens:
+            return 0.0
+        weights = self._weights[index]
+        dot = sum((1 + math.log(c)) * self._idf.get(t, 0) * weights.get(t, 0)
+                  for t, c in tokens.items())
+        norm = math.sqrt(sum(((1 + math.log(c)) * self._idf.get(t, 0)) ** 2
+                             for t, c in tokens.items())) or 1.0
+        return dot / norm
+
+    def align(self, timestamped_text: str) -> list[tuple[int, list[str]]]:
+        """
+        Assign each transcript line to an agenda item.
+
+        Returns consecutive (item_index, lines) groups in transcript order and
+        records each item's start time the first time it is entered.
+        """
+        segments = parse_segments(timestamped_text)
+        if not self.enabled or not segments:
+            return [(self.current, [self._format(ts, text) for ts, text in segments])] if segments else []
+
+        tokens = [Counter(tokenize(text)) for _, text in segments]
+        groups: list[tuple[int, list[str]]] = []
+
+        for i, (ts, text) in enumerate(segments):
+            window = Counter()
+            for j in range(max(0, i - LOOK_BEHIND), min(len(segments), i + LOOK_AHEAD + 1)):
+                window.update(tokens[j])
+
+            current_score = self._score(window, self.current)
+            best, best_score = self.current, current_score
+            last = min(len(self.items) - 1, self.current + MAX_SKIP)
+            for candidate in range(self.current + 1, last + 1):
+                score = self._score(window, candidate)
+                score -= SKIP_PENALTY * (candidate - self.current - 1)
+                if score > best_score:
+                    best, best_score = candidate, score
+
+            # Switch only on a line that itself mentions the new topic, so the
+            # look-ahead doesn't pull section start times too early
+            if (best != self.current and best_score >= MIN_SCORE
+                    and best_score >= current_score + SWITCH_MARGIN
+                    and self._score(tokens[i], best) > 0):
+                self.current = best
+
+            item = self.items[self.current]
+            if item.start_time is None and ts:
+                item.start_time = ts
+
+            line = self._format(ts, text)
+            if groups and groups[-1][0] == self.current:
+                groups[-1][1].append(line)
+            else:
+                groups.append((self.current, [line]))
+
+        return groups
+
+    @staticmethod
+    def _format(ts: Optional[str], text: str) -> str:
+        return f"[{ts}] {text}" if ts else text
+
+    def section_times(self) -> list[tuple[AgendaItem, str]]:
+        """Agenda items that have started, with their start times."""
+        return [(item, item.start_time) for item in self.items if item.start_time]
+
+    def outline(self) -> str:
+        """Compact one-line-per-item agenda outline."""
+        return "\n".join(item.label for item in self.items)
+
+    def apply_section_times(self, minutes: str) -> str:
+        """Add locally computed start times to section headers that lack one.
+
+        Headers are matched to agenda items by title words, since minutes
+        often number their sections differently from the agenda.
+        """
+        started = [(set(tokenize(item.title)), item.start_time)
+                   for item in self.items if item.start_time]
+        if not started:
+            return minutes
+
+        out = []
+        for line in minutes.splitlines():
+            match = re.match(r'^#{2,3}\s+(?:[\dA-Z]+[.)]\s+)?(.+?)\s*$', line)
+            if match and not re.search(r'\(\d{1,2}:\d{2}', line):
+                header = set(tokenize(match.group(1)))
+                best, best_overlap = None, 0.5
+                for title, start in started:
+                    if not title or not header:
+                        continue
+                    overlap = len(title & header) / len(title | header)
+                    if overlap >= best_overlap:
+                        best, best_overlap = start, overlap
+                if best:
+                    line = f"{line.rstrip()} ({best})"
+            out.append(line)
+        return "\n".join(out) + ("\n" if minutes.endswith("\n") else "")
@@ -0,0 +1,305 @@
+"""Audio archiving and retention.
+
+Raw 16 kHz/16-bit mono is about 115 MB per hour, and each session stores it
+twice (chunks plus full_session_backup.wav). Once a session is finished
+and older than ARCHIVE_AFTER_DAYS, its WAVs are transcoded at low CPU
+priority to FLAC (lossless, ~2-3x smaller) or Opus (speech-grade, ~10x+),
+verified by decoding them again, and only then are the WAVs removed.
+
+Each archived session gets an archive.json manifest:
+
+    {"chunk_0000.wav": {"file": "chunk_0000.flac", "format": "flac",
+                        "frames": 4800000, "rate": 16000, "wav_bytes": 9600044, "bytes": 3110410}}
+
+Anything that reads chunk audio goes through open_wav(), which decodes an
+archived chunk to a temporary WAV on demand, so transcribe/resume work on
+archived sessions unchanged.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import wave
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator, Optional
+
+import catalog
+import config
+
+FORMATS = {"flac": ".flac", "opus": ".opus"}
+MANIFEST = "archive.json"
+
+
+def _low_priority():
+    """Run transcoders niced so archiving never competes with a live recording."""
+    try:
+        os.nice(config.ARCHIVE_NICE)
+    except OSError:
+        pass
+
+
+def _run(cmd: list[str]):
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=3600, preexec_fn=_low_priority)
+    if result.returncode != 0:
+        raise RuntimeError(f"{Path(cmd[0]).name} failed: {result.stderr.strip()[:200]}")
+
+
+def encode(source: Path, dest: Path, fmt: str):
+    """Transcode a WAV to FLAC (sox) or Opus (ffmpeg, else opusenc)."""
+    if fmt == "flac":
+        _run([config.SOX_BIN, str(source), "-C", "8", str(dest)])
+    elif shutil.which("ffmpeg"):
+        _run(["ffmpeg", "-nostdin", "-y", "-loglevel", "error", "-i", str(source),
+              "-c:a", "libopus", "-b:a", config.ARCHIVE_OPUS_BITRATE, "-application", "voip", str(dest)])
+    elif shutil.which("opusenc"):
+        _run(["opusenc", "--quiet", "--bitrate", config.ARCHIVE_OPUS_BITRATE.rstrip("k"), str(source), str(dest)])
+    else:
+        raise RuntimeError("Opus archiving needs ffmpeg or opusenc")
+
+
+def decode(source: Path, dest: Path):
+    """Decode an archived file back to 16 kHz mono 16-bit WAV."""
+    if source.suffix == ".opus" and shutil.which("ffmpeg"):
+        cmd = ["ffmpeg", "-nostdin", "-y", "-loglevel", "error", "-i", str(source),
+               "-ar", str(config.SAMPLE_RATE), "-ac", str(config.CHANNELS), str(dest)]
+    else:
+        cmd = [config.SOX_BIN, str(source), "-c", str(config.CHANNELS),
+               "-r", str(config.SAMPLE_RATE), "-b", "16", str(dest)]
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=3600)
+    if result.returncode != 0 or not dest.exists():
+        raise RuntimeError(f"Could not decode {source.name}: {result.stderr.strip()[:200]}")
+
+
+def pcm_digest(path: Path) -> tuple[int, int, str]:
+    """(frames, sample rate, sha256 of the samples) of a WAV."""
+    digest = hashlib.sha256()
+    with wave.open(str(path), "rb") as w:
+        while True:
+            block = w.readframes(65536)
+            if not block:
+                break
+            digest.update(block)
+        return w.getnframes(), w.getframerate(), digest.hexdigest()
+
+
+def load_manifest(session_dir: Path) -> dict:
+    path = session_dir / MANIFEST
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text())
+    except Exception as e:
+        print(f"  [Warning] Could not read {path}: {e}")
+        return {}
+
+
+def _save_manifest(session_dir: Path, manifest: dict):
+    tmp = session_dir / (MANIFEST + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2))
+    os.replace(tmp, session_dir / MANIFEST)
+
+
+def archive_file(wav: Path, fmt: str) -> dict:
+    """Transcode one WAV and verify the result. Returns its manifest entry; the WAV is untouched."""
+    dest = wav.with_suffix(FORMATS[fmt])
+    frames, rate, digest = pcm_digest(wav)
+    encode(wav, dest, fmt)
+
+    with tempfile.TemporaryDirectory(prefix="minute_bot_archive_") as tmp:
+        check = Path(tmp) / "check.wav"
+        decode(dest, check)
+        decoded_frames, _, decoded_digest = pcm_digest(check)
+
+    # FLAC must round-trip bit for bit; Opus is lossy, so only the length is checked
+    if fmt == "flac":
+        ok = decoded_frames == frames and decoded_digest == digest
+    else:
+        ok = abs(decoded_frames - frames) <= rate * 0.1
+    if not ok:
+        dest.unlink(missing_ok=True)
+        raise RuntimeError(f"{dest.name} failed verification")
+
+    return {"file": dest.name, "format": fmt, "frames": frames, "rate": rate,
+            "wav_bytes": wav.stat().st_size, "bytes": dest.stat().st_size}
+
+
+def archive_session(session_dir: Path, fmt: Optional[str] = None, dry_run: bool = False) -> tuple[int, int]:
+    """Archive every WAV in a session folder. Returns (WAV bytes, archived bytes)."""
+    fmt = fmt or config.ARCHIVE_FORMAT
+    manifest = load_manifest(session_dir)
+    before = after = 0
+    for wav in sorted(session_dir.glob("*.wav")):
+        if dry_run:
+            before += wav.stat().st_size
+            continue
+        try:
+            entry = archive_file(wav, fmt)
+        except Exception as e:
+            print(f"  [Warning] {session_dir.name}/{wav.name}: {e}")
+            continue
+        manifest[wav.name] = entry
+        _save_manifest(session_dir, manifest)  # Before the WAV goes, so the entry is never lost
+        wav.unlink()
+        before += entry["wav_bytes"]
+        after += entry["bytes"]
+    return before, after
+
+
+def _session_time(session_dir: Path) -> Optional[datetime]:
+    try:
+        return datetime.strptime(session_dir.name[:15], "%Y%m%d_%H%M%S")
+    except ValueError:
+        return None
+
+
+def due_sessions(now: Optional[datetime] = None) -> list[Path]:
+    """Finished sessions older than ARCHIVE_AFTER_DAYS that still have raw WAVs."""
+    now = now or datetime.now()
+    if not config.AUDIO_DIR.exists():
+        return []
+    cat = catalog.get()
+    unfinished = {row["id"] for row in cat.sessions(unfinished=True)} if cat.enabled else set()
+
+    due = []
+    for session_dir in sorted(config.AUDIO_DIR.iterdir()):
+        started = _session_time(session_dir) if session_dir.is_dir() else None
+        if started is None or now - started < timedelta(days=config.ARCHIVE_AFTER_DAYS):
+            continue
+        if session_dir.name in unfinished or not any(session_dir.glob("*.wav")):
+            continue
+        # Still being written to (a recording that has run for days, a resume in progress)
+        newest = max(p.stat().st_mtime for p in session_dir.iterdir())
+        if time.time() - newest < 3600:
+            continue
+        due.append(session_dir)
+    return due
+
+
+def apply_retention(now: Optional[datetime] = None, dry_run: bool = False) -> int:
+    """
+    Drop archived chunk audio older than ARCHIVE_CHUNK_RETENTION_DAYS when the
+    session's archived backup covers the whole meeting. Returns bytes freed.
+    """
+    if config.ARCHIVE_CHUNK_RETENTION_DAYS is None or not config.AUDIO_DIR.exists():
+        return 0
+    now = now or datetime.now()
+    freed = 0
+    for session_dir in sorted(config.AUDIO_DIR.iterdir()):
+        started = _session_time(session_dir) if session_dir.is_dir() else None
+        if started is None or now - started < timedelta(days=config.ARCHIVE_CHUNK_RETENTION_DAYS):
+            continue
+        manifest = load_manifest(session_dir)
+        if "full_session_backup.wav" not in manifest:
+            continue
+        for name, entry in list(manifest.items()):
+            path = session_dir / entry["file"]
+            if not name.startswith("chunk_") or not path.exists():
+                continue
+            freed += path.stat().st_size
+            if not dry_run:
+                path.unlink()
+                entry["dropped"] = now.isoformat(timespec="seconds")
+        if not dry_run:
+            _save_manifest(session_dir, manifest)
+    return freed
+
+
+def run(session_ids: Optional[list[str]] = None, fmt: Optional[str] = None, dry_run: bool = False,
+        quiet: bool = False) -> tuple[int, int]:
+    """Archive the given (or all due) sessions and apply retention. Returns (bytes before, after)."""
+    sessions = [config.AUDIO_DIR / s for s in session_ids] if session_ids else due_sessions()
+    total_before = total_after = 0
+    for session_dir in sessions:
+        if not session_dir.is_dir():
+            print(f"No audio found for session {session_dir.name}")
+            continue
+        before, after = archive_session(session_dir, fmt, dry_run)
+        total_before += before
+        total_after += after
+        if before and not quiet:
+            if dry_run:
+                print(f"  {session_dir.name}: {before / 1e6:.1f} MB of WAV to archive")
+            else:
+                print(f"  {session_dir.name}: {before / 1e6:.1f} MB → {after / 1e6:.1f} MB "
+                      f"({before / max(after, 1):.1f}x)")
+
+    freed = apply_retention(dry_run=dry_run)
+    if not quiet:
+        if not total_before:
+            print("No sessions due for archiving.")
+        elif not dry_run:
+            print(f"Archived {total_before / 1e6:.1f} MB → {total_after / 1e6:.1f} MB")
+        if freed:
+            print(f"Retention: {'would free' if dry_run else 'freed'} {freed / 1e6:.1f} MB of archived chunks")
+    return total_before, total_after
+
+
+def start_background(interval: Optional[float] = None) -> threading.Thread:
+    """Archive due sessions periodically on a daemon thread (used by long-running commands)."""
+    interval = interval or config.ARCHIVE_INTERVAL_SECONDS
+
+    def loop():
+        while True:
+            try:
+                run(quiet=True)
+            except Exception as e:
+                print(f"  [Warning] Archiving failed: {e}")
+            time.sleep(interval)
+
+    thread = threading.Thread(target=loop, name="archiver", daemon=True)
+    thread.start()
+    return thread
+
+
+# --- Reading archived audio -------------------------------------------------
+
+def archived_entry(path: Path) -> Optional[dict]:
+    """Manifest entry for a WAV path that has been archived, if its archive still exists."""
+    entry = load_manifest(path.parent).get(path.name)
+    if entry and (path.parent / entry["file"]).exists():
+        return entry
+    return None
+
+
+def audio_seconds(path: Path) -> float:
+    """Duration of a chunk, live or archived (0.0 if unknown)."""
+    if path.exists():
+        from transcriber import wav_duration
+        return wav_duration(path)
+    entry = load_manifest(path.parent).get(path.name)
+    return entry["frames"] / entry["rate"] if entry else 0.0
+
+
+def session_chunks(session_dir: Path) -> list[Path]:
+    """A session's chunk WAV paths, including chunks that now exist only in the archive."""
+    names = {p.name for p in session_dir.glob("chunk_*.wav")}
+    names |= {name for name in load_manifest(session_dir) if name.startswith("chunk_")}
+    return [session_dir / name for name in sorted(names)
+            if (session_dir / name).exists() or archived_entry(session_dir / name)]
+
+
+@contextmanager
+def open_wav(path: Path) -> Iterator[Path]:
+    """Yield a readable WAV for path, decoding it from the archive to a temp file if needed."""
+    if path.exists() and path.suffix.lower() == ".wav":
+        yield path
+        return
+    source = path
+    if not path.exists():
+        entry = archived_entry(path)
+        if entry is None:
+            yield path  # Let the caller report the missing file
+            return
+        source = path.parent / entry["file"]
+
+    with tempfile.TemporaryDirectory(prefix="minute_bot_decode_") as tmp:
+        wav = Path(tmp) / path.with_suffix(".wav").name
+        decode(source, wav)
+        yield wav
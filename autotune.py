@@ -0,0 +1,157 @@
+"""Adaptive chunk length and Whisper model for `record --auto-tune`.
+
+Record mode normally cuts fixed-length chunks and transcribes each with a
+fixed model. With --auto-tune, chunks are processed on a background lane
+while recording continues, and before each new chunk the tuner looks at
+moving averages of:
+
+- transcription real-time factor (whisper seconds per audio second),
+- minutes API latency per update,
+- backlog age (how long the oldest recorded but unprocessed chunk has waited),
+
+and predicts the end-to-end lag of the next chunk:
+
+    lag = chunk + backlog + rtf * chunk + api
+
+The lane keeps up while its utilization, rtf + api / chunk, stays below 1.
+When it doesn't, or the backlog eats into the target lag, the tuner
+lengthens chunks if API latency is the heavy part (fewer calls), otherwise
+steps the model down. When lag is over target only because chunks are long,
+it shortens them. With headroom to spare it steps the model back up (never
+above the one asked for) and returns chunks toward the requested length.
+After a change it waits AUTOTUNE_COOLDOWN_CHUNKS chunks of fresh
+measurements. Every decision is printed and logged to metrics.jsonl
+(stage "autotune").
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import config
+import metrics
+
+# Rough relative whisper cost per audio second, to predict a model's RTF from another's
+MODEL_COST = {"tiny": 1.0, "base": 2.0, "small": 6.0, "medium": 15.0, "large": 30.0}
+
+HIGH_UTILIZATION = 0.9  # Above this the backlog is about to grow
+LOW_UTILIZATION = 0.5  # Below this there is room for a bigger model or shorter chunks
+SAFE_UTILIZATION = 0.75  # A step up must be predicted to stay under this
+SMOOTHING = 0.3  # Weight of the newest sample in the moving averages
+
+
+@dataclass
+class Decision:
+    action: str  # "longer_chunks", "shorter_chunks", "model_down", "model_up"
+    chunk_seconds: int
+    model: str
+    reason: str
+
+
+class AutoTuner:
+    """Chooses chunk length and model between chunks from measured pipeline speed."""
+
+    def __init__(self, chunk_seconds: int, model: str, target_lag: Optional[float] = None,
+                 available_models: Optional[list[str]] = None,
+                 sink: metrics.NullMetrics = metrics.NULL_METRICS):
+        self.preferred_chunk = chunk_seconds
+        self.chunk_seconds = chunk_seconds
+        self.model = model
+        self.target_lag = target_lag or config.AUTOTUNE_TARGET_LAG_SECONDS
+        self.min_chunk = min(config.AUTOTUNE_MIN_CHUNK_SECONDS, chunk_seconds)
+        self.max_chunk = max(config.AUTOTUNE_MAX_CHUNK_SECONDS, chunk_seconds)
+        # Models it may use: the requested one and smaller ones that are installed
+        ladder = [m for m in MODEL_COST if MODEL_COST[m] <= MODEL_COST.get(model, 0)]
+        self.models = [m for m in ladder if available_models is None or m in available_models] or [model]
+        self.sink = sink
+
+        self.rtf: Optional[float] = None
+        self.api: Optional[float] = None
+        self.chunks_since_change = 0
+        self.decisions: list[Decision] = []
+
+    @staticmethod
+    def _average(current: Optional[float], sample: float) -> float:
+        return sample if current is None else current + SMOOTHING * (sample - current)
+
+    def observe_transcription(self, model: str, audio_seconds: float, elapsed: float):
+        """Record one chunk's transcription time (ignored if it used another model)."""
+        if model == self.model and audio_seconds > 0:
+            self.rtf = self._average(self.rtf, elapsed / audio_seconds)
+
+    def observe_minutes(self, elapsed: float):
+        """Record one minutes API call's latency."""
+        self.api = self._average(self.api, elapsed)
+
+    def utilization(self, chunk_seconds: Optional[float] = None, rtf: Optional[float] = None) -> float:
+        chunk_seconds = chunk_seconds or self.chunk_seconds
+        rtf = self.rtf if rtf is None else rtf
+        return (rtf or 0.0) + (self.api or 0.0) / chunk_seconds
+
+    def predicted_lag(self, backlog: float) -> float:
+        return self.chunk_seconds + backlog + (self.rtf or 0.0) * self.chunk_seconds + (self.api or 0.0)
+
+    def _model_step(self, step: int) -> Optional[str]:
+        index = self.models.index(self.model) + step if self.model in self.models else -1
+        return self.models[index] if 0 <= index < len(self.models) else None
+
+    def decide(self, backlog: float) -> Optional[Decision]:
+        """
+        Called before each chunk with the current backlog age in seconds.
+        Returns the change to apply, or None to keep the current settings.
+        """
+        self.chunks_since_change += 1
+        if self.rtf is None or self.chunks_since_change <= config.AUTOTUNE_COOLDOWN_CHUNKS:
+            return None
+
+        chunk, api = self.chunk_seconds, self.api or 0.0
+        load = self.utilization()
+        lag = self.predicted_lag(backlog)
+        status = f"rtf {self.rtf:.2f}, api {api:.1f}s, utilization {load:.2f}, backlog {backlog:.0f}s, lag ~{lag:.0f}s"
+
+        decision = None
+        if load >= HIGH_UTILIZATION or backlog > self.target_lag / 2:
+            # Falling behind: fewer API calls if those are the heavy part, else a faster model
+            smaller = self._model_step(-1)
+            if chunk < self.max_chunk and (api / chunk > self.rtf or smaller is None):
+                decision = self._chunks("longer_chunks", min(self.max_chunk, int(chunk * 1.5)), status)
+            elif smaller:
+                decision = self._switch("model_down", smaller, status)
+        elif lag > self.target_lag and chunk > self.min_chunk:
+            # Keeping up, but waiting for long chunks to fill is most of the lag
+            shorter = max(self.min_chunk, int(chunk / 1.5))
+            if self.utilization(shorter) < HIGH_UTILIZATION:
+                decision = self._chunks("shorter_chunks", shorter, status)
+        elif load < LOW_UTILIZATION and backlog < chunk:
+            # Headroom: win back quality first, then latency
+            bigger = self._model_step(1)
+            predicted_rtf = self.rtf * MODEL_COST[bigger] / MODEL_COST[self.model] if bigger else None
+            if bigger and self.utilization(rtf=predicted_rtf) < SAFE_UTILIZATION:
+                decision = self._switch("model_up", bigger, status)
+            elif chunk > self.preferred_chunk:
+                shorter = max(self.preferred_chunk, int(chunk / 1.5))
+                if self.utilization(shorter) < SAFE_UTILIZATION:
+                    decision = self._chunks("shorter_chunks", shorter, status)
+
+        if decision:
+            self._log(decision, backlog, lag, load)
+        return decision
+
+    def _chunks(self, action: str, seconds: int, status: str) -> Decision:
+        reason = f"{status}: chunks {self.chunk_seconds}s -> {seconds}s"
+        self.chunk_seconds = seconds
+        return Decision(action, seconds, self.model, reason)
+
+    def _switch(self, action: str, model: str, status: str) -> Decision:
+        reason = f"{status}: model {self.model} -> {model}"
+        # Until it is measured, assume the new model's RTF scales with its cost
+        self.rtf = self.rtf * MODEL_COST[model] / MODEL_COST[self.model]
+        self.model = model
+        return Decision(action, self.chunk_seconds, model, reason)
+
+    def _log(self, decision: Decision, backlog: float, lag: float, load: float):
+        self.chunks_since_change = 0
+        self.decisions.append(decision)
+        print(f"  [Auto-tune] {decision.reason}")
+        self.sink.count(metrics.AUTOTUNE, decision.action, chunk_seconds=decision.chunk_seconds,
+                        model=decision.model, backlog=round(backlog, 1), lag=round(lag, 1),
+                        utilization=round(load, 3))
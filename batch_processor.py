@@ -0,0 +1,212 @@
+"""Bulk minutes generation through the Message Batches API.
+
+Offline queues and archive regeneration are packaged into one batch job
+instead of many synchronous calls. Each submitted batch is recorded under
+data/batches/ so a later process can poll it and apply the results.
+"""
+
+import json
+import time
+from datetime import datetime
+from typing import Optional
+
+import catalog
+import config
+from minutes_generator import create_client, open_session, OfflineMinutesStore
+from response_cache import get_cache, request_key
+
+QUEUE = "queue"
+REGENERATE = "regenerate"
+
+
+def _custom_id(session_id: str, kind: str) -> str:
+    return f"{session_id}--{kind}"
+
+
+def _record_path(batch_id: str):
+    return config.BATCHES_DIR / f"{batch_id}.json"
+
+
+def _save_record(record: dict):
+    config.BATCHES_DIR.mkdir(parents=True, exist_ok=True)
+    with open(_record_path(record["batch_id"]), "w") as f:
+        json.dump(record, f, indent=2)
+
+
+def load_records(status: Optional[str] = None) -> list[dict]:
+    """Load persisted batch records, optionally filtered by status."""
+    if not config.BATCHES_DIR.exists():
+        return []
+    records = []
+    for path in sorted(config.BATCHES_DIR.glob("*.json")):
+        with open(path) as f:
+            record = json.load(f)
+        if status is None or record.get("status") == status:
+            records.append(record)
+    return records
+
+
+def _pending_sessions() -> set[str]:
+    """Sessions already in a submitted batch that hasn't been applied yet."""
+    return {item["session_id"]
+            for record in load_records("submitted")
+            for item in record["items"].values()}
+
+
+def queue_requests() -> tuple[list[dict], dict]:
+    """Build one batch request per session with a non-empty offline queue."""
+    requests, items = [], {}
+    busy = _pending_sessions()
+
+    for session_id in catalog.get().queued_sessions():
+        if session_id in busy:
+            print(f"  {session_id}: already in a pending batch, skipping")
+            continue
+
+        queue = OfflineMinutesStore(session_id).load_queue()
+        if not queue:
+            continue
+
+        gen = open_session(session_id)
+        if not gen.current_minutes:
+            gen.current_minutes = gen.template_minutes()
+        prompt = gen.batch_prompt(gen.combine_queue(queue))
+        if not prompt:
+            print(f"  {session_id}: nothing left to add after normalization, clearing queue")
+            OfflineMinutesStore(session_id).clear()
+            continue
+        custom_id = _custom_id(session_id, QUEUE)
+        requests.append({"custom_id": custom_id, "params": gen.request_params(prompt)})
+        items[custom_id] = {"session_id": session_id, "kind": QUEUE, "queued": len(queue)}
+
+    return requests, items
+
+
+def regenerate_requests(session_ids: list[str]) -> tuple[list[dict], dict]:
+    """Build one batch request per session to rebuild its minutes from the full transcript."""
+    requests, items = [], {}
+
+    for session_id in session_ids:
+        transcript_file = config.TRANSCRIPTS_DIR / session_id / "full_transcript.txt"
+        if not transcript_file.exists():
+            print(f"  {session_id}: no transcript found, skipping")
+            continue
+
+        gen = open_session(session_id)
+        gen.current_minutes = gen.template_minutes()
+        prompt = gen.batch_prompt(transcript_file.read_text())
+        if not prompt:
+            print(f"  {session_id}: nothing left after normalization, skipping")
+            continue
+        custom_id = _custom_id(session_id, REGENERATE)
+        requests.append({"custom_id": custom_id, "params": gen.request_params(prompt)})
+        items[custom_id] = {"session_id": session_id, "kind": REGENERATE}
+
+    return requests, items
+
+
+def submit(requests: list[dict], items: dict, client=None) -> Optional[str]:
+    """Submit requests as one batch and persist its record. Returns the batch id."""
+    # Requests answered before need no batch slot
+    cache = get_cache()
+    for request in list(requests):
+        item = items[request["custom_id"]]
+        item["request_key"] = request_key(request["params"])
+        cached = cache.get(request["params"]) if cache else None
+        if cached is not None:
+            _apply_item(item, cached)
+            requests.remove(request)
+            del items[request["custom_id"]]
+
+    if not requests:
+        print("Nothing to submit.")
+        return None
+
+    client = client or create_client()
+    if not client:
+        print("No API client available (set ANTHROPIC_API_KEY).")
+        return None
+
+    batch = client.messages.batches.create(requests=requests)
+    _save_record({
+        "batch_id": batch.id,
+        "status": "submitted",
+        "submitted_at": datetime.now().isoformat(),
+        "items": items,
+    })
+    print(f"Submitted batch {batch.id} with {len(requests)} request(s)")
+    return batch.id
+
+
+def _apply_item(item: dict, minutes_text: str):
+    session_id = item["session_id"]
+    gen = open_session(session_id)
+
+    if item["kind"] == QUEUE:
+        # Only drop the entries that were submitted; anything queued since stays
+        store = OfflineMinutesStore(session_id)
+        queue = store.load_queue()
+        gen.apply_response(minutes_text, [q.get("chunk", -1) for q in queue[:item["queued"]]])
+        remaining = queue[item["queued"]:]
+        if remaining:
+            store.save_queue(remaining)
+        else:
+            store.clear()
+    else:
+        gen.apply_response(minutes_text)
+        if gen.session_end:
+            gen.finalize(ended=gen.session_end)
+
+    print(f"  ✅ {session_id}: minutes updated ({item['kind']}): {gen.minutes_file}")
+
+
+def poll(client=None, wait: bool = False, interval: Optional[float] = None) -> int:
+    """
+    Check submitted batches and apply results of any that have ended.
+    With wait=True, keep polling until every submitted batch is applied.
+    Returns the number of batches still pending.
+    """
+    client = client or create_client()
+    if not client:
+        print("No API client available (set ANTHROPIC_API_KEY).")
+        return len(load_records("submitted"))
+
+    interval = config.BATCH_POLL_SECONDS if interval is None else interval
+    cache = get_cache()
+
+    while True:
+        pending = 0
+        for record in load_records("submitted"):
+            batch = client.messages.batches.retrieve(record["batch_id"])
+            if batch.processing_status != "ended":
+                pending += 1
+                print(f"Batch {record['batch_id']}: {batch.processing_status}")
+                continue
+
+            print(f"Batch {record['batch_id']}: ended, applying results")
+            failed = []
+            for entry in client.messages.batches.results(record["batch_id"]):
+                item = record["items"].get(entry.custom_id)
+                if item is None:
+                    continue
+                if entry.result.type != "succeeded":
+                    failed.append(entry.custom_id)
+                    print(f"  ❌ {item['session_id']}: {entry.result.type}")
+                    continue
+                try:
+                    minutes_text = entry.result.message.content[0].text
+                    if cache and item.get("request_key"):
+                        cache.put_key(item["request_key"], minutes_text)
+                    _apply_item(item, minutes_text)
+                except Exception as e:
+                    failed.append(entry.custom_id)
+                    print(f"  ❌ {item['session_id']}: {e}")
+
+            record["status"] = "applied"
+            record["applied_at"] = datetime.now().isoformat()
+            record["failed"] = failed
+            _save_record(record)
+
+        if not wait or pending == 0:
+            return pending
+        time.sleep(interval)
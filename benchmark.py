@@ -0,0 +1,743 @@
+#!/usr/bin/env python3
+"""
+Performance regression benchmarks.
+
+Usage:
+    python benchmark.py startup             # CLI startup time and import costs
+    python benchmark.py startup --runs 20 --json startup.json
+    python benchmark.py transcription --models tiny,small --threads 4,8 --chunk-seconds 60,300
+    python benchmark.py minutes OCPC/2026-02-10/transcript --reference final.md
+
+startup exits non-zero when a budget is exceeded, so it can run in CI.
+transcription and minutes results are saved under data/benchmarks/ for
+comparison over time (--baseline prints the change against an earlier run).
+"""
+
+import argparse
+import bisect
+import json
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import config
+
+# Commands whose startup is measured, as (label, python args)
+STARTUP_COMMANDS = [
+    ("--help", ["minute_bot.py", "--help"]),
+    ("test-mic imports", ["-c", "import minute_bot, recorder"]),
+    ("transcribe imports", ["-c", "import minute_bot, transcriber"]),
+]
+
+# Modules that must not load before a command needs them
+LAZY_MODULES = ["anthropic", "rich", "numpy", "sounddevice",
+                "minutes_generator", "ui_recorder", "cProfile", "pstats"]
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """Cumulative microseconds per top-level import from `python -X importtime`."""
+    costs = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        # Only count top-level imports; nested ones are included in their parent
+        if name.startswith("  "):
+            continue
+        costs[name.strip()] = int(parts[1])
+    return costs
+
+
+def time_command(args: list[str], runs: int) -> dict:
+    """Run a python command repeatedly; return wall times and one import profile."""
+    walls = []
+    imports = {}
+    for i in range(runs):
+        cmd = [sys.executable] + (["-X", "importtime"] if i == 0 else []) + args
+        started = time.perf_counter()
+        result = subprocess.run(cmd, cwd=config.BASE_DIR, capture_output=True, text=True)
+        elapsed = time.perf_counter() - started
+        if i == 0:
+            imports = parse_importtime(result.stderr)
+        else:
+            # The -X importtime run is slower; keep it out of the timings
+            walls.append(elapsed)
+    return {"walls": walls or [elapsed], "imports": imports}
+
+
+def startup(runs: int, budget_ms: float, json_path: Path = None) -> bool:
+    """Benchmark CLI startup. Returns True if every command is within budget."""
+    baseline = time_command(["-c", "pass"], runs)
+    base_ms = 1000 * statistics.median(baseline["walls"])
+    print(f"Interpreter startup: {base_ms:.1f} ms (median of {runs - 1 or 1})")
+    print(f"Budget: {budget_ms:.0f} ms per command\n")
+
+    ok = True
+    results = {"interpreter_ms": round(base_ms, 1), "budget_ms": budget_ms, "commands": {}}
+    for label, args in STARTUP_COMMANDS:
+        timing = time_command(args, runs)
+        median_ms = 1000 * statistics.median(timing["walls"])
+        best_ms = 1000 * min(timing["walls"])
+        loaded = [m for m in LAZY_MODULES if m in timing["imports"]]
+        passed = median_ms <= budget_ms and not loaded
+        ok = ok and passed
+
+        status = "ok" if passed else "FAIL"
+        print(f"{label:<20} median {median_ms:7.1f} ms   best {best_ms:7.1f} ms   [{status}]")
+        if loaded:
+            print(f"  loaded eagerly: {', '.join(loaded)}")
+        top = sorted(timing["imports"].items(), key=lambda kv: kv[1], reverse=True)[:5]
+        for name, micros in top:
+            print(f"  {micros / 1000:6.1f} ms  {name}")
+
+        results["commands"][label] = {
+            "median_ms": round(median_ms, 1),
+            "best_ms": round(best_ms, 1),
+            "eager_modules": loaded,
+            "top_imports_ms": {name: round(micros / 1000, 1) for name, micros in top},
+            "passed": passed,
+        }
+
+    if json_path:
+        json_path.write_text(json.dumps(results, indent=2))
+        print(f"\nResults: {json_path}")
+    return ok
+
+
+# --- Transcription: speed, memory and word error rate -----------------------
+
+_SPEAKER_LINE = re.compile(r"^Speaker \d+ \| [\d:]+\s*$")
+_TIMESTAMP = re.compile(r"\[[^\]]*\]")
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+
+def normalize_words(text: str) -> list[str]:
+    """Lowercased words with speaker headers, [timestamps] and [Laughter]-style tags removed."""
+    lines = [l for l in text.splitlines() if not _SPEAKER_LINE.match(l.strip())
+             and not l.startswith("--- Chunk")]
+    text = _TIMESTAMP.sub(" ", "\n".join(lines)).lower()
+    return [w.strip("'") for w in _WORD.findall(text) if w.strip("'")]
+
+
+def _edit_distance(ref: list, hyp: list) -> int:
+    previous = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, h in enumerate(hyp, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (r != h))
+        previous = current
+    return previous[-1]
+
+
+def _anchors(ref: list, hyp: list) -> list[tuple[int, int]]:
+    """
+    (i, j) positions of words that occur exactly once in each transcript,
+    keeping the longest run that is in order in both (as patience diff does).
+    """
+    ref_counts, hyp_counts = Counter(ref), Counter(hyp)
+    hyp_at = {w: j for j, w in enumerate(hyp) if hyp_counts[w] == 1}
+    pairs = [(i, hyp_at[w]) for i, w in enumerate(ref) if ref_counts[w] == 1 and w in hyp_at]
+
+    # Longest increasing subsequence of j
+    tails: list[int] = []  # j of the last pair of the best run of each length
+    tail_index: list[int] = []
+    back = [-1] * len(pairs)
+    for k, (_, j) in enumerate(pairs):
+        length = bisect.bisect_left(tails, j)
+        back[k] = tail_index[length - 1] if length else -1
+        if length == len(tails):
+            tails.append(j)
+            tail_index.append(k)
+        else:
+            tails[length], tail_index[length] = j, k
+    run, k = [], tail_index[-1] if tail_index else -1
+    while k >= 0:
+        run.append(pairs[k])
+        k = back[k]
+    return run[::-1]
+
+
+def word_error_rate(reference: list[str], hypothesis: list[str]) -> float:
+    """
+    (substitutions + deletions + insertions) / reference words, by edit distance.
+
+    Full transcripts are split at anchor words (unique in both and in the
+    same order) and the edit distance is summed over the stretches between
+    them, so a meeting-length transcript costs many small alignments
+    instead of one reference x hypothesis table. An anchor that is a
+    coincidental match can only over-count, never under-count.
+    """
+    if not reference:
+        return 0.0 if not hypothesis else 1.0
+    vocab = {}
+    ref = [vocab.setdefault(w, len(vocab)) for w in reference]
+    hyp = [vocab.setdefault(w, len(vocab)) for w in hypothesis]
+
+    errors, i0, j0 = 0, 0, 0
+    for i, j in _anchors(ref, hyp) + [(len(ref), len(hyp))]:
+        errors += _edit_distance(ref[i0:i], hyp[j0:j])
+        i0, j0 = i + 1, j + 1
+    return errors / len(ref)
+
+
+def peak_child_rss_mb() -> float:
+    """Peak RSS of any finished child process (whisper-cli) in MB."""
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def find_corpus(corpus: Path) -> list[tuple[Path, Path]]:
+    """(audio, reference) pairs: each audio file with a same-stem .txt next to it."""
+    pairs = []
+    for audio in sorted(corpus.iterdir()):
+        if audio.suffix.lower() not in config.WATCH_EXTENSIONS:
+            continue
+        reference = audio.with_suffix(".txt")
+        if reference.exists():
+            pairs.append((audio, reference))
+        else:
+            print(f"  [Warning] No reference transcript for {audio.name}, skipping")
+    return pairs
+
+
+def transcribe_run(audio: Path, model: str, threads: Optional[int], chunk_seconds: float, out: Path):
+    """Worker (own process, so peak RSS covers only this run's whisper-cli calls)."""
+    from transcriber import Transcriber, wav_duration
+    from watcher import convert_to_wav, split_wav
+
+    with tempfile.TemporaryDirectory(prefix="minute_bot_bench_") as tmp:
+        tmp = Path(tmp)
+        wav = audio
+        if audio.suffix.lower() != ".wav":
+            wav = tmp / "source.wav"
+            convert_to_wav(audio, wav)
+
+        transcriber = Transcriber(model=model, threads=threads)
+        texts = []
+        errors = []
+        started = time.perf_counter()
+        for chunk in split_wav(wav, chunk_seconds, tmp):
+            result = transcriber.transcribe(chunk, output_dir=tmp)
+            if result.get("error"):
+                errors.append(result["error"][:200])
+            texts.append(result.get("text", ""))
+        wall = time.perf_counter() - started
+
+        out.write_text(json.dumps({
+            "text": " ".join(texts),
+            "wall_seconds": wall,
+            "audio_seconds": wav_duration(wav),
+            "peak_rss_mb": peak_child_rss_mb(),
+            "errors": errors,
+        }))
+
+
+def transcription(corpus: Path, models: list[str], threads: list[Optional[int]],
+                  chunk_sizes: list[float], json_path: Optional[Path] = None,
+                  baseline: Optional[Path] = None) -> list[dict]:
+    """Benchmark every model x threads x chunk size on the corpus."""
+    pairs = find_corpus(corpus) if corpus.is_dir() else []
+    if not pairs:
+        print(f"No audio with reference transcripts found in {corpus}")
+        print("  (expected name.wav + name.txt pairs, e.g. a meeting recording with its OCPC transcript)")
+        return []
+
+    import os
+    results = []
+    print(f"{'audio':<28} {'model':<7} {'thr':>4} {'chunk':>6} {'RTF':>7} {'RSS MB':>8} {'WER':>7}")
+    for audio, reference in pairs:
+        ref_words = normalize_words(reference.read_text())
+        for model in models:
+            for n_threads in threads:
+                for chunk_seconds in chunk_sizes:
+                    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+                        out = Path(f.name)
+                    cmd = [sys.executable, str(Path(__file__).resolve()), "_transcribe-run",
+                           str(audio), model, str(n_threads or 0), str(chunk_seconds), str(out)]
+                    subprocess.run(cmd, cwd=config.BASE_DIR, capture_output=True, text=True)
+                    try:
+                        run = json.loads(out.read_text())
+                    except (json.JSONDecodeError, OSError):
+                        run = {"text": "", "wall_seconds": 0, "audio_seconds": 0,
+                               "peak_rss_mb": 0, "errors": ["worker failed"]}
+                    finally:
+                        out.unlink(missing_ok=True)
+
+                    hyp_words = normalize_words(run["text"])
+                    row = {
+                        "audio": audio.name,
+                        "model": model,
+                        "threads": n_threads,
+                        "chunk_seconds": chunk_seconds,
+                        "audio_seconds": round(run["audio_seconds"], 2),
+                        "wall_seconds": round(run["wall_seconds"], 2),
+                        "rtf": round(run["wall_seconds"] / run["audio_seconds"], 4) if run["audio_seconds"] else None,
+                        "peak_rss_mb": round(run["peak_rss_mb"], 1),
+                        "wer": round(word_error_rate(ref_words, hyp_words), 4),
+                        "reference_words": len(ref_words),
+                        "hypothesis_words": len(hyp_words),
+                        "errors": run["errors"],
+                    }
+                    results.append(row)
+                    rtf = f"{row['rtf']:.3f}" if row["rtf"] is not None else "-"
+                    print(f"{audio.name[:28]:<28} {model:<7} {n_threads or '-':>4} {chunk_seconds or 'all':>6} "
+                          f"{rtf:>7} {row['peak_rss_mb']:>8.0f} {row['wer']:>7.1%}"
+                          + ("  (errors)" if row["errors"] else ""))
+
+    report = {
+        "benchmark": "transcription",
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "machine": {"platform": sys.platform, "cpus": os.cpu_count()},
+        "results": results,
+    }
+    if json_path is None:
+        json_path = config.ensure_dir(config.BENCHMARK_RESULTS_DIR) / f"transcription_{datetime.now():%Y%m%d_%H%M%S}.json"
+    json_path.write_text(json.dumps(report, indent=2))
+    print(f"\nResults: {json_path}")
+
+    if baseline:
+        print_baseline_diff(results, json.loads(baseline.read_text())["results"])
+    return results
+
+
+def print_baseline_diff(results: list[dict], previous: list[dict]):
+    """RTF and WER change per configuration against an earlier run."""
+    def key(row):
+        return row["audio"], row["model"], row["threads"], row["chunk_seconds"]
+
+    before = {key(row): row for row in previous}
+    print(f"\nChange vs baseline:")
+    for row in results:
+        old = before.get(key(row))
+        if not old or old["rtf"] is None or row["rtf"] is None:
+            continue
+        print(f"  {row['audio'][:28]:<28} {row['model']:<7} {row['threads'] or '-':>4} "
+              f"{row['chunk_seconds'] or 'all':>6}  RTF {row['rtf'] - old['rtf']:+.3f}  "
+              f"WER {row['wer'] - old['wer']:+.1%}")
+
+
+# --- Minutes: prompt/output tokens, latency and similarity to final minutes --
+
+_SPEAKER_HEADER = re.compile(r"^Speaker \d+ \| (\d+(?::\d+)+)\s*$")
+_WHISPER_SEGMENT = re.compile(r"^\[(\d+):(\d+):(\d+(?:\.\d+)?) --> [^\]]*\]\s*(.*)$")
+_WALL_SEGMENT = re.compile(r"^\[(\d{1,2}):(\d{2}) ?([AP]M)\]\s*(.*)$", re.I)
+_FILE_CLOCK = re.compile(r"^(\d{1,2})_(\d{2})_(am|pm)", re.I)
+_HEADING = re.compile(r"^#{2,3}\s+(.*)$")
+
+
+def _clock_seconds(hour: int, minute: int, meridiem: str) -> int:
+    return ((hour % 12) + (12 if meridiem.upper() == "PM" else 0)) * 3600 + minute * 60
+
+
+def _format_clock(seconds: float) -> str:
+    hour, rem = divmod(int(seconds) % 86400, 3600)
+    return f"{hour % 12 or 12}:{rem // 60:02d} {'PM' if hour >= 12 else 'AM'}"
+
+
+def transcript_segments(path: Path) -> list[tuple[Optional[float], str]]:
+    """
+    [(seconds, text)] from one transcript file. Seconds are since midnight
+    when a wall clock is known ("[7:34 PM]" lines, or files named like
+    "7_34_pm_..._transcript.txt" with "Speaker N | mm:ss" headers), else
+    offsets into the file (whisper lines), else None.
+    """
+    file_clock = _FILE_CLOCK.match(path.name)
+    base = _clock_seconds(int(file_clock[1]), int(file_clock[2]), file_clock[3]) if file_clock else 0
+    segments = []
+    current = None
+    for line in path.read_text().splitlines():
+        line = line.strip()
+        if not line or line.startswith("--- Chunk"):
+            continue
+        m = _SPEAKER_HEADER.match(line)
+        if m:
+            offset = 0
+            for part in m[1].split(":"):
+                offset = offset * 60 + int(part)
+            current = base + offset
+            continue
+        m = _WHISPER_SEGMENT.match(line)
+        if m:
+            segments.append((base + int(m[1]) * 3600 + int(m[2]) * 60 + float(m[3]), m[4]))
+            continue
+        m = _WALL_SEGMENT.match(line)
+        if m:
+            segments.append((_clock_seconds(int(m[1]), int(m[2]), m[3]), m[4]))
+            continue
+        segments.append((current, line))
+    return segments
+
+
+def transcript_chunks(source: Path, chunk_seconds: float) -> list[str]:
+    """Split a transcript file (or folder of them) into pipeline-sized chunks of "[h:mm PM] text" lines."""
+    files = sorted(source.glob("*.txt")) if source.is_dir() else [source]
+    segments = [seg for f in files for seg in transcript_segments(f)]
+    if not segments:
+        return []
+    if all(t is None for t, _ in segments):
+        return ["\n".join(text for _, text in segments)]
+
+    # Untimed lines inherit the previous timestamp
+    timed = []
+    last = next(t for t, _ in segments if t is not None)
+    for t, text in segments:
+        last = t if t is not None else last
+        timed.append((last, text))
+    timed.sort(key=lambda seg: seg[0])
+
+    chunks: dict[int, list[str]] = {}
+    start = timed[0][0]
+    for t, text in timed:
+        chunks.setdefault(int((t - start) // chunk_seconds), []).append(f"[{_format_clock(t)}] {text}")
+    return ["\n".join(lines) for _, lines in sorted(chunks.items())]
+
+
+def rouge_n(reference: list[str], candidate: list[str], n: int = 1) -> float:
+    """F1 of overlapping word n-grams."""
+    from collections import Counter
+
+    ref = Counter(tuple(reference[i:i + n]) for i in range(len(reference) - n + 1))
+    cand = Counter(tuple(candidate[i:i + n]) for i in range(len(candidate) - n + 1))
+    overlap = sum((ref & cand).values())
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / sum(cand.values()), overlap / sum(ref.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def rouge_l(reference: list[str], candidate: list[str]) -> float:
+    """F1 of the longest common word subsequence (rewards matching order, not just vocabulary)."""
+    if not reference or not candidate:
+        return 0.0
+    previous = [0] * (len(candidate) + 1)
+    for r in reference:
+        current = [0]
+        for j, c in enumerate(candidate, 1):
+            current.append(previous[j - 1] + 1 if r == c else max(previous[j], current[j - 1]))
+        previous = current
+    lcs = previous[-1]
+    if not lcs:
+        return 0.0
+    precision, recall = lcs / len(candidate), lcs / len(reference)
+    return 2 * precision * recall / (precision + recall)
+
+
+def _headings(text: str) -> set[str]:
+    """Section titles without numbering or times: "## 2. Opening (7:33 PM)" -> "opening"."""
+    titles = set()
+    for line in text.splitlines():
+        m = _HEADING.match(line.strip())
+        if m:
+            words = [w for w in normalize_words(re.sub(r"\([^)]*\)", " ", m[1])) if not w.isdigit()]
+            if len(words) > 0 and len(words[0]) == 1:
+                words = words[1:]  # "A. Budget Review"
+            if words:
+                titles.add(" ".join(words))
+    return titles
+
+
+def score_minutes(reference: str, candidate: str) -> dict:
+    """Local similarity of candidate minutes to the reference (final) minutes."""
+    ref_words, cand_words = normalize_words(reference), normalize_words(candidate)
+    ref_headings = _headings(reference)
+    return {
+        "rouge1": round(rouge_n(ref_words, cand_words, 1), 4),
+        "rouge2": round(rouge_n(ref_words, cand_words, 2), 4),
+        "rougeL": round(rouge_l(ref_words, cand_words), 4),
+        "section_recall": round(len(ref_headings & _headings(candidate)) / len(ref_headings), 4)
+        if ref_headings else None,
+        "words": len(cand_words),
+        "reference_words": len(ref_words),
+    }
+
+
+class _RecordingMessages:
+    def __init__(self, messages, calls: list):
+        self._messages = messages
+        self._calls = calls
+
+    def create(self, **params):
+        started = time.perf_counter()
+        response = self._messages.create(**params)
+        usage = getattr(response, "usage", None)
+        self._calls.append({
+            "latency": round(time.perf_counter() - started, 4),
+            "prompt_chars": len(params["messages"][-1]["content"]),
+            "input_tokens": getattr(usage, "input_tokens", None),
+            "output_tokens": getattr(usage, "output_tokens", None),
+            "response": response.content[0].text,
+        })
+        return response
+
+
+class RecordingClient:
+    """Client wrapper that records tokens, latency and response text of every call."""
+
+    def __init__(self, client):
+        self.calls: list[dict] = []
+        self.messages = _RecordingMessages(client.messages, self.calls)
+
+
+def replay_responder(responses: list[str]):
+    """Mock responder that returns previously recorded responses in order."""
+    from mock_anthropic import default_responder
+
+    pending = list(responses)
+
+    def respond(params: dict) -> str:
+        return pending.pop(0) if pending else default_responder(params)
+    return respond
+
+
+def minutes_run(spec_path: Path, out: Path):
+    """Worker: feed chunks through MinutesGenerator (run with a scratch MINUTE_BOT_DATA_DIR)."""
+    from minutes_generator import MinutesGenerator, create_client, read_file_content
+    from mock_anthropic import MockAnthropic
+
+    spec = json.loads(spec_path.read_text())
+    if spec["live"]:
+        client = create_client()
+        if client is None:
+            out.write_text(json.dumps({"error": "no API client (set ANTHROPIC_API_KEY)"}))
+            return
+    else:
+        client = MockAnthropic(responder=replay_responder(spec["responses"]) if spec["responses"] else None,
+                               latency=spec["latency"])
+    recorder = RecordingClient(client)
+
+    gen = MinutesGenerator(spec["meeting_name"], session_id="benchmark")
+    gen.client = recorder
+    gen.cache = None  # Every chunk must reach the (mock) model
+    if spec["agenda"]:
+        from agenda_aligner import AgendaAligner
+        gen.agenda = read_file_content(Path(spec["agenda"]))
+        gen.aligner = AgendaAligner(gen.agenda)
+        gen.aligner = gen.aligner if gen.aligner.enabled else None
+
+    queued = 0
+    started = time.perf_counter()
+    for i, chunk in enumerate(spec["chunks"]):
+        calls_before = len(recorder.calls)
+        if not gen.update_minutes(chunk, i):
+            queued += 1
+        for call in recorder.calls[calls_before:]:
+            call["chunk"] = i
+            call["transcript_chars"] = len(chunk)
+    gen.finalize()
+
+    out.write_text(json.dumps({
+        "calls": recorder.calls,
+        "queued": queued,
+        "wall_seconds": time.perf_counter() - started,
+        "minutes": gen.current_minutes,
+    }))
+
+
+def minutes(transcript: Path, reference: Optional[Path] = None, compare: Optional[list[Path]] = None,
+            agenda: Optional[Path] = None, chunk_seconds: float = config.CHUNK_DURATION_SECONDS,
+            live: bool = False, latency: float = config.MOCK_API_LATENCY,
+            responses: Optional[Path] = None, json_path: Optional[Path] = None,
+            baseline: Optional[Path] = None) -> Optional[dict]:
+    """Replay a transcript chunk by chunk through MinutesGenerator and report cost curves and quality."""
+    import os
+
+    chunks = transcript_chunks(transcript, chunk_seconds) if transcript.exists() else []
+    if not chunks:
+        print(f"No transcript text found in {transcript}")
+        return None
+    meeting_name = transcript.stem if transcript.is_file() else transcript.name
+
+    recorded = []
+    if responses:
+        recorded = [c["response"] for c in json.loads(responses.read_text())["calls"]]
+
+    spec = {"chunks": chunks, "meeting_name": meeting_name, "agenda": str(agenda) if agenda else None,
+            "live": live, "latency": latency, "responses": recorded}
+    mode = "live API" if live else ("recorded responses" if recorded else "mock API")
+    print(f"Replaying {len(chunks)} chunk(s) of {chunk_seconds:.0f}s from {transcript.name} ({mode})\n")
+
+    with tempfile.TemporaryDirectory(prefix="minute_bot_bench_") as tmp:
+        tmp = Path(tmp)
+        spec_path, out = tmp / "spec.json", tmp / "result.json"
+        spec_path.write_text(json.dumps(spec))
+        # Scratch data dir: no response cache hits, and nothing written to the real minutes folder
+        env = dict(os.environ, MINUTE_BOT_DATA_DIR=str(tmp / "data"))
+        env.pop("MINUTE_BOT_MOCK_API", None)
+        result = subprocess.run([sys.executable, str(Path(__file__).resolve()), "_minutes-run",
+                                 str(spec_path), str(out)],
+                                cwd=config.BASE_DIR, env=env, capture_output=True, text=True)
+        try:
+            run = json.loads(out.read_text())
+        except (json.JSONDecodeError, OSError):
+            print(f"Benchmark run failed:\n{result.stderr[-2000:]}")
+            return None
+    if run.get("error"):
+        print(f"Benchmark run failed: {run['error']}")
+        return None
+
+    calls = run["calls"]
+    print(f"{'chunk':>5} {'transcript':>10} {'prompt':>8} {'in tok':>8} {'out tok':>8} {'latency':>8}")
+    for call in calls:
+        print(f"{call['chunk']:>5} {call['transcript_chars']:>10} {call['prompt_chars']:>8} "
+              f"{call['input_tokens'] or 0:>8} {call['output_tokens'] or 0:>8} {call['latency']:>7.2f}s")
+
+    input_tokens = [c["input_tokens"] or 0 for c in calls]
+    output_tokens = [c["output_tokens"] or 0 for c in calls]
+    summary = {
+        "calls": len(calls),
+        "queued": run["queued"],
+        "input_tokens": sum(input_tokens),
+        "output_tokens": sum(output_tokens),
+        # How much the per-call prompt grows between the first and last chunk
+        "input_growth": round(input_tokens[-1] / input_tokens[0], 2) if input_tokens and input_tokens[0] else None,
+        "latency_mean": round(statistics.mean(c["latency"] for c in calls), 3) if calls else None,
+        "latency_max": round(max(c["latency"] for c in calls), 3) if calls else None,
+    }
+    print(f"\nTotal: {summary['input_tokens']} input + {summary['output_tokens']} output tokens "
+          f"over {summary['calls']} call(s); prompt grew {summary['input_growth'] or '-'}x; "
+          f"mean latency {summary['latency_mean'] or 0:.2f}s")
+    if run["queued"]:
+        print(f"  [Warning] {run['queued']} chunk(s) were queued instead of sent")
+
+    scores = {}
+    if reference:
+        reference_text = reference.read_text()
+        scores["generated"] = score_minutes(reference_text, run["minutes"])
+        for path in compare or []:
+            scores[path.name] = score_minutes(reference_text, path.read_text())
+        print(f"\nSimilarity to {reference.name}:")
+        print(f"  {'minutes':<40} {'ROUGE-1':>8} {'ROUGE-2':>8} {'ROUGE-L':>8} {'sections':>9}")
+        for name, s in scores.items():
+            sections = f"{s['section_recall']:.0%}" if s["section_recall"] is not None else "-"
+            print(f"  {name[:40]:<40} {s['rouge1']:>8.3f} {s['rouge2']:>8.3f} {s['rougeL']:>8.3f} {sections:>9}")
+
+    report = {
+        "benchmark": "minutes",
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "transcript": str(transcript),
+        "reference": str(reference) if reference else None,
+        "mode": mode,
+        "chunk_seconds": chunk_seconds,
+        "summary": summary,
+        "scores": scores,
+        "calls": calls,
+        "minutes": run["minutes"],
+    }
+    if json_path is None:
+        json_path = config.ensure_dir(config.BENCHMARK_RESULTS_DIR) / f"minutes_{datetime.now():%Y%m%d_%H%M%S}.json"
+    json_path.write_text(json.dumps(report, indent=2))
+    print(f"\nResults: {json_path}")
+
+    if baseline:
+        old = json.loads(baseline.read_text())
+        print("\nChange vs baseline:")
+        for key in ("input_tokens", "output_tokens", "latency_mean"):
+            if old["summary"].get(key) is not None and summary[key] is not None:
+                change = summary[key] - old["summary"][key]
+                print(f"  {key:<14} {change:+.3f}" if isinstance(change, float) else f"  {key:<14} {change:+d}")
+        old_scores = old.get("scores", {}).get("generated")
+        if old_scores and "generated" in scores:
+            for key in ("rouge1", "rouge2", "rougeL"):
+                print(f"  {key:<14} {scores['generated'][key] - old_scores[key]:+.3f}")
+    return report
+
+
+def _int_list(value: str) -> list[Optional[int]]:
+    return [int(v) or None for v in value.split(",")]
+
+
+def _float_list(value: str) -> list[float]:
+    return [float(v) for v in value.split(",")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Minute Bot performance benchmarks")
+    subparsers = parser.add_subparsers(dest="command", help="Benchmarks")
+
+    startup_parser = subparsers.add_parser("startup", help="CLI startup time and eager imports")
+    startup_parser.add_argument("--runs", type=int, default=10, help="Runs per command (default: 10)")
+    startup_parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=config.STARTUP_BUDGET_MS,
+        help=f"Maximum median startup per command (default: {config.STARTUP_BUDGET_MS})"
+    )
+    startup_parser.add_argument("--json", type=Path, help="Write results to this JSON file")
+
+    trans_parser = subparsers.add_parser("transcription", help="Whisper RTF, peak RSS and WER on a reference corpus")
+    trans_parser.add_argument(
+        "--corpus",
+        type=Path,
+        default=config.BENCHMARK_CORPUS_DIR,
+        help=f"Folder of name.wav + name.txt pairs (default: {config.BENCHMARK_CORPUS_DIR})"
+    )
+    trans_parser.add_argument("--models", default=config.WHISPER_MODEL, help="Comma-separated models (e.g. tiny,base,small)")
+    trans_parser.add_argument("--threads", type=_int_list, default=[config.WHISPER_THREADS],
+                              help="Comma-separated whisper thread counts (0 = whisper default)")
+    trans_parser.add_argument("--chunk-seconds", type=_float_list, default=[float(config.CHUNK_DURATION_SECONDS)],
+                              help=f"Comma-separated chunk lengths in seconds (default: {config.CHUNK_DURATION_SECONDS}; "
+                                   f"0 = whole file, which whisper's 5 minute timeout only allows for short audio)")
+    trans_parser.add_argument("--json", type=Path, help="Results file (default: data/benchmarks/transcription_<time>.json)")
+    trans_parser.add_argument("--baseline", type=Path, help="Earlier results JSON to compare against")
+
+    minutes_parser = subparsers.add_parser("minutes", help="Token/latency curves and similarity to final minutes")
+    minutes_parser.add_argument("transcript", type=Path,
+                                help="Transcript file or folder (e.g. OCPC/2026-02-10/transcript)")
+    minutes_parser.add_argument("--reference", type=Path, help="Final minutes to score against")
+    minutes_parser.add_argument("--compare", type=Path, action="append",
+                                help="Other minutes to score too, e.g. the (draft) version (repeatable)")
+    minutes_parser.add_argument("--agenda", type=Path, help="Agenda file (default: agendas/ folder)")
+    minutes_parser.add_argument("--chunk-seconds", type=float, default=config.CHUNK_DURATION_SECONDS,
+                                help=f"Transcript seconds per update_minutes call (default: {config.CHUNK_DURATION_SECONDS})")
+    minutes_parser.add_argument("--live", action="store_true", help="Use the real API instead of the mock")
+    minutes_parser.add_argument("--latency", type=float, default=config.MOCK_API_LATENCY,
+                                help="Simulated mock latency per call in seconds")
+    minutes_parser.add_argument("--responses", type=Path,
+                                help="Earlier results JSON whose recorded responses the mock replays")
+    minutes_parser.add_argument("--json", type=Path, help="Results file (default: data/benchmarks/minutes_<time>.json)")
+    minutes_parser.add_argument("--baseline", type=Path, help="Earlier results JSON to compare against")
+
+    # Internal: one benchmark configuration in a separate process
+    run_parser = subparsers.add_parser("_transcribe-run")
+    for name in ("audio", "model", "threads", "chunk_seconds", "out"):
+        run_parser.add_argument(name)
+    minutes_run_parser = subparsers.add_parser("_minutes-run")
+    for name in ("spec", "out"):
+        minutes_run_parser.add_argument(name)
+
+    args = parser.parse_args()
+
+    if args.command == "startup":
+        ok = startup(max(args.runs, 2), args.budget_ms, args.json)
+        sys.exit(0 if ok else 1)
+    elif args.command == "transcription":
+        transcription(args.corpus, args.models.split(","), args.threads, args.chunk_seconds,
+                      args.json, args.baseline)
+    elif args.command == "_transcribe-run":
+        transcribe_run(Path(args.audio), args.model, int(args.threads) or None,
+                       float(args.chunk_seconds), Path(args.out))
+    elif args.command == "minutes":
+        report = minutes(args.transcript, args.reference, args.compare, args.agenda, args.chunk_seconds,
+                         args.live, args.latency, args.responses, args.json, args.baseline)
+        sys.exit(0 if report else 1)
+    elif args.command == "_minutes-run":
+        minutes_run(Path(args.spec), Path(args.out))
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
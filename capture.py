@@ -0,0 +1,189 @@
+"""In-memory audio capture for the interactive recorders.
+
+One sox process streams raw 16-bit PCM to stdout for the whole session. A
+reader thread keeps the current chunk's samples in memory, so a cut hands
+them straight to whisper-cli over stdin (see Transcriber.transcribe) instead
+of waiting for a WAV to be finalized and read back. A writer thread puts the
+same samples into full_session_backup.wav and the chunk WAVs - the durable
+copy that resume, archive and reprocessing use - off the cut-to-transcription
+path, so a slow SD card or eMMC only delays the files, not the minutes.
+
+Chunks are cut between two reads of the same stream, so unlike stopping and
+restarting sox per chunk, no audio falls between chunks.
+"""
+
+import io
+import queue
+import subprocess
+import threading
+import wave
+from pathlib import Path
+from typing import Optional
+
+import config
+import wav_header
+
+SAMPLE_WIDTH = 2  # 16-bit
+FRAME_BYTES = SAMPLE_WIDTH * config.CHANNELS
+BYTES_PER_SECOND = FRAME_BYTES * config.SAMPLE_RATE
+READ_BYTES = BYTES_PER_SECOND // 10  # ~100 ms per read
+
+_STOP = object()
+
+
+def pcm_seconds(pcm: bytes) -> float:
+    """Duration of raw capture-format PCM."""
+    return len(pcm) / BYTES_PER_SECOND
+
+
+def open_writer(target) -> wave.Wave_write:
+    """A WAV writer in the capture format, for a path or a binary file object."""
+    w = wave.open(str(target) if isinstance(target, Path) else target, "wb")
+    w.setnchannels(config.CHANNELS)
+    w.setsampwidth(SAMPLE_WIDTH)
+    w.setframerate(config.SAMPLE_RATE)
+    return w
+
+
+def wav_bytes(pcm: bytes) -> bytes:
+    """A complete in-memory WAV of raw capture-format PCM."""
+    buffer = io.BytesIO()
+    with open_writer(buffer) as w:
+        w.writeframes(pcm)
+    return buffer.getvalue()
+
+
+class PcmCapture:
+    """Continuous microphone capture, cut into chunks held in memory and tee'd to disk."""
+
+    def __init__(self, backup_file: Path, checkpointer: Optional[wav_header.HeaderCheckpointer] = None):
+        self.backup_file = backup_file
+        self.checkpointer = checkpointer or wav_header.HeaderCheckpointer(0)
+        self.process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+        self._pcm: Optional[bytearray] = bytearray()  # None once the chunk outgrew PCM_BUFFER_SECONDS
+        self._limit = int(config.PCM_BUFFER_SECONDS * BYTES_PER_SECOND)
+        self._writes: queue.Queue = queue.Queue()
+        self._reader: Optional[threading.Thread] = None
+        self._writer: Optional[threading.Thread] = None
+        self._write_failed = False
+
+    def start(self, chunk_path: Path):
+        """Start sox and record into chunk_path until the first cut."""
+        cmd = [
+            config.SOX_BIN,
+            "-d",  # Default input device
+            "-c", str(config.CHANNELS),
+            "-r", str(config.SAMPLE_RATE),
+            "-b", "16", "-e", "signed-integer",
+            "-t", "raw", "-",
+        ]
+        self.process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        self._writes.put(chunk_path)
+        self._writer = threading.Thread(target=self._write_loop, name="capture-writer", daemon=True)
+        self._reader = threading.Thread(target=self._read_loop, name="capture-reader", daemon=True)
+        self._writer.start()
+        self._reader.start()
+
+    def cut(self, next_chunk: Path) -> Optional[bytes]:
+        """
+        End the current chunk and continue into next_chunk. Returns the ended
+        chunk's samples, or None if it was too long to keep in memory. Unless
+        they are handed over in memory (PCM_HANDOFF), the chunk's WAV is
+        complete by the time this returns.
+        """
+        with self._lock:
+            pcm, self._pcm = self._pcm, bytearray()
+            self._writes.put(next_chunk)
+            written = threading.Event()
+            self._writes.put(written)
+        if pcm is None or not config.PCM_HANDOFF:
+            written.wait()
+        return bytes(pcm) if pcm is not None else None
+
+    def stop(self) -> Optional[bytes]:
+        """Stop sox and close every file. Returns the final chunk's samples (None as for cut())."""
+        if self.process is None:
+            return None
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self._reader.join(timeout=5)
+
+        with self._lock:
+            pcm, self._pcm = self._pcm, bytearray()
+            self._writes.put(_STOP)
+        self._writer.join()
+        self.process = None
+        return bytes(pcm) if pcm is not None else None
+
+    def _read_loop(self):
+        carry = b""
+        while True:
+            block = self.process.stdout.read1(READ_BYTES)
+            if not block:
+                break
+            # Keep cuts on frame boundaries
+            block = carry + block
+            whole = len(block) - len(block) % FRAME_BYTES
+            block, carry = block[:whole], block[whole:]
+            if not block:
+                continue
+            with self._lock:
+                if self._pcm is not None:
+                    self._pcm += block
+                    if len(self._pcm) > self._limit:
+                        self._pcm = None  # Too long to hold; this chunk is read back from its WAV
+                self._writes.put(block)
+
+    def _write_loop(self):
+        """Write the backup and chunk WAVs in stream order. Never raises."""
+        backup = self._open(self.backup_file)
+        chunk, chunk_path = None, None
+        while True:
+            item = self._writes.get()
+            if isinstance(item, bytes):
+                for w in (backup, chunk):
+                    if w is not None:
+                        self._guard(w.writeframesraw, item)
+            elif isinstance(item, threading.Event):
+                item.set()
+            else:
+                # A cut (next chunk path) or the end of the stream
+                if chunk is not None:
+                    self._close(chunk, chunk_path)
+                    chunk = None
+                if item is _STOP:
+                    if backup is not None:
+                        self._close(backup, self.backup_file)
+                    return
+                chunk_path = item
+                chunk = self._open(chunk_path)
+
+    def _open(self, path: Path) -> Optional[wave.Wave_write]:
+        try:
+            w = open_writer(path)
+        except OSError as e:
+            self._warn(path, e)
+            return None
+        self.checkpointer.watch(path)
+        return w
+
+    def _close(self, w: wave.Wave_write, path: Path):
+        self.checkpointer.unwatch(path)  # Before close() puts down the final header
+        self._guard(w.close)
+
+    def _guard(self, write, *args):
+        try:
+            write(*args)
+        except OSError as e:
+            self._warn(self.backup_file.parent, e)
+
+    def _warn(self, path: Path, error: Exception):
+        # Transcription keeps working from memory; say so once rather than per block
+        if not self._write_failed:
+            self._write_failed = True
+            print(f"  [Warning] Could not write audio to {path}: {error}")
@@ -0,0 +1,377 @@
+"""Session catalog.
+
+A small SQLite database (data/catalog.sqlite) indexing what the pipeline has
+done: sessions, their chunks, minutes versions, offline queue items and
+watcher job state. The pipeline updates it as work is committed, so
+questions like "which sessions are unfinished" or "which chunks are not in
+the minutes yet" are indexed queries instead of directory scans.
+
+The files on disk stay authoritative; the catalog only indexes them. It is
+rebuilt from the data folder when first created (or with `sessions
+--rebuild`), and every write is fail-safe: a catalog error prints a warning
+and never interrupts recording, transcription or minutes.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import config
+
+_SESSION_ID = re.compile(r"^\d{8}_\d{6}$")
+_CHUNK_FILE = re.compile(r"^chunk_(\d+)\.(wav|txt)$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    meeting_name TEXT,
+    started TEXT,
+    ended TEXT,
+    minutes_file TEXT,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    session_id TEXT NOT NULL,
+    chunk INTEGER NOT NULL,
+    audio_path TEXT,
+    started TEXT,
+    recorded REAL,
+    transcribed REAL,
+    transcript_chars INTEGER,
+    in_minutes REAL,
+    PRIMARY KEY (session_id, chunk)
+);
+CREATE INDEX IF NOT EXISTS chunks_not_in_minutes ON chunks(session_id) WHERE in_minutes IS NULL;
+CREATE TABLE IF NOT EXISTS minutes_versions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    chunk INTEGER,
+    chars INTEGER NOT NULL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS minutes_versions_session ON minutes_versions(session_id, id);
+CREATE TABLE IF NOT EXISTS queue_items (
+    session_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    chunk INTEGER,
+    reason TEXT,
+    queued TEXT,
+    PRIMARY KEY (session_id, position)
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    session_id TEXT,
+    error TEXT,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs(kind, status);
+"""
+
+
+class NullCatalog:
+    """Catalog stand-in when disabled or unavailable: writes are no-ops, lookups scan directories."""
+
+    enabled = False
+
+    def add_session(self, session_id: str, meeting_name: str, started: Optional[datetime] = None,
+                    minutes_file: Optional[Path] = None):
+        pass
+
+    def set_started(self, session_id: str, started: datetime):
+        pass
+
+    def end_session(self, session_id: str, ended: datetime):
+        pass
+
+    def chunk_recorded(self, session_id: str, chunk: int, audio_path: Path,
+                       started: Optional[datetime] = None):
+        pass
+
+    def chunk_transcribed(self, session_id: str, chunk: int, chars: int):
+        pass
+
+    def minutes_updated(self, session_id: str, chunks: list[int], chars: int):
+        pass
+
+    def sync_queue(self, session_id: str, queue: list):
+        pass
+
+    def set_job(self, key: str, kind: str, status: str, session_id: Optional[str] = None, error: str = ""):
+        pass
+
+    def session(self, session_id: str) -> Optional[dict]:
+        return None
+
+    def chunks(self, session_id: str) -> Optional[dict[int, dict]]:
+        return None
+
+    def queued_sessions(self) -> list[str]:
+        return sorted(p.name[:-len("_offline_queue.json")]
+                      for p in config.DATA_DIR.glob("*_offline_queue.json"))
+
+
+class Catalog(NullCatalog):
+    """SQLite-backed session catalog."""
+
+    enabled = True
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or config.CATALOG_FILE
+        self._lock = threading.Lock()
+        config.ensure_dir(self.path.parent)
+        created = not self.path.exists()
+        # Several processes (record, watch, host) may share the file
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+        if created:
+            self.rebuild()
+
+    def _write(self, sql: str, params: tuple = ()):
+        """Run one write statement. Catalog errors never reach the pipeline."""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(sql, params)
+        except Exception as e:
+            print(f"  [Warning] Could not update session catalog: {e}")
+
+    def _query(self, sql: str, params: tuple = ()) -> list[dict]:
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            names = [d[0] for d in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    # --- Pipeline updates ---------------------------------------------------
+
+    def add_session(self, session_id: str, meeting_name: str, started: Optional[datetime] = None,
+                    minutes_file: Optional[Path] = None):
+        self._write(
+            "INSERT INTO sessions(id, meeting_name, started, minutes_file, updated) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET meeting_name = excluded.meeting_name, "
+            "minutes_file = COALESCE(excluded.minutes_file, minutes_file), "
+            "started = COALESCE(started, excluded.started), updated = excluded.updated",
+            (session_id, meeting_name, started.isoformat(timespec="seconds") if started else None,
+             str(minutes_file) if minutes_file else None, time.time())
+        )
+
+    def set_started(self, session_id: str, started: datetime):
+        """Replace a session's start (add_session keeps the first one it was given)."""
+        self._write("UPDATE sessions SET started = ?, updated = ? WHERE id = ?",
+                    (started.isoformat(timespec="seconds"), time.time(), session_id))
+
+    def end_session(self, session_id: str, ended: datetime):
+        self._write("UPDATE sessions SET ended = ?, updated = ? WHERE id = ?",
+                    (ended.isoformat(timespec="seconds"), time.time(), session_id))
+
+    def chunk_recorded(self, session_id: str, chunk: int, audio_path: Path,
+                       started: Optional[datetime] = None):
+        self._write(
+            "INSERT INTO chunks(session_id, chunk, audio_path, started, recorded) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(session_id, chunk) DO UPDATE SET audio_path = excluded.audio_path, "
+            "started = COALESCE(excluded.started, started), recorded = excluded.recorded",
+            (session_id, chunk, str(audio_path), started.isoformat(timespec="seconds") if started else None,
+             time.time())
+        )
+
+    def chunk_transcribed(self, session_id: str, chunk: int, chars: int):
+        self._write(
+            "INSERT INTO chunks(session_id, chunk, transcribed, transcript_chars) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(session_id, chunk) DO UPDATE SET transcribed = excluded.transcribed, "
+            "transcript_chars = excluded.transcript_chars",
+            (session_id, chunk, time.time(), chars)
+        )
+
+    def minutes_updated(self, session_id: str, chunks: list[int], chars: int):
+        """Record a new minutes version that incorporates the given chunks."""
+        now = time.time()
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT INTO minutes_versions(session_id, chunk, chars, created) VALUES (?, ?, ?, ?)",
+                    (session_id, chunks[-1] if chunks else None, chars, now)
+                )
+                self._conn.executemany(
+                    "UPDATE chunks SET in_minutes = ? WHERE session_id = ? AND chunk = ? AND in_minutes IS NULL",
+                    [(now, session_id, c) for c in chunks if c >= 0]
+                )
+                self._conn.execute("UPDATE sessions SET updated = ? WHERE id = ?", (now, session_id))
+        except Exception as e:
+            print(f"  [Warning] Could not update session catalog: {e}")
+
+    def sync_queue(self, session_id: str, queue: list):
+        """Mirror a session's persisted offline queue."""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM queue_items WHERE session_id = ?", (session_id,))
+                self._conn.executemany(
+                    "INSERT INTO queue_items(session_id, position, chunk, reason, queued) VALUES (?, ?, ?, ?, ?)",
+                    [(session_id, i, item.get("chunk"), item.get("reason"), item.get("timestamp"))
+                     for i, item in enumerate(queue)]
+                )
+        except Exception as e:
+            print(f"  [Warning] Could not update session catalog: {e}")
+
+    def set_job(self, key: str, kind: str, status: str, session_id: Optional[str] = None, error: str = ""):
+        self._write(
+            "INSERT OR REPLACE INTO jobs(key, kind, status, session_id, error, updated) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, kind, status, session_id, error, time.time())
+        )
+
+    # --- Lookups ------------------------------------------------------------
+
+    def session(self, session_id: str) -> Optional[dict]:
+        rows = self._query("SELECT * FROM sessions WHERE id = ?", (session_id,))
+        return rows[0] if rows else None
+
+    def chunks(self, session_id: str) -> Optional[dict[int, dict]]:
+        """A session's chunk rows by chunk number."""
+        return {row["chunk"]: row for row in
+                self._query("SELECT * FROM chunks WHERE session_id = ?", (session_id,))}
+
+    def queued_sessions(self) -> list[str]:
+        """Sessions with a non-empty offline queue."""
+        return [row["session_id"] for row in
+                self._query("SELECT DISTINCT session_id FROM queue_items ORDER BY session_id")]
+
+    def pending_chunks(self, session_id: Optional[str] = None) -> list[dict]:
+        """Chunks not yet folded into the minutes (recorded or transcribed)."""
+        sql = "SELECT * FROM chunks WHERE in_minutes IS NULL"
+        params: tuple = ()
+        if session_id:
+            sql += " AND session_id = ?"
+            params = (session_id,)
+        return self._query(sql + " ORDER BY session_id, chunk", params)
+
+    def sessions(self, unfinished: bool = False, limit: Optional[int] = None) -> list[dict]:
+        """Sessions with chunk counts, newest first. Unfinished = not ended, queued work, or chunks missing from the minutes."""
+        sql = """
+            SELECT s.*,
+                   (SELECT COUNT(*) FROM chunks c WHERE c.session_id = s.id) AS chunks,
+                   (SELECT COUNT(*) FROM chunks c WHERE c.session_id = s.id
+                        AND c.in_minutes IS NULL AND c.transcribed IS NOT NULL) AS pending,
+                   (SELECT COUNT(*) FROM queue_items q WHERE q.session_id = s.id) AS queued,
+                   (SELECT COUNT(*) FROM minutes_versions m WHERE m.session_id = s.id) AS versions
+            FROM sessions s
+        """
+        if unfinished:
+            sql += " WHERE s.ended IS NULL OR pending > 0 OR queued > 0"
+        sql += " ORDER BY s.id DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return self._query(sql)
+
+    # --- Backfill -----------------------------------------------------------
+
+    def rebuild(self):
+        """Re-index sessions from the data folder (audio, transcripts, minutes, queues)."""
+        sessions: dict[str, dict] = {}
+
+        def entry(session_id: str) -> dict:
+            return sessions.setdefault(session_id, {"meeting_name": None, "minutes_file": None, "chunks": {}})
+
+        for root, column in ((config.AUDIO_DIR, "audio_path"), (config.TRANSCRIPTS_DIR, "transcript")):
+            if not root.exists():
+                continue
+            for session_dir in root.iterdir():
+                if not (session_dir.is_dir() and _SESSION_ID.match(session_dir.name)):
+                    continue
+                chunks = entry(session_dir.name)["chunks"]
+                for path in session_dir.iterdir():
+                    m = _CHUNK_FILE.match(path.name)
+                    if m:
+                        chunks.setdefault(int(m[1]), {})[column] = path
+
+        if config.MINUTES_DIR.exists():
+            for path in config.MINUTES_DIR.glob("*.md"):
+                session_id, meeting_name = path.stem[:15], path.stem[16:]
+                if _SESSION_ID.match(session_id):
+                    record = entry(session_id)
+                    record["meeting_name"], record["minutes_file"] = meeting_name or "Meeting", str(path)
+
+        queues = {}
+        for path in config.DATA_DIR.glob("*_offline_queue.json"):
+            try:
+                queues[path.name[:-len("_offline_queue.json")]] = json.loads(path.read_text())
+            except Exception as e:
+                print(f"  [Warning] Could not read {path.name}: {e}")
+
+        now = time.time()
+        try:
+            with self._lock, self._conn:
+                for table in ("sessions", "chunks", "minutes_versions", "queue_items"):
+                    self._conn.execute(f"DELETE FROM {table}")
+                for session_id, record in sessions.items():
+                    queued_chunks = {item.get("chunk") for item in queues.get(session_id, [])}
+                    started = datetime.strptime(session_id, "%Y%m%d_%H%M%S").isoformat()
+                    self._conn.execute(
+                        "INSERT INTO sessions(id, meeting_name, started, ended, minutes_file, updated) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        # Past sessions are treated as ended; their minutes file marks the last update
+                        (session_id, record["meeting_name"], started, started, record["minutes_file"], now)
+                    )
+                    for chunk, files in record["chunks"].items():
+                        transcript = files.get("transcript")
+                        # Without history, a transcribed chunk that isn't queued is assumed to be in the minutes
+                        in_minutes = now if transcript and record["minutes_file"] and chunk not in queued_chunks else None
+                        self._conn.execute(
+                            "INSERT INTO chunks(session_id, chunk, audio_path, recorded, transcribed, "
+                            "transcript_chars, in_minutes) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (session_id, chunk, str(files["audio_path"]) if "audio_path" in files else None,
+                             now if "audio_path" in files else None, now if transcript else None,
+                             transcript.stat().st_size if transcript else None, in_minutes)
+                        )
+                for session_id, queue in queues.items():
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO queue_items(session_id, position, chunk, reason, queued) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        [(session_id, i, item.get("chunk"), item.get("reason"), item.get("timestamp"))
+                         for i, item in enumerate(queue)]
+                    )
+        except Exception as e:
+            print(f"  [Warning] Could not rebuild session catalog: {e}")
+        return len(sessions)
+
+
+NULL_CATALOG = NullCatalog()
+_shared: Optional[Catalog] = None
+_shared_lock = threading.Lock()
+
+
+def get() -> NullCatalog:
+    """The process-wide catalog (a directory-scanning stand-in when disabled or unavailable)."""
+    global _shared
+    if not config.CATALOG_ENABLED:
+        return NULL_CATALOG
+    with _shared_lock:
+        if _shared is None:
+            try:
+                _shared = Catalog()
+            except Exception as e:
+                print(f"  [Warning] Session catalog unavailable: {e}")
+                return NULL_CATALOG
+        return _shared
+
+
+def print_sessions(unfinished: bool = False, limit: Optional[int] = None):
+    """List catalogued sessions."""
+    cat = get()
+    if not cat.enabled:
+        print("Session catalog is disabled (CATALOG_ENABLED in config.py).")
+        return
+    rows = cat.sessions(unfinished=unfinished, limit=limit)
+    if not rows:
+        print("No unfinished sessions." if unfinished else "No sessions recorded.")
+        return
+    print(f"{'session':<16} {'meeting':<28} {'chunks':>6} {'pending':>7} {'queued':>6} {'versions':>8}  ended")
+    for row in rows:
+        ended = row["ended"][11:16] if row["ended"] else "in progress"
+        print(f"{row['id']:<16} {(row['meeting_name'] or '-')[:28]:<28} {row['chunks']:>6} {row['pending']:>7} "
+              f"{row['queued']:>6} {row['versions']:>8}  {ended}")
@@ -5,7 +5,7 @@ from pathlib import Path
 
 # Directories
 BASE_DIR = Path(__file__).parent
-DATA_DIR = BASE_DIR / "data"
+DATA_DIR = Path(os.environ.get("MINUTE_BOT_DATA_DIR", BASE_DIR / "data"))
 AUDIO_DIR = DATA_DIR / "audio"
 TRANSCRIPTS_DIR = DATA_DIR / "transcripts"
 MINUTES_DIR = DATA_DIR / "minutes"
@@ -13,21 +13,134 @@ TEMPLATES_DIR = BASE_DIR / "templates"
 AGENDAS_DIR = BASE_DIR / "agendas"
 SAMPLES_DIR = BASE_DIR / "samples"
 
-# Create directories
-for d in [DATA_DIR, AUDIO_DIR, TRANSCRIPTS_DIR, MINUTES_DIR, TEMPLATES_DIR, AGENDAS_DIR, SAMPLES_DIR]:
-    d.mkdir(parents=True, exist_ok=True)
+
+def ensure_dir(path: Path) -> Path:
+    """Create a directory when it is first written to (nothing is created at import)."""
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
 
 # Audio settings
 SAMPLE_RATE = 16000  # Whisper expects 16kHz
 CHANNELS = 1  # Mono
 CHUNK_DURATION_SECONDS = 300  # 5 minutes default
 
+# Record mode auto-tuning (record --auto-tune): chunk length and whisper model
+# adapt between chunks to keep the minutes within the target lag
+AUTOTUNE_TARGET_LAG_SECONDS = 600  # Speech to minutes, at most
+AUTOTUNE_MIN_CHUNK_SECONDS = 60
+AUTOTUNE_MAX_CHUNK_SECONDS = 900
+AUTOTUNE_COOLDOWN_CHUNKS = 2  # Chunks measured after a change before the next one
+
 # Whisper settings
 WHISPER_MODEL = "small"  # Options: tiny, base, small, medium, large
 WHISPER_LANGUAGE = "en"
+WHISPER_THREADS = None  # whisper-cli -t; None uses its default (4)
+# Interactive/UI modes capture into memory and pipe each cut chunk to
+# whisper-cli over stdin (-f -); the chunk WAVs are still written alongside
+PCM_HANDOFF = True
+PCM_BUFFER_SECONDS = 1800  # Longer chunks are read back from their WAV instead
+WHISPER_MODEL_DIR = Path(os.environ.get("MINUTE_BOT_WHISPER_MODELS", Path.home() / ".cache" / "whisper-cpp"))
+
+# External tools (overridable, e.g. with the replay harness stubs)
+SOX_BIN = os.environ.get("MINUTE_BOT_SOX", "sox")
+WHISPER_CLI = os.environ.get("MINUTE_BOT_WHISPER_CLI", "whisper-cli")
+
+# Metrics (per-session metrics.jsonl; see `minute_bot.py stats <session>`)
+METRICS_ENABLED = True
+
+# Benchmarks (`python benchmark.py ...`)
+STARTUP_BUDGET_MS = 100  # Median wall time for --help, test-mic and transcribe imports
+BENCHMARK_CORPUS_DIR = DATA_DIR / "benchmark_corpus"  # name.wav + name.txt reference pairs
+BENCHMARK_RESULTS_DIR = DATA_DIR / "benchmarks"
+
+# Recording UI pipeline panel
+PIPELINE_BEHIND_SECONDS = 120  # Backlog older than this is shown in red
+
+# Profiling (--profile on start/record/transcribe)
+PROFILE_TRACEMALLOC_FRAMES = 10
+PROFILE_SNAPSHOT_SECONDS = 60  # At most one tracemalloc snapshot per stage per interval
+PROFILE_TOP_N = 25  # Functions/allocation sites listed per stage
+
+# Sample minutes selection (style reference sent with each prompt)
+SAMPLE_TOP_K = 3  # Most relevant samples to include
+SAMPLE_MAX_CHARS = 24000  # Roughly 6k tokens of style reference per prompt
+SAMPLE_INDEX_FILE = DATA_DIR / "sample_index.json"
+
+# Transcript normalization (repeats, fillers and boundary overlap stripped from
+# the text sent to the minutes prompt; saved transcripts stay verbatim)
+NORMALIZE_TRANSCRIPTS = True
+
+# Minutes history (data/transcripts/<session>/minutes_history.jsonl; `history`, `rev` commands)
+MINUTES_HISTORY_ENABLED = True
+MINUTES_SNAPSHOT_EVERY = 16  # Store a full copy every N revisions; the rest are line deltas
+
+# Live view (`serve`, or --serve on start/record): read-only HTTP API for following
+# a session's minutes and transcript; use LIVE_HOST = "0.0.0.0" to reach it from tablets
+LIVE_HOST = "127.0.0.1"
+LIVE_PORT = 8765
+LIVE_MAX_WAIT_SECONDS = 30  # Longest a long-poll request is held open
+LIVE_WATCH_SECONDS = 1.0  # How often standalone `serve` checks files for other processes' changes
+LIVE_CACHE_SESSIONS = 8  # Sessions whose documents are kept in memory
+
+# Transcript import (import-transcript): batches of CHUNK_DURATION_SECONDS of meeting time
+IMPORT_BATCH_MAX_CHARS = 16000  # ~4k tokens; also bounds batches of untimed transcripts
 
 # Claude API
 ANTHROPIC_API_KEY = os.environ.get("ANTHROPIC_API_KEY", "")
+MOCK_API = os.environ.get("MINUTE_BOT_MOCK_API") == "1"  # Use the local mock client (no network)
+MOCK_API_LATENCY = float(os.environ.get("MINUTE_BOT_MOCK_LATENCY", "0"))  # Simulated seconds per mock call
+
+# Response cache (identical requests are answered locally)
+RESPONSE_CACHE_ENABLED = True
+RESPONSE_CACHE_FILE = DATA_DIR / "response_cache.sqlite"
+RESPONSE_CACHE_MAX_ENTRIES = 1000
+RESPONSE_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+# Crash recovery
+WAV_CHECKPOINT_SECONDS = 5  # Rewrite WAV headers of files being recorded this often (0 = off)
+RESUME_WORKERS = max(1, (os.cpu_count() or 4) // 4)  # Parallel transcriptions in `resume`
+# On quit, wait this long for chunks still processing; the rest are saved for process-queue
+SHUTDOWN_DEADLINE_SECONDS = 15
+
+# Audio archive (finished sessions' WAVs are transcoded, verified, then removed)
+ARCHIVE_FORMAT = "flac"  # "flac" (lossless, ~2-3x smaller) or "opus" (speech quality, ~10x+ smaller)
+ARCHIVE_OPUS_BITRATE = "24k"
+ARCHIVE_AFTER_DAYS = 2  # Archive sessions at least this old
+ARCHIVE_CHUNK_RETENTION_DAYS = None  # Then drop archived chunks (the archived backup stays); None = keep
+ARCHIVE_NICE = 10  # CPU niceness of transcoders
+ARCHIVE_BACKGROUND = True  # watch and host archive due sessions while they run
+ARCHIVE_INTERVAL_SECONDS = 3600
+
+# Session catalog (SQLite index of sessions, chunks, minutes versions, queues and jobs)
+CATALOG_ENABLED = True
+CATALOG_FILE = DATA_DIR / "catalog.sqlite"
+
+# Full-text search (`search` command)
+SEARCH_INDEX_ENABLED = True
+SEARCH_INDEX_FILE = DATA_DIR / "search.sqlite"
+SEARCH_ARCHIVE_DIRS = [BASE_DIR / "KCS", BASE_DIR / "OCPC"]  # Org archives; their minutes/ and transcript/ folders are indexed
+
+# Message Batches (bulk queue processing and regeneration)
+BATCHES_DIR = DATA_DIR / "batches"
+BATCH_POLL_SECONDS = 60
+
+# Watch-folder ingestion (`minute_bot.py watch`)
+INBOX_DIR = DATA_DIR / "inbox"
+WATCH_JOBS_FILE = DATA_DIR / "watch_jobs.json"
+WATCH_EXTENSIONS = (".wav", ".m4a", ".mp3", ".flac", ".ogg", ".aac")
+WATCH_POLL_SECONDS = 5
+WATCH_STABLE_SECONDS = 10  # File size unchanged this long = upload finished
+WATCH_WORKERS = max(1, (os.cpu_count() or 4) // 4)  # whisper-cli uses 4 threads per file
+WATCH_MAX_ATTEMPTS = 3
+
+# Multi-session host (`minute_bot.py host`)
+HOST_DIR = DATA_DIR / "host"  # One subfolder per meeting room
+HOST_TRANSCRIBE_WORKERS = WATCH_WORKERS  # Shared by all sessions
+HOST_IDLE_SECONDS = 900  # End a session after this long without a new chunk
+HOST_STATUS_SECONDS = 60
+API_REQUESTS_PER_MINUTE = 50  # Shared limiter budget across hosted sessions
+API_TOKENS_PER_MINUTE = 40000  # Input tokens
 
 # Default minutes template
 DEFAULT_TEMPLATE = """
@@ -0,0 +1,259 @@
+"""Offline extractive minutes engine.
+
+Fills in the minutes template from timestamped transcript segments using
+compiled pattern sets, so meetings recorded without an API key or network
+still get usable draft minutes in real time. A later API pass refines the
+draft like any other minutes.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+from agenda_aligner import parse_segments
+
+DRAFT_NOTE = "> *Offline draft: auto-extracted from the transcript, pending AI refinement.*"
+
+_NAME = r"([A-Z][a-z]+(?:\s[A-Z][a-z]+)?)"
+PRONOUNS = {"i", "we", "he", "she", "they"}
+
+# Capitalized words that look like names at the start of a clause but aren't
+NOT_NAMES = {
+    "I", "The", "This", "That", "There", "Then", "So", "And", "But", "Okay", "Ok",
+    "Yeah", "Yes", "No", "Well", "All", "Thank", "Thanks", "Everyone", "Everybody",
+    "Anyone", "Anybody", "We", "You", "He", "She", "They", "It", "Motion", "Second",
+    "Meeting", "Lord", "God", "Jesus", "Amen", "Good", "Great", "Right", "Sure",
+    "Board", "Chair", "Chairman", "President", "Secretary", "Treasurer", "Session",
+}
+
+MOTION_PATTERNS = [
+    re.compile(r"\b(?:I|we)\s+(?:would\s+like\s+to\s+)?(?:make\s+a\s+)?move\s+(?:that|to)\s+(?P<what>[^.?!]+)", re.I),
+    re.compile(r"\b(?:I'?ll|I\s+will|I'?d\s+like\s+to)\s+make\s+a\s+motion\s+(?:that|to)\s+(?P<what>[^.?!]+)", re.I),
+    re.compile(r"\bmotion\s+to\s+(?P<what>[^.?!]+)", re.I),
+    re.compile(r"\b" + _NAME + r"\s+moved\s+(?:that|to)\s+(?P<what>[^.?!]+)"),
+]
+MOVER_PATTERN = re.compile(r"\b" + _NAME + r"\s+(?:moved|makes?\s+a\s+motion|made\s+(?:a|the)\s+motion)")
+SECOND_PATTERNS = [
+    re.compile(r"\bI\s+second\b|\bseconded?\s+the\s+motion\b|^\s*second(?:ed)?[.!]?\s*$", re.I),
+    re.compile(r"\bseconded\s+by\s+" + _NAME),
+    re.compile(r"\b" + _NAME + r"\s+seconded\b"),
+]
+VOTE_PATTERNS = [
+    (re.compile(r"\bmotion\s+(?:carries|carried|passes|passed|is\s+approved)\b", re.I), "carried"),
+    (re.compile(r"\b(?:approved|passed|carried)\s+unanimously\b|\bunanimous(?:ly)?\b", re.I), "carried unanimously"),
+    (re.compile(r"\bmotion\s+(?:fails|failed|is\s+defeated)\b", re.I), "failed"),
+    (re.compile(r"\ball\s+(?:those\s+)?in\s+favou?r\b", re.I), "called"),
+]
+TALLY_PATTERN = re.compile(
+    r"\b(?P<yes>\d+|one|two|three|four|five|six|seven|eight|nine|ten)\s+(?:in\s+favou?r|yes|ayes?)\b.*?"
+    r"\b(?P<no>\d+|none|zero|one|two|three|four|five)\s+(?:opposed|against|nos?|nays?)\b", re.I)
+ACTION_PATTERNS = [
+    re.compile(r"\b(?P<who>(?i:I|we|he|she|they)|" + _NAME[1:-1] + r")\s+(?:will|'ll|is\s+going\s+to|are\s+going\s+to|am\s+going\s+to)\s+(?P<what>[^.?!]+)"),
+    re.compile(r"\b(?P<who>" + _NAME[1:-1] + r"),?\s+(?:can|could)\s+you\s+(?P<what>[^.?!]+)"),
+]
+DEADLINE_PATTERN = re.compile(
+    r"\bby\s+(?:(?:next\s+)?(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday|week|month|meeting)"
+    r"|tomorrow|tonight|the\s+end\s+of\s+\w+|the\s+\d{1,2}(?:st|nd|rd|th)?"
+    r"|(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+\d{1,2})\b", re.I)
+ATTENDEE_PATTERNS = [
+    re.compile(r"\b(?:present|attending|in\s+attendance)\s*(?:are|were|is|:)\s*(?P<names>[^.?!]+)", re.I),
+    re.compile(r"\bthank\s+you,?\s+" + _NAME),
+    re.compile(r"\bwelcome,?\s+" + _NAME),
+    re.compile(r"\b" + _NAME + r",\s+would\s+you\b"),
+]
+ADJOURN_PATTERN = re.compile(r"\b(?:meeting\s+(?:is\s+)?adjourned|we\s+are\s+adjourned|(?:motion\s+to\s+)?adjourn(?:ed)?\b)", re.I)
+
+# Actions need a deadline or an explicit commitment verb to count; "we will see" is chatter
+COMMITMENT_VERBS = re.compile(
+    r"^(?:send|email|call|contact|reach\s+out|follow\s+up|prepare|draft|bring|get|set\s+up|schedule|"
+    r"order|buy|check|confirm|review|update|handle|take\s+care|coordinate|organize|share|submit|"
+    r"look\s+into|talk\s+to|let\s+\w+\s+know|pass\s+(?:it\s+)?along|put\s+together|write)\b", re.I)
+
+
+@dataclass
+class Motion:
+    time: Optional[str]
+    text: str
+    mover: Optional[str] = None
+    seconded_by: Optional[str] = None
+    seconded: bool = False
+    result: Optional[str] = None
+    tally: Optional[str] = None
+
+
+@dataclass
+class ExtractedMinutes:
+    attendees: list[str] = field(default_factory=list)
+    motions: list[Motion] = field(default_factory=list)
+    actions: list[tuple[Optional[str], str]] = field(default_factory=list)
+    adjourned_at: Optional[str] = None
+
+
+def _clean(text: str, limit: int = 160) -> str:
+    text = re.sub(r"\s+", " ", text).strip(" ,;:-")
+    return text if len(text) <= limit else text[:limit].rsplit(" ", 1)[0] + "..."
+
+
+def _is_name(candidate: Optional[str]) -> bool:
+    return bool(candidate) and candidate.split()[0] not in NOT_NAMES
+
+
+class MinutesExtractor:
+    """Accumulates motions, votes, action items, attendees and adjournment across chunks."""
+
+    def __init__(self):
+        self.result = ExtractedMinutes()
+        self._open_motion: Optional[Motion] = None
+
+    def _add_attendee(self, name: str):
+        name = name.strip()
+        if _is_name(name) and name not in self.result.attendees:
+            self.result.attendees.append(name)
+
+    def feed(self, timestamped_text: str) -> ExtractedMinutes:
+        """Scan a chunk of timestamped transcript and update the extracted state."""
+        for ts, text in parse_segments(timestamped_text):
+            self._scan(ts, text)
+        return self.result
+
+    def _scan(self, ts: Optional[str], text: str):
+        # Attendees
+        for pattern in ATTENDEE_PATTERNS:
+            for match in pattern.finditer(text):
+                if "names" in match.groupdict():
+                    for name in re.split(r",\s*|\s+and\s+", match.group("names")):
+                        if re.fullmatch(_NAME, name.strip()):
+                            self._add_attendee(name)
+                else:
+                    self._add_attendee(match.group(1))
+
+        # Motions
+        for pattern in MOTION_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                what = _clean(match.group("what"))
+                if what.lower().startswith("adjourn"):
+                    break
+                motion = Motion(time=ts, text=what)
+                mover = MOVER_PATTERN.search(text)
+                if mover and _is_name(mover.group(1)):
+                    motion.mover = mover.group(1)
+                    self._add_attendee(mover.group(1))
+                # Queued text is fed again when the queue is processed; keep one copy
+                key = (motion.time, motion.mover, motion.text)
+                seen = next((m for m in self.result.motions if (m.time, m.mover, m.text) == key), None)
+                if seen is None:
+                    self.result.motions.append(motion)
+                self._open_motion = seen or motion
+                break
+
+        # Seconds and votes attach to the most recent open motion
+        motion = self._open_motion
+        if motion:
+            for pattern in SECOND_PATTERNS:
+                match = pattern.search(text)
+                if match and (pattern.groups == 0 or _is_name(match.group(1))):
+                    motion.seconded = True
+                    if pattern.groups:
+                        motion.seconded_by = match.group(1)
+                        self._add_attendee(match.group(1))
+                    break
+
+            tally = TALLY_PATTERN.search(text)
+            if tally:
+                motion.tally = f"{tally.group('yes')} in favor, {tally.group('no')} opposed"
+
+            for pattern, result in VOTE_PATTERNS:
+                if pattern.search(text):
+                    if result == "called":
+                        motion.result = motion.result or "vote called"
+                    else:
+                        motion.result = result
+                        self._open_motion = None
+                    break
+
+        # Action items
+        for pattern in ACTION_PATTERNS:
+            for match in pattern.finditer(text):
+                what = match.group("what")
+                deadline = DEADLINE_PATTERN.search(what)
+                if not deadline and not COMMITMENT_VERBS.match(what.strip()):
+                    continue
+                who = match.group("who")
+                owner = who if who.lower() not in PRONOUNS else None
+                if owner and not _is_name(owner):
+                    continue
+                item = f"{owner}: {_clean(what)}" if owner else _clean(f"{who} will {what}")
+                if all(existing != item for _, existing in self.result.actions):
+                    self.result.actions.append((ts, item))
+
+        # Adjournment (keep the latest mention)
+        if ADJOURN_PATTERN.search(text) and ts:
+            self.result.adjourned_at = ts
+
+    def render(self, minutes: str, section_times: Optional[list[tuple[str, str]]] = None) -> str:
+        """Write extracted content into the matching template sections of the minutes."""
+        r = self.result
+
+        if DRAFT_NOTE not in minutes:
+            lines = minutes.split("\n")
+            for i, line in enumerate(lines):
+                if line.startswith("# "):
+                    lines.insert(i + 1, "\n" + DRAFT_NOTE)
+                    break
+            else:
+                lines.insert(0, DRAFT_NOTE + "\n")
+            minutes = "\n".join(lines)
+
+        if r.attendees:
+            minutes = set_section(minutes, "Attendees", [f"- {name}" for name in r.attendees])
+
+        if section_times:
+            minutes = set_section(minutes, "Agenda Items",
+                                  [f"- {label} ({start})" for label, start in section_times])
+
+        if r.motions:
+            entries = []
+            for m in r.motions:
+                parts = [f"- {f'[{m.time}] ' if m.time else ''}**Motion:** {m.text}"]
+                if m.mover:
+                    parts.append(f"  - Moved by: {m.mover}")
+                if m.seconded:
+                    parts.append(f"  - Seconded{f' by: {m.seconded_by}' if m.seconded_by else ''}")
+                if m.result:
+                    parts.append(f"  - Result: {m.result}{f' ({m.tally})' if m.tally else ''}")
+                entries.extend(parts)
+            minutes = set_section(minutes, "Motions and Votes", entries, before="Action Items")
+
+        if r.actions:
+            minutes = set_section(minutes, "Action Items",
+                                  [f"- {f'[{ts}] ' if ts else ''}{item}" for ts, item in r.actions])
+
+        if r.adjourned_at:
+            minutes = set_section(minutes, "Adjournment", [f"- **Adjournment:** {r.adjourned_at}"])
+
+        return minutes
+
+
+def set_section(minutes: str, header: str, body: list[str], before: Optional[str] = None) -> str:
+    """
+    Replace the body of a "## header" section, creating the section if missing
+    (ahead of the "## before" section when given, otherwise at the end).
+    """
+    lines = minutes.rstrip("\n").split("\n")
+    header_re = re.compile(r"^##\s+(?:\d+[.)]\s+)?" + re.escape(header) + r"\b", re.I)
+
+    start = next((i for i, line in enumerate(lines) if header_re.match(line)), None)
+    if start is None:
+        new = [f"## {header}"] + body + [""]
+        if before:
+            before_re = re.compile(r"^##\s+(?:\d+[.)]\s+)?" + re.escape(before) + r"\b", re.I)
+            at = next((i for i, line in enumerate(lines) if before_re.match(line)), None)
+            if at is not None:
+                return "\n".join(lines[:at] + new + lines[at:]) + "\n"
+        return "\n".join(lines + [""] + new)
+
+    end = start + 1
+    while end < len(lines) and not lines[end].startswith("## ") and not lines[end].startswith("# "):
+        end += 1
+    return "\n".join(lines[:start + 1] + body + [""] + lines[end:]).rstrip("\n") + "\n"
@@ -0,0 +1,369 @@
+"""Multi-session host: several meetings in one process.
+
+Each subfolder of the host root (config.HOST_DIR) is a meeting room; chunk
+files dropped into it (by a room recorder or file sync) become chunks of
+that room's current session. All sessions share:
+
+- one TranscriptionPool whose workers take chunks round-robin across
+  sessions, one chunk per session at a time, so a long meeting can't starve
+  the others and each session's chunks stay in order;
+- one ApiLimiter (token buckets for requests and input tokens per minute),
+  so overlapping meetings stay within a single rate-limit budget.
+
+A session ends when an END file appears in its folder or no chunk arrives
+for HOST_IDLE_SECONDS; its last chunks and minutes are finished on a closer
+thread while the other rooms keep polling. Per-session waits for the pool and the limiter are
+recorded in each session's metrics.jsonl (see `minute_bot.py stats`).
+"""
+
+import shutil
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Optional
+
+import catalog
+import config
+import metrics
+from watcher import StableFiles, convert_to_wav, new_session_id
+
+END_MARKER = "END"
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until enough tokens refill."""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.tokens = self.capacity
+        self._last = time.monotonic()
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """Take amount tokens, waiting if needed. Returns seconds waited."""
+        amount = min(amount, self.capacity)
+        started = time.monotonic()
+        with self._cond:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    self._cond.notify_all()
+                    return time.monotonic() - started
+                self._cond.wait((amount - self.tokens) / self.rate)
+
+
+class ApiLimiter:
+    """Shared request and input-token budgets for every hosted session."""
+
+    def __init__(self, requests_per_minute: float = None, tokens_per_minute: float = None):
+        self.requests = TokenBucket(requests_per_minute or config.API_REQUESTS_PER_MINUTE)
+        self.tokens = TokenBucket(tokens_per_minute or config.API_TOKENS_PER_MINUTE)
+
+    def wait(self, params: dict) -> float:
+        """Block until a request with these params fits the budget. Returns seconds waited."""
+        chars = sum(len(m.get("content", "")) for m in params.get("messages", [])
+                    if isinstance(m.get("content"), str))
+        waited = self.requests.acquire(1)
+        waited += self.tokens.acquire(max(1, chars // 4))
+        return waited
+
+    def wrap(self, client, sink: metrics.NullMetrics = metrics.NULL_METRICS) -> "LimitedClient":
+        return LimitedClient(client, self, sink)
+
+
+class _LimitedMessages:
+    def __init__(self, messages, limiter: ApiLimiter, sink: metrics.NullMetrics):
+        self._messages = messages
+        self._limiter = limiter
+        self._sink = sink
+
+    def create(self, **params):
+        waited = self._limiter.wait(params)
+        self._sink.timing(metrics.API_WAIT, waited)
+        return self._messages.create(**params)
+
+
+class LimitedClient:
+    """Client wrapper that passes messages.create() through the shared limiter."""
+
+    def __init__(self, client, limiter: ApiLimiter, sink: metrics.NullMetrics = metrics.NULL_METRICS):
+        self._client = client
+        self.messages = _LimitedMessages(client.messages, limiter, sink)
+
+
+class TranscriptionPool:
+    """Worker threads shared by all sessions, scheduled round-robin per session."""
+
+    def __init__(self, workers: int = None, model: str = config.WHISPER_MODEL):
+        from transcriber import Transcriber
+
+        self.transcriber = Transcriber(model=model)
+        self._queues: dict[str, deque] = {}
+        self._order: deque[str] = deque()  # Round-robin rotation of session keys
+        self._busy: set[str] = set()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"transcribe-{i}", daemon=True)
+            for i in range(workers or config.HOST_TRANSCRIBE_WORKERS)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def submit(self, session_key: str, audio_path: Path, chunk_start: Optional[datetime],
+               callback: Callable[[dict, float], None]):
+        """Queue a chunk; callback(result, queue_wait_seconds) runs on the worker."""
+        with self._cond:
+            if session_key not in self._queues:
+                self._queues[session_key] = deque()
+                self._order.append(session_key)
+            self._queues[session_key].append((audio_path, chunk_start, callback, time.monotonic()))
+            self._cond.notify()
+
+    def pending(self, session_key: str) -> int:
+        with self._cond:
+            queued = len(self._queues.get(session_key, ()))
+            return queued + (1 if session_key in self._busy else 0)
+
+    def _next(self):
+        """Next chunk from the first idle session in rotation (caller holds the lock)."""
+        for _ in range(len(self._order)):
+            key = self._order[0]
+            self._order.rotate(-1)
+            if key not in self._busy and self._queues[key]:
+                self._busy.add(key)
+                return key, self._queues[key].popleft()
+        return None
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                picked = self._next()
+                while picked is None:
+                    if self._closed:
+                        return
+                    self._cond.wait()
+                    picked = self._next()
+
+            key, (audio_path, chunk_start, callback, enqueued) = picked
+            waited = time.monotonic() - enqueued
+            try:
+                result = self.transcriber.transcribe(
+                    audio_path, output_dir=config.TRANSCRIPTS_DIR / audio_path.parent.name,
+                    chunk_start_time=chunk_start,
+                )
+            except Exception as e:
+                result = {"text": "", "timestamped_text": "", "segments": [], "error": str(e)}
+            try:
+                callback(result, waited)
+            except Exception as e:
+                print(f"  [Warning] Error handling {audio_path.name}: {e}")
+            finally:
+                with self._cond:
+                    self._busy.discard(key)
+                    self._cond.notify_all()
+
+    def drain(self, session_key: str):
+        """Block until a session has nothing queued or running."""
+        with self._cond:
+            while self._queues.get(session_key) or session_key in self._busy:
+                self._cond.wait()
+            if session_key in self._queues:
+                del self._queues[session_key]
+                self._order.remove(session_key)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for t in self._threads:
+            t.join(timeout=300)
+
+
+class HostedSession:
+    """One meeting fed from a room folder."""
+
+    def __init__(self, folder: Path, pool: TranscriptionPool, client=None,
+                 limiter: Optional[ApiLimiter] = None):
+        from minutes_generator import MinutesGenerator, OfflineMinutesStore
+        from transcriber import TranscriptManager
+
+        self.folder = folder
+        self.meeting_name = folder.name
+        self.pool = pool
+        self.session_id = new_session_id(datetime.now())
+        self.audio_dir = config.AUDIO_DIR / self.session_id
+        self.metrics = metrics.for_session(self.session_id)
+        self.transcript_mgr = TranscriptManager(self.session_id)
+        self.minutes_gen = MinutesGenerator(self.meeting_name, session_id=self.session_id)
+        self.minutes_gen.client = limiter.wrap(client, self.metrics) if client and limiter else client
+        self.offline_store = OfflineMinutesStore(self.session_id)
+        self.minutes_gen.offline_queue = self.offline_store.load_queue()
+
+        # Minutes updates run one at a time per session, in chunk order
+        self._minutes_lane = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"minutes-{self.session_id}")
+        self.files = StableFiles()
+        self.chunk_number = 0
+        self.last_chunk_at = time.monotonic()
+        self.pool_waits: list[float] = []
+        self.chunks_taken = 0
+        self.chunks_done = 0
+        self.chunks_offline = 0
+
+    def poll(self):
+        """Hand newly completed chunk files to the shared pool."""
+        from transcriber import wav_duration
+
+        for path in self.files.scan(self.folder):
+            chunk_number = self.chunk_number
+            self.chunk_number += 1
+            self.last_chunk_at = time.monotonic()
+            dest = self.audio_dir / f"chunk_{chunk_number:04d}.wav"
+            try:
+                if path.suffix.lower() == ".wav":
+                    shutil.move(str(path), dest)
+                else:
+                    convert_to_wav(path, dest)
+                    path.unlink()
+            except Exception as e:
+                print(f"  [Warning] {self.meeting_name}: could not take {path.name}: {e}")
+                continue
+
+            ended = datetime.fromtimestamp(dest.stat().st_mtime)
+            chunk_start = ended - timedelta(seconds=wav_duration(dest))
+            if not self.chunks_taken:
+                self.minutes_gen.session_start = chunk_start  # The meeting began with its first chunk
+            self.chunks_taken += 1
+            catalog.get().chunk_recorded(self.session_id, chunk_number, dest, chunk_start)
+            self.pool.submit(self.session_id, dest, chunk_start,
+                             lambda result, waited, n=chunk_number: self._transcribed(n, result, waited))
+
+    def _transcribed(self, chunk_number: int, result: dict, waited: float):
+        self.metrics.timing(metrics.POOL_WAIT, waited, chunk=chunk_number)
+        self.pool_waits.append(waited)
+        text = (result.get("timestamped_text") or result.get("text", "")).strip()
+        if not text:
+            self.chunks_done += 1
+            return
+        self.transcript_mgr.append(text, chunk_number)
+        self._minutes_lane.submit(self._update_minutes, text, chunk_number)
+
+    def _update_minutes(self, text: str, chunk_number: int):
+        if self.minutes_gen.update_minutes(text, chunk_number):
+            self.chunks_done += 1
+        else:
+            self.chunks_offline += 1
+        self.offline_store.save_queue(self.minutes_gen.offline_queue)
+
+    @property
+    def ended(self) -> bool:
+        marker = self.folder / END_MARKER
+        return marker.exists() or time.monotonic() - self.last_chunk_at > config.HOST_IDLE_SECONDS
+
+    def close(self):
+        """Process what's left, then finalize the minutes."""
+        self.files = StableFiles(stable_seconds=0)
+        self.poll()
+        self.pool.drain(self.session_id)
+        self._minutes_lane.shutdown(wait=True)
+        self.minutes_gen.finalize()
+        self.offline_store.save_queue(self.minutes_gen.offline_queue)
+        (self.folder / END_MARKER).unlink(missing_ok=True)
+
+    def status(self) -> str:
+        waits = sorted(self.pool_waits)
+        p50 = metrics.percentile(waits, 50)
+        worst = waits[-1] if waits else 0.0
+        return (f"{self.meeting_name:<24} {self.session_id}  chunks {self.chunk_number:>3}  "
+                f"pending {self.pool.pending(self.session_id):>2}  done {self.chunks_done:>3}  "
+                f"offline {self.chunks_offline:>2}  pool wait p50 {p50:5.1f}s max {worst:5.1f}s")
+
+
+class SessionHost:
+    """Discovers room folders and runs their sessions on shared resources."""
+
+    def __init__(self, root: Path = None, workers: int = None, model: str = config.WHISPER_MODEL):
+        from minutes_generator import create_client
+
+        self.root = config.ensure_dir(root or config.HOST_DIR)
+        self.pool = TranscriptionPool(workers, model)
+        self.limiter = ApiLimiter()
+        self.client = create_client()
+        self.sessions: dict[Path, HostedSession] = {}
+        # Ended sessions finish on their own threads so the other rooms keep polling
+        self._closer = ThreadPoolExecutor(thread_name_prefix="close")
+        self._closing: dict[Path, Future] = {}
+        self._stop = threading.Event()
+
+    def _discover(self):
+        for folder, closing in list(self._closing.items()):
+            if closing.done():
+                del self._closing[folder]
+        for folder in sorted(self.root.iterdir()):
+            if (not folder.is_dir() or folder.name.startswith(".")
+                    or folder in self.sessions or folder in self._closing):
+                continue
+            # A room only starts a session once it has audio
+            if any(f.suffix.lower() in config.WATCH_EXTENSIONS for f in folder.iterdir()):
+                session = HostedSession(folder, self.pool, self.client, self.limiter)
+                self.sessions[folder] = session
+                print(f"▶️  {session.meeting_name}: session {session.session_id}")
+
+    def _close(self, session: HostedSession):
+        """Stop polling a session and finish it in the background."""
+        del self.sessions[session.folder]
+        self._closing[session.folder] = self._closer.submit(self._finish, session)
+
+    @staticmethod
+    def _finish(session: HostedSession):
+        try:
+            session.close()
+        except Exception as e:
+            print(f"  [Warning] {session.meeting_name}: could not finish session {session.session_id}: {e}")
+            return
+        print(f"⏹  {session.meeting_name}: session {session.session_id} complete")
+        print(f"   Minutes: {session.minutes_gen.minutes_file}")
+
+    def print_status(self):
+        print(f"\n[{datetime.now():%H:%M:%S}] {len(self.sessions)} active session(s)")
+        for session in self.sessions.values():
+            print(f"  {session.status()}")
+
+    def run(self):
+        print(f"🏠 Hosting rooms under {self.root} "
+              f"({len(self.pool._threads)} transcription worker(s), Ctrl+C to stop)")
+        if config.ARCHIVE_BACKGROUND:
+            import archiver
+            archiver.start_background()
+        last_status = time.monotonic()
+        try:
+            while not self._stop.is_set():
+                self._discover()
+                for session in list(self.sessions.values()):
+                    session.poll()
+                    if session.ended:
+                        self._close(session)
+                if self.sessions and time.monotonic() - last_status >= config.HOST_STATUS_SECONDS:
+                    self.print_status()
+                    last_status = time.monotonic()
+                self._stop.wait(config.WATCH_POLL_SECONDS)
+        except KeyboardInterrupt:
+            print("\nStopping: finishing active sessions...")
+        finally:
+            for session in list(self.sessions.values()):
+                self._close(session)
+            self._closer.shutdown(wait=True)
+            self.pool.close()
+
+    def stop(self):
+        self._stop.set()
@@ -1,126 +1,95 @@
 """Interactive recorder with spacebar control."""
 
-import subprocess
 import sys
 import tty
 import termios
-import threading
 import signal
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Callable
 
+import capture
 import config
+import metrics
+import profiler
+import shutdown
+import wav_header
 
 
 class InteractiveRecorder:
     """Records audio with spacebar-triggered chunk boundaries."""
 
-    def __init__(self, on_chunk_ready: Optional[Callable[[Path, int, datetime], None]] = None):
+    def __init__(self, on_chunk_ready: Optional[Callable[..., None]] = None,
+                 key_source: Optional[Callable[[Optional[float]], Optional[str]]] = None):
         """
         Args:
-            on_chunk_ready: Callback called with (audio_path, chunk_number, chunk_start_time) when a chunk is ready.
+            on_chunk_ready: Callback called with (audio_path, chunk_number, chunk_start_time, pcm) when a chunk
+                           is ready; pcm is the chunk's samples in memory (None if too long to hold).
                            This is called in a background thread.
+            key_source: Reads one key (waiting up to a timeout, None = block) instead of
+                        the terminal; used for headless replay.
         """
         self.on_chunk_ready = on_chunk_ready
+        self.key_source = key_source
         self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.session_dir = config.AUDIO_DIR / self.session_id
         self.session_dir.mkdir(parents=True, exist_ok=True)
+        self.metrics = metrics.for_session(self.session_id)
 
         self.chunk_number = 0
         self.chunk_start_time: Optional[datetime] = None  # When current chunk started
-        self.recording_process: Optional[subprocess.Popen] = None
-        self.backup_process: Optional[subprocess.Popen] = None  # Continuous backup recording
-        self.backup_file: Optional[Path] = None
+        self.backup_file = self.session_dir / "full_session_backup.wav"  # Continuous backup recording
         self.running = False
         self._original_term_settings = None
-        self._processing_threads: list[threading.Thread] = []  # Track background threads
+        self.jobs = shutdown.ShutdownCoordinator(self.session_id)  # Background chunk processing
+        self.checkpointer = wav_header.HeaderCheckpointer()  # Keeps headers valid if we crash mid-recording
+        self.capture = capture.PcmCapture(self.backup_file, self.checkpointer)
 
     def _get_chunk_path(self) -> Path:
         """Get path for current chunk."""
         return self.session_dir / f"chunk_{self.chunk_number:04d}.wav"
 
-    def _start_backup_recording(self):
-        """Start continuous backup recording for the entire session."""
-        self.backup_file = self.session_dir / "full_session_backup.wav"
-
-        cmd = [
-            "sox",
-            "-d",  # Default input device
-            "-c", str(config.CHANNELS),
-            "-r", str(config.SAMPLE_RATE),
-            "-b", "16",
-            str(self.backup_file),
-        ]
-
-        self.backup_process = subprocess.Popen(
-            cmd,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
-
-    def _stop_backup_recording(self):
-        """Stop the continuous backup recording."""
-        if self.backup_process is None:
-            return
-
-        self.backup_process.terminate()
-        try:
-            self.backup_process.wait(timeout=2)
-        except subprocess.TimeoutExpired:
-            self.backup_process.kill()
-            self.backup_process.wait()
-
-        self.backup_process = None
-
     def _start_recording(self) -> Path:
-        """Start recording to current chunk. Returns the path being recorded to."""
+        """Start capturing the backup and the first chunk. Returns the path being recorded to."""
         output_path = self._get_chunk_path()
         self.chunk_start_time = datetime.now()  # Track when this chunk started
-
-        cmd = [
-            "sox",
-            "-d",  # Default input device
-            "-c", str(config.CHANNELS),
-            "-r", str(config.SAMPLE_RATE),
-            "-b", "16",
-            str(output_path),
-        ]
-
-        # Start recording process (no duration limit - we'll kill it on spacebar)
-        self.recording_process = subprocess.Popen(
-            cmd,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
-
+        self.capture.start(output_path)
         return output_path
 
-    def _stop_recording(self) -> tuple[Optional[Path], Optional[datetime]]:
-        """Stop current recording. Returns (path, start_time) tuple."""
-        if self.recording_process is None:
-            return None, None
+    def _stop_recording(self, final: bool = False) -> tuple[Optional[Path], Optional[datetime], Optional[bytes]]:
+        """
+        Cut the current chunk and carry straight on into the next one (or stop
+        capturing if final). Returns (path, start_time, pcm) for the cut chunk.
+        """
+        if self.capture.process is None:
+            return None, None, None
 
         current_path = self._get_chunk_path()
         start_time = self.chunk_start_time
 
-        # Send SIGTERM for clean shutdown
-        self.recording_process.terminate()
-        try:
-            self.recording_process.wait(timeout=2)
-        except subprocess.TimeoutExpired:
-            self.recording_process.kill()
-            self.recording_process.wait()
-
-        self.recording_process = None
+        cut_started = time.perf_counter()
+        if final:
+            pcm = self.capture.stop()
+        else:
+            pcm = self.capture.cut(self.session_dir / f"chunk_{self.chunk_number + 1:04d}.wav")
+            self.chunk_start_time = datetime.now()
+
+        self.metrics.timing(metrics.CUT, time.perf_counter() - cut_started, chunk=self.chunk_number)
+        if start_time:
+            self.metrics.gauge(metrics.CAPTURE, "chunk_seconds",
+                               (datetime.now() - start_time).total_seconds(), chunk=self.chunk_number)
         self.chunk_number += 1
 
-        # Verify file exists and has content
-        if current_path.exists() and current_path.stat().st_size > 1000:
-            return current_path, start_time
-        return None, None
+        # Verify the chunk has content (pcm is None only for chunks too long to hold in memory)
+        if pcm is None or len(pcm) > 1000:
+            import catalog
+            catalog.get().chunk_recorded(self.session_id, self.chunk_number - 1, current_path, start_time)
+            return current_path, start_time, pcm
+        return None, None, None
 
-    def _process_chunk_background(self, chunk_path: Path, chunk_num: int, chunk_start: datetime):
+    def _process_chunk_background(self, chunk_path: Path, chunk_num: int, chunk_start: datetime,
+                                  pcm: Optional[bytes] = None):
         """
         Process a chunk in background thread.
 
@@ -129,7 +98,7 @@ class InteractiveRecorder:
         """
         if self.on_chunk_ready:
             try:
-                self.on_chunk_ready(chunk_path, chunk_num, chunk_start)
+                self.on_chunk_ready(chunk_path, chunk_num, chunk_start, pcm)
             except Exception as e:
                 # Log error but NEVER crash - recording must continue
                 try:
@@ -141,6 +110,8 @@ class InteractiveRecorder:
 
     def _setup_terminal(self):
         """Set terminal to raw mode for single keypress detection."""
+        if self.key_source:
+            return
         self._original_term_settings = termios.tcgetattr(sys.stdin)
         tty.setraw(sys.stdin.fileno())
 
@@ -151,6 +122,8 @@ class InteractiveRecorder:
 
     def _read_key(self) -> str:
         """Read a single keypress."""
+        if self.key_source:
+            return self.key_source(None) or ""
         return sys.stdin.read(1)
 
     def run(self):
@@ -168,12 +141,9 @@ class InteractiveRecorder:
         print("  Q      - Quit recording")
         print(f"{'='*60}\n")
 
-        # Start continuous backup recording (entire session)
-        self._start_backup_recording()
-        print(f"📼 Backup recording: {self.backup_file.name}")
-
-        # Start first chunk recording
+        # Start continuous capture: backup recording (entire session) and the first chunk
         self._start_recording()
+        print(f"📼 Backup recording: {self.backup_file.name}")
         print(f"🔴 Recording chunk {self.chunk_number}... (press SPACE to cut)")
 
         try:
@@ -183,12 +153,9 @@ class InteractiveRecorder:
                 key = self._read_key()
 
                 if key == ' ':
-                    # Spacebar: cut current chunk, start new one immediately
+                    # Spacebar: cut current chunk; the next one continues from the same stream
                     current_chunk_num = self.chunk_number
-                    chunk_path, chunk_start = self._stop_recording()
-
-                    # Immediately start new recording (minimal gap)
-                    self._start_recording()
+                    chunk_path, chunk_start, pcm = self._stop_recording()
 
                     # Restore terminal briefly to print status
                     self._restore_terminal()
@@ -198,15 +165,11 @@ class InteractiveRecorder:
 
                     # Process the saved chunk in background
                     if chunk_path and chunk_start:
-                        thread = threading.Thread(
-                            target=self._process_chunk_background,
-                            args=(chunk_path, current_chunk_num, chunk_start),
-                            daemon=False  # Don't kill on exit - we'll wait for completion
-                        )
-                        thread.start()
-                        self._processing_threads.append(thread)
-
-                elif key.lower() == 'q' or ord(key) == 3:  # Q or Ctrl+C
+                        self.jobs.start(self._process_chunk_background, chunk_path, current_chunk_num,
+                                        chunk_start, pcm)
+                    profiler.checkpoint()
+
+                elif key and (key.lower() == 'q' or ord(key) == 3):  # Q or Ctrl+C
                     self.running = False
 
         except Exception as e:
@@ -214,23 +177,18 @@ class InteractiveRecorder:
         finally:
             self._restore_terminal()
 
-            # Stop final recording
-            final_chunk, final_start = self._stop_recording()
+            # Stop capturing (final chunk and backup recording)
+            final_chunk, final_start, final_pcm = self._stop_recording(final=True)
+            self.checkpointer.stop()
             if final_chunk and final_start:
                 print(f"\n✂️  Final chunk {self.chunk_number - 1} saved")
-                # Process final chunk (in foreground since we're exiting)
                 if self.on_chunk_ready:
-                    self._process_chunk_background(final_chunk, self.chunk_number - 1, final_start)
-
-            # Stop backup recording
-            self._stop_backup_recording()
+                    self.jobs.start(self._process_chunk_background, final_chunk, self.chunk_number - 1,
+                                    final_start, final_pcm)
 
-            # Wait for all background processing to complete
-            pending = [t for t in self._processing_threads if t.is_alive()]
-            if pending:
-                print(f"\n⏳ Waiting for {len(pending)} chunk(s) to finish processing...")
-                for t in pending:
-                    t.join(timeout=120)  # Wait up to 2 min per chunk
+            # One deadline for everything still processing; the rest is saved for process-queue
+            waited = self.jobs.pending()
+            if not self.jobs.shutdown() and waited:
                 print("✅ All chunks processed")
 
             # Get backup file size
@@ -252,7 +210,7 @@ class InteractiveRecorder:
 
 def test_interactive():
     """Test interactive recording without processing."""
-    def on_chunk(path, num, start_time):
+    def on_chunk(path, num, start_time, pcm=None):
         print(f"  [Background] Would process: {path} (started at {start_time})")
 
     recorder = InteractiveRecorder(on_chunk_ready=on_chunk)
@@ -0,0 +1,29 @@
+"""Change notification for the live view (see live_server.py).
+
+TranscriptManager.append and minutes_store.save call publish() when they
+commit, and the live view's long-poll requests wait on it. Kept apart from
+the HTTP server so the commit path pulls in nothing beyond threading.
+"""
+
+import threading
+
+_changed = threading.Condition()
+_versions: dict[str, int] = {}
+
+
+def publish(session_id: str):
+    """Note that a session's transcript or minutes changed and wake its waiters."""
+    with _changed:
+        _versions[session_id] = _versions.get(session_id, 0) + 1
+        _changed.notify_all()
+
+
+def version(session_id: str) -> int:
+    with _changed:
+        return _versions.get(session_id, 0)
+
+
+def wait_for_change(session_id: str, since: int, timeout: float) -> bool:
+    """Block until the session's version moves past since. Returns False on timeout."""
+    with _changed:
+        return _changed.wait_for(lambda: _versions.get(session_id, 0) != since, timeout)
@@ -0,0 +1,362 @@
+"""Read-only live view of sessions over HTTP (`serve`, or --serve on start/record).
+
+Board members follow the draft minutes and transcript from a tablet while the
+meeting is recorded. Endpoints (GET only, JSON unless noted):
+
+    /                                  Minimal page that follows a session live
+    /sessions                          Sessions, newest first
+    /sessions/<id>/transcript?since=C  Transcript segments after cursor C, and the new cursor
+    /sessions/<id>/minutes             Current minutes (text/markdown) with an ETag
+
+Both session endpoints long-poll with ?wait=N (seconds, at most
+LIVE_MAX_WAIT_SECONDS): the transcript answers as soon as there are segments
+after the cursor, the minutes as soon as their ETag differs from
+If-None-Match (304 Not Modified if the wait runs out). /sessions also honors
+If-None-Match.
+
+Waiting requests are woken by live_feed.publish(), which
+TranscriptManager.append and minutes_store.save call when they commit. A
+standalone `serve` runs in another process than the recorder, so it also
+stats the files of sessions that have waiters every LIVE_WATCH_SECONDS. Documents are kept in memory and re-read
+only when their file changes (the transcript incrementally, from the last
+offset read), so each viewer costs a stat per request and a sleeping thread
+while it waits.
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+import config
+from live_feed import publish, version, wait_for_change
+
+_SESSION_ID = re.compile(r"^\d{8}_\d{6}$")
+_CHUNK_HEADER = re.compile(r"^--- Chunk (-?\d+) \[[^\]]*\] ---$")
+_ROUTE = re.compile(r"^/sessions/(\d{8}_\d{6})/(transcript|minutes)$")
+
+SESSIONS_TTL = 2.0  # Seconds a /sessions answer is reused
+
+
+# --- Hot documents ------------------------------------------------------------
+
+def _stat_key(path: Optional[Path]) -> Optional[tuple]:
+    try:
+        stat = path.stat()
+    except (AttributeError, OSError):
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+class SessionDocuments:
+    """One session's minutes and parsed transcript, refreshed when their files change."""
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.transcript_file = config.TRANSCRIPTS_DIR / session_id / "full_transcript.txt"
+        self.minutes_file: Optional[Path] = None
+        self._lock = threading.Lock()
+        self._minutes_key = None
+        self.minutes = b""
+        self.etag = '"empty"'
+        self._transcript_ino = None
+        self.offset = 0  # Bytes of the transcript parsed so far (the cursor clients hold)
+        self.segments: list[dict] = []  # Each with "end", the cursor just after it
+        self._chunk: Optional[int] = None
+
+    def file_keys(self) -> tuple:
+        return _stat_key(self.minutes_file), _stat_key(self.transcript_file)
+
+    def refresh_minutes(self):
+        with self._lock:
+            if self.minutes_file is None or not self.minutes_file.exists():
+                # Lazy: minutes_generator saves through minutes_store, which publishes here
+                from minutes_generator import find_session_minutes
+                self.minutes_file = find_session_minutes(self.session_id)[0]
+            key = _stat_key(self.minutes_file)
+            if key is None or key == self._minutes_key:
+                return
+            try:
+                data = self.minutes_file.read_bytes()
+            except OSError:
+                return
+            self._minutes_key = key
+            if data != self.minutes:
+                self.minutes = data
+                self.etag = f'"{hashlib.sha1(data).hexdigest()[:16]}"'
+
+    def refresh_transcript(self):
+        with self._lock:
+            key = _stat_key(self.transcript_file)
+            if key is None:
+                return
+            ino, size, _ = key
+            if ino != self._transcript_ino or size < self.offset:
+                # Replaced or rewritten (e.g. resume rebuilt it): parse from the start
+                self._transcript_ino, self.offset, self.segments, self._chunk = ino, 0, [], None
+            if size == self.offset:
+                return
+            with open(self.transcript_file, "rb") as f:
+                f.seek(self.offset)
+                data = f.read(size - self.offset)
+            # Whole lines only: a line still being written is parsed once it ends
+            complete = data.rfind(b"\n") + 1
+            if complete:
+                self._parse(data[:complete])
+
+    def _parse(self, data: bytes):
+        """Append the segments in newly written transcript bytes."""
+        from agenda_aligner import parse_segments
+        position = self.offset
+        for raw in data.splitlines(keepends=True):
+            position += len(raw)
+            line = raw.decode("utf-8", errors="replace").strip()
+            header = _CHUNK_HEADER.match(line)
+            if header:
+                self._chunk = int(header[1])
+                continue
+            for stamp, text in parse_segments(line):
+                self.segments.append({"chunk": self._chunk, "time": stamp, "text": text, "end": position})
+        self.offset = position
+
+    def since(self, cursor: int) -> tuple[list[dict], bool]:
+        """Segments after a cursor, and whether the cursor was stale (everything is returned)."""
+        with self._lock:
+            if cursor > self.offset:
+                return list(self.segments), True
+            # Segments are in file order, so walk back from the end
+            start = len(self.segments)
+            while start and self.segments[start - 1]["end"] > cursor:
+                start -= 1
+            return self.segments[start:], False
+
+
+class LiveCache:
+    """Documents of the most recently viewed sessions."""
+
+    def __init__(self, max_sessions: int = config.LIVE_CACHE_SESSIONS):
+        self.max_sessions = max_sessions
+        self._lock = threading.Lock()
+        self._documents: OrderedDict[str, SessionDocuments] = OrderedDict()
+        self._waiting: dict[str, int] = {}
+        self._sessions: tuple[float, bytes, str] = (0.0, b"", "")
+
+    def documents(self, session_id: str) -> SessionDocuments:
+        with self._lock:
+            docs = self._documents.pop(session_id, None) or SessionDocuments(session_id)
+            self._documents[session_id] = docs
+            while len(self._documents) > self.max_sessions:
+                self._documents.popitem(last=False)
+            return docs
+
+    def sessions(self) -> tuple[bytes, str]:
+        """The /sessions body and its ETag, recomputed at most every SESSIONS_TTL seconds."""
+        with self._lock:
+            computed, body, etag = self._sessions
+            if time.monotonic() - computed < SESSIONS_TTL:
+                return body, etag
+        body = json.dumps({"sessions": list_sessions()}).encode()
+        etag = f'"{hashlib.sha1(body).hexdigest()[:16]}"'
+        with self._lock:
+            self._sessions = (time.monotonic(), body, etag)
+        return body, etag
+
+    # Sessions with long-polls in flight (the ones the file watcher stats)
+    def waiting(self, session_id: str, delta: int):
+        with self._lock:
+            count = self._waiting.get(session_id, 0) + delta
+            if count > 0:
+                self._waiting[session_id] = count
+            else:
+                self._waiting.pop(session_id, None)
+
+    def watched(self) -> list[SessionDocuments]:
+        with self._lock:
+            return [self._documents[sid] for sid in self._waiting if sid in self._documents]
+
+
+def list_sessions(limit: int = 50) -> list[dict]:
+    """Newest sessions from the catalog (or the transcripts folder when it is disabled)."""
+    import catalog
+    cat = catalog.get()
+    if cat.enabled:
+        return [{"id": row["id"], "meeting": row["meeting_name"], "started": row["started"],
+                 "ended": row["ended"], "chunks": row["chunks"]} for row in cat.sessions(limit=limit)]
+    if not config.TRANSCRIPTS_DIR.exists():
+        return []
+    ids = sorted((p.name for p in config.TRANSCRIPTS_DIR.iterdir() if _SESSION_ID.match(p.name)), reverse=True)
+    return [{"id": sid} for sid in ids[:limit]]
+
+
+# --- HTTP ---------------------------------------------------------------------
+
+VIEWER_PAGE = b"""<!doctype html>
+<html><head><meta charset="utf-8"><meta name="viewport" content="width=device-width">
+<title>Minute Bot</title>
+<style>body{font:16px/1.4 sans-serif;margin:1em}pre{white-space:pre-wrap}#t{color:#555;font-size:14px}</style>
+</head><body><h3 id="h">Minute Bot</h3><pre id="m"></pre><h4>Transcript</h4><div id="t"></div>
+<script>
+const q = new URLSearchParams(location.search);
+async function follow(sid) {
+  document.getElementById("h").textContent = sid;
+  let etag = "", cursor = 0;
+  (async () => { for (;;) {
+    const r = await fetch(`/sessions/${sid}/minutes?wait=25`, {headers: etag ? {"If-None-Match": etag} : {}}).catch(() => null);
+    if (r && r.status == 200) { etag = r.headers.get("ETag"); document.getElementById("m").textContent = await r.text(); }
+    else if (!r || r.status != 304) await new Promise(s => setTimeout(s, 5000));
+  } })();
+  for (;;) {
+    const r = await fetch(`/sessions/${sid}/transcript?since=${cursor}&wait=25`).catch(() => null);
+    if (!r || !r.ok) { await new Promise(s => setTimeout(s, 5000)); continue; }
+    const d = await r.json(), t = document.getElementById("t");
+    if (d.reset) t.textContent = "";
+    for (const s of d.segments) t.appendChild(document.createElement("div")).textContent = (s.time ? `[${s.time}] ` : "") + s.text;
+    cursor = d.cursor;
+  }
+}
+(async () => {
+  const sid = q.get("session") || ((await (await fetch("/sessions")).json()).sessions[0] || {}).id;
+  if (sid) follow(sid); else document.getElementById("m").textContent = "No sessions yet.";
+})();
+</script></body></html>
+"""
+
+
+class LiveHandler:
+    """Request handling, mixed into http.server's BaseHTTPRequestHandler by make_server."""
+
+    cache: LiveCache = None  # Set by make_server
+    server_version = "MinuteBot"
+
+    def log_message(self, format, *args):
+        pass  # Quiet: the recorder UI owns the terminal
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        try:
+            if url.path == "/":
+                self._send(200, VIEWER_PAGE, "text/html; charset=utf-8")
+            elif url.path == "/sessions":
+                body, etag = self.cache.sessions()
+                self._send_tagged(body, etag, "application/json")
+            elif route := _ROUTE.match(url.path):
+                session_id, document = route.groups()
+                wait = min(max(float(query.get("wait", ["0"])[0]), 0.0), config.LIVE_MAX_WAIT_SECONDS)
+                if document == "transcript":
+                    self._transcript(session_id, int(query.get("since", ["0"])[0]), wait)
+                else:
+                    self._minutes(session_id, wait)
+            else:
+                self._send(404, b'{"error": "not found"}', "application/json")
+        except ValueError:
+            self._send(400, b'{"error": "bad since or wait"}', "application/json")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Viewer went away mid-poll
+
+    def _long_poll(self, docs: SessionDocuments, refresh, ready, wait: float):
+        """Refresh until ready() or the wait runs out (woken by publish or the file watcher)."""
+        deadline = time.monotonic() + wait
+        self.cache.waiting(docs.session_id, 1)
+        try:
+            while True:
+                seen = version(docs.session_id)  # Before refreshing, so no change is missed
+                refresh()
+                remaining = deadline - time.monotonic()
+                if ready() or remaining <= 0:
+                    return
+                wait_for_change(docs.session_id, seen, remaining)
+        finally:
+            self.cache.waiting(docs.session_id, -1)
+
+    def _transcript(self, session_id: str, cursor: int, wait: float):
+        docs = self.cache.documents(session_id)
+        self._long_poll(docs, docs.refresh_transcript, lambda: docs.offset != cursor, wait)
+        if not docs.transcript_file.exists() and not docs.offset:
+            self._send(404, b'{"error": "no transcript"}', "application/json")
+            return
+        segments, reset = docs.since(cursor)
+        body = {"cursor": docs.offset, "reset": reset,
+                "segments": [{k: v for k, v in s.items() if k != "end"} for s in segments]}
+        self._send(200, json.dumps(body).encode(), "application/json")
+
+    def _minutes(self, session_id: str, wait: float):
+        docs = self.cache.documents(session_id)
+        known = self.headers.get("If-None-Match")
+        self._long_poll(docs, docs.refresh_minutes, lambda: docs.etag != known, wait)
+        if docs.minutes_file is None:
+            self._send(404, b'{"error": "no minutes"}', "application/json")
+            return
+        self._send_tagged(docs.minutes, docs.etag, "text/markdown; charset=utf-8")
+
+    def _send_tagged(self, body: bytes, etag: str, content_type: str):
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, b"", content_type, etag)
+        else:
+            self._send(200, body, content_type, etag)
+
+    def _send(self, status: int, body: bytes, content_type: str, etag: Optional[str] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        if etag:
+            self.send_header("ETag", etag)
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+
+def make_server(host: str, port: int) -> "ThreadingHTTPServer":
+    # Imported here: http.server pulls in http.client and email, which the recorder never needs
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    handler = type("Handler", (LiveHandler, BaseHTTPRequestHandler), {"cache": LiveCache()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def _watch_files(cache: LiveCache, stop: threading.Event):
+    """Publish changes made by other processes to sessions that have waiters."""
+    seen: dict[str, tuple] = {}
+    while not stop.wait(config.LIVE_WATCH_SECONDS):
+        for docs in cache.watched():
+            keys = docs.file_keys()
+            if seen.get(docs.session_id, keys) != keys:
+                publish(docs.session_id)
+            seen[docs.session_id] = keys
+
+
+def start_background(host: str = config.LIVE_HOST, port: int = config.LIVE_PORT) -> Optional["ThreadingHTTPServer"]:
+    """Serve from inside a recording process (fail-safe: a server error only warns)."""
+    try:
+        server = make_server(host, port)
+    except OSError as e:
+        print(f"  [Warning] Live view unavailable on {host}:{port}: {e}")
+        return None
+    threading.Thread(target=server.serve_forever, name="live-server", daemon=True).start()
+    print(f"Live view: http://{host}:{port}/")
+    return server
+
+
+def serve(host: str = config.LIVE_HOST, port: int = config.LIVE_PORT):
+    """Run the live view in the foreground until Ctrl+C."""
+    server = make_server(host, port)
+    stop = threading.Event()
+    threading.Thread(target=_watch_files, args=(server.RequestHandlerClass.cache, stop),
+                     name="live-watch", daemon=True).start()
+    print(f"Live view: http://{host}:{port}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
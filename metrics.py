@@ -0,0 +1,224 @@
+"""Per-stage pipeline metrics.
+
+Each session writes timing and counter events to
+data/transcripts/{session}/metrics.jsonl, one JSON object per line:
+
+    {"t": 1739234040.1, "stage": "transcribe", "kind": "timing", "seconds": 41.2, "chunk": 3, ...}
+
+When metrics are disabled every hook is a no-op on a shared null object, so
+instrumented code pays only an attribute lookup.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+import config
+
+# Pipeline stages
+CAPTURE = "capture"
+CUT = "cut"
+TRANSCRIBE = "transcribe"
+COMMIT = "commit"
+MINUTES = "minutes"
+QUEUE = "queue"
+NORMALIZE = "normalize"  # Prompt tokens saved by transcript normalization
+POOL_WAIT = "pool_wait"  # Time a chunk waited for a shared transcription worker (host mode)
+API_WAIT = "api_wait"  # Time a request waited for the shared API rate limiter (host mode)
+AUTOTUNE = "autotune"  # Chunk length / model changes made by record --auto-tune
+
+
+class NullMetrics:
+    """Metrics sink that discards everything."""
+
+    enabled = False
+
+    def timing(self, stage: str, seconds: float, **fields):
+        pass
+
+    def count(self, stage: str, name: str, value: float = 1, **fields):
+        pass
+
+    def gauge(self, stage: str, name: str, value: float, **fields):
+        pass
+
+    @contextmanager
+    def timer(self, stage: str, **fields):
+        yield fields
+
+
+class SessionMetrics(NullMetrics):
+    """Appends metric events for one session to its metrics.jsonl."""
+
+    enabled = True
+
+    def __init__(self, session_id: str, path: Optional[Path] = None):
+        self.session_id = session_id
+        self.path = path or metrics_path(session_id)
+        self._lock = threading.Lock()
+
+    def _emit(self, event: dict):
+        event["t"] = round(time.time(), 3)
+        line = json.dumps(event, default=str)
+        try:
+            with self._lock:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a") as f:
+                    f.write(line + "\n")
+        except Exception as e:
+            # Metrics must never disturb recording
+            print(f"  [Warning] Could not write metrics: {e}")
+
+    def timing(self, stage: str, seconds: float, **fields):
+        self._emit({"stage": stage, "kind": "timing", "seconds": round(seconds, 4), **fields})
+
+    def count(self, stage: str, name: str, value: float = 1, **fields):
+        self._emit({"stage": stage, "kind": "count", "name": name, "value": value, **fields})
+
+    def gauge(self, stage: str, name: str, value: float, **fields):
+        self._emit({"stage": stage, "kind": "gauge", "name": name, "value": value, **fields})
+
+    @contextmanager
+    def timer(self, stage: str, **fields):
+        """Time a block; the yielded dict can be filled with extra fields."""
+        start = time.perf_counter()
+        ok = True
+        try:
+            yield fields
+        except BaseException:
+            ok = False
+            raise
+        finally:
+            self.timing(stage, time.perf_counter() - start, ok=ok, **fields)
+
+
+NULL_METRICS = NullMetrics()
+
+_sessions: dict[str, SessionMetrics] = {}
+_sessions_lock = threading.Lock()
+
+
+def metrics_path(session_id: str) -> Path:
+    return config.TRANSCRIPTS_DIR / session_id / "metrics.jsonl"
+
+
+def for_session(session_id: Optional[str]) -> NullMetrics:
+    """The metrics sink for a session (a shared no-op when disabled)."""
+    if not config.METRICS_ENABLED or not session_id:
+        return NULL_METRICS
+    with _sessions_lock:
+        if session_id not in _sessions:
+            _sessions[session_id] = SessionMetrics(session_id)
+        return _sessions[session_id]
+
+
+def load_events(session_id: str) -> list[dict]:
+    """Read all metric events recorded for a session."""
+    path = metrics_path(session_id)
+    if not path.exists():
+        return []
+    events = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue  # Torn last line after a crash
+    return events
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Linear-interpolated percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def summarize(events: list[dict]) -> dict:
+    """
+    Aggregate events into per-stage timing percentiles and counter totals.
+
+    Returns {"timings": {stage: {...}}, "counts": {(stage, name): total},
+             "gauges": {(stage, name): {...}}, "fields": {stage: {field: [values]}}}
+    """
+    timings: dict[str, list[float]] = {}
+    counts: dict[tuple[str, str], float] = {}
+    gauges: dict[tuple[str, str], list[float]] = {}
+    fields: dict[str, dict[str, list[float]]] = {}
+
+    for e in events:
+        stage = e.get("stage", "?")
+        kind = e.get("kind")
+        if kind == "timing":
+            timings.setdefault(stage, []).append(e.get("seconds", 0.0))
+            for key, value in e.items():
+                if key in ("t", "stage", "kind", "seconds", "chunk", "ok"):
+                    continue
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    fields.setdefault(stage, {}).setdefault(key, []).append(value)
+        elif kind == "count":
+            key = (stage, e.get("name", "?"))
+            counts[key] = counts.get(key, 0) + e.get("value", 0)
+        elif kind == "gauge":
+            gauges.setdefault((stage, e.get("name", "?")), []).append(e.get("value", 0))
+
+    def stats(values: list[float]) -> dict:
+        return {
+            "n": len(values),
+            "total": sum(values),
+            "p50": percentile(values, 50),
+            "p90": percentile(values, 90),
+            "p99": percentile(values, 99),
+            "max": max(values) if values else 0.0,
+        }
+
+    return {
+        "timings": {stage: stats(values) for stage, values in timings.items()},
+        "counts": counts,
+        "gauges": {key: stats(values) for key, values in gauges.items()},
+        "fields": {stage: {k: stats(v) for k, v in f.items()} for stage, f in fields.items()},
+    }
+
+
+def print_stats(session_id: str):
+    """Print a session's metrics summary."""
+    events = load_events(session_id)
+    if not events:
+        print(f"No metrics recorded for session {session_id}")
+        print(f"  (expected at {metrics_path(session_id)}; enable with METRICS_ENABLED in config.py)")
+        return
+
+    summary = summarize(events)
+    span = events[-1]["t"] - events[0]["t"] if len(events) > 1 else 0.0
+    print(f"Session {session_id}: {len(events)} events over {span / 60:.1f} min\n")
+
+    print(f"{'Stage':<12} {'n':>5} {'total s':>9} {'p50 s':>8} {'p90 s':>8} {'p99 s':>8} {'max s':>8}")
+    for stage, s in sorted(summary["timings"].items()):
+        print(f"{stage:<12} {s['n']:>5} {s['total']:>9.2f} {s['p50']:>8.3f} "
+              f"{s['p90']:>8.3f} {s['p99']:>8.3f} {s['max']:>8.3f}")
+
+    if summary["fields"]:
+        print(f"\n{'Stage.field':<28} {'p50':>10} {'p90':>10} {'max':>10} {'total':>12}")
+        for stage, stage_fields in sorted(summary["fields"].items()):
+            for name, s in sorted(stage_fields.items()):
+                print(f"{stage + '.' + name:<28} {s['p50']:>10.3f} {s['p90']:>10.3f} "
+                      f"{s['max']:>10.3f} {s['total']:>12.1f}")
+
+    if summary["gauges"]:
+        print(f"\n{'Gauge':<28} {'p50':>10} {'p90':>10} {'max':>10}")
+        for (stage, name), s in sorted(summary["gauges"].items()):
+            print(f"{stage + '.' + name:<28} {s['p50']:>10.2f} {s['p90']:>10.2f} {s['max']:>10.2f}")
+
+    if summary["counts"]:
+        print(f"\n{'Counter':<28} {'total':>10}")
+        for (stage, name), total in sorted(summary["counts"].items()):
+            print(f"{stage + '.' + name:<28} {total:>10g}")
@@ -14,38 +14,43 @@ Usage:
 
 import argparse
 import sys
+import time
 from datetime import datetime
+from pathlib import Path
 
 import config
-from recorder import AudioRecorder, test_microphone
-from transcriber import Transcriber, TranscriptManager
-from minutes_generator import MinutesGenerator, OfflineMinutesStore
-from interactive_recorder import InteractiveRecorder
 
-try:
-    from ui_recorder import UIRecorder
-    UI_AVAILABLE = True
-except ImportError:
-    UI_AVAILABLE = False
+# Command modules are imported inside each command so that --help, test-mic
+# and transcribe don't pay for rich, numpy, sounddevice or the Anthropic SDK.
 
 
-def ui_meeting(meeting_name: str, model: str):
+def ui_meeting(meeting_name: str, model: str, key_source=None):
     """Interactive recording with rich UI and audio level meter."""
-    if not UI_AVAILABLE:
+    try:
+        from ui_recorder import UIRecorder
+    except ImportError:
         print("UI dependencies not available. Install with: pip install sounddevice rich")
         print("Falling back to basic interactive mode.\n")
-        interactive_meeting(meeting_name, model)
+        interactive_meeting(meeting_name, model, key_source)
         return
 
     if not config.ANTHROPIC_API_KEY:
         print("Warning: ANTHROPIC_API_KEY not set. Running in offline mode.\n")
 
+    import pipeline_state
+    import profiler
+    from capture import pcm_seconds
+    from minutes_generator import MinutesGenerator, OfflineMinutesStore
+    from pipeline_state import PipelineState
+    from transcriber import Transcriber, TranscriptManager, wav_duration
+
     transcriber = Transcriber(model=model)
+    pipeline = PipelineState()
     transcript_mgr = None
     minutes_gen = None
     offline_store = None
 
-    def on_chunk_ready(audio_path, chunk_number, chunk_start):
+    def on_chunk_ready(audio_path, chunk_number, chunk_start, pcm=None):
         nonlocal transcript_mgr, minutes_gen, offline_store
 
         if transcript_mgr is None:
@@ -55,19 +60,40 @@ def ui_meeting(meeting_name: str, model: str):
             offline_store = OfflineMinutesStore(session_id)
             minutes_gen.offline_queue = offline_store.load_queue()
 
-        result = transcriber.transcribe(audio_path, chunk_start_time=chunk_start)
+        pipeline.set_stage(chunk_number, pipeline_state.TRANSCRIBING)
+        started = time.perf_counter()
+        result = transcriber.transcribe(audio_path, chunk_start_time=chunk_start, pcm=pcm)
         text = result.get("text", "").strip()
         timestamped = result.get("timestamped_text", "").strip()
+        audio_seconds = pcm_seconds(pcm) if pcm is not None else wav_duration(audio_path)
+        pipeline.record_transcription(time.perf_counter() - started, audio_seconds, text)
 
+        if result.get("error"):
+            pipeline.set_stage(chunk_number, pipeline_state.FAILED, result["error"][:30])
+            return
         if not text:
+            pipeline.set_stage(chunk_number, pipeline_state.DONE)
             return
 
         # Use timestamped text for both transcript and minutes
         transcript_mgr.append(timestamped if timestamped else text, chunk_number)
-        minutes_gen.update_minutes(timestamped if timestamped else text, chunk_number)
+        if not recorder.jobs.transcribed(chunk_number, timestamped if timestamped else text):
+            return  # Quit deadline passed: saved for process-queue
+        pipeline.set_stage(chunk_number, pipeline_state.MINUTES)
+        success = minutes_gen.update_minutes(timestamped if timestamped else text, chunk_number)
+        if recorder.jobs.abandoned(chunk_number):
+            return  # Finished after the deadline: the saved job covers it
         offline_store.save_queue(minutes_gen.offline_queue)
+        if success:
+            if minutes_gen.last_api_seconds is not None:
+                pipeline.record_api(minutes_gen.last_api_seconds)
+            pipeline.set_stage(chunk_number, pipeline_state.DONE)
+        else:
+            pipeline.set_stage(chunk_number, pipeline_state.QUEUED_OFFLINE)
 
-    recorder = UIRecorder(on_chunk_ready=on_chunk_ready)
+    recorder = UIRecorder(on_chunk_ready=on_chunk_ready, pipeline=pipeline, key_source=key_source)
+    transcriber.stop = recorder.jobs.stop
+    profiler.set_output_dir(config.TRANSCRIPTS_DIR / recorder.session_id / "profile")
     recorder.run(meeting_name)
 
     # Finalize minutes with end time
@@ -78,7 +104,7 @@ def ui_meeting(meeting_name: str, model: str):
         print(f"📝 Transcript: {transcript_mgr.transcript_file}")
 
 
-def interactive_meeting(meeting_name: str, model: str):
+def interactive_meeting(meeting_name: str, model: str, key_source=None):
     """Interactive recording with spacebar-triggered chunks (basic mode)."""
 
     print(f"""
@@ -95,13 +121,18 @@ def interactive_meeting(meeting_name: str, model: str):
     if not config.ANTHROPIC_API_KEY:
         print("Warning: ANTHROPIC_API_KEY not set. Running in offline mode.\n")
 
+    import profiler
+    from interactive_recorder import InteractiveRecorder
+    from minutes_generator import MinutesGenerator, OfflineMinutesStore
+    from transcriber import Transcriber, TranscriptManager
+
     # These will be initialized once we have a session ID
     transcriber = Transcriber(model=model)
     transcript_mgr = None
     minutes_gen = None
     offline_store = None
 
-    def on_chunk_ready(audio_path, chunk_number, chunk_start):
+    def on_chunk_ready(audio_path, chunk_number, chunk_start, pcm=None):
         """Process a chunk in the background."""
         nonlocal transcript_mgr, minutes_gen, offline_store
 
@@ -116,7 +147,7 @@ def interactive_meeting(meeting_name: str, model: str):
         print(f"\n  📝 Processing chunk {chunk_number}...")
 
         # Transcribe with wall clock timestamps
-        result = transcriber.transcribe(audio_path, chunk_start_time=chunk_start)
+        result = transcriber.transcribe(audio_path, chunk_start_time=chunk_start, pcm=pcm)
         text = result.get("text", "").strip()
         timestamped = result.get("timestamped_text", "").strip()
 
@@ -128,9 +159,13 @@ def interactive_meeting(meeting_name: str, model: str):
 
         # Save transcript with timestamps
         transcript_mgr.append(timestamped if timestamped else text, chunk_number)
+        if not recorder.jobs.transcribed(chunk_number, timestamped if timestamped else text):
+            return  # Quit deadline passed: saved for process-queue
 
         # Update minutes (pass timestamped text so Claude can extract section times)
         success = minutes_gen.update_minutes(timestamped if timestamped else text, chunk_number)
+        if recorder.jobs.abandoned(chunk_number):
+            return  # Finished after the deadline: the saved job covers it
         if success:
             print(f"  ✅ Minutes updated")
         else:
@@ -140,7 +175,9 @@ def interactive_meeting(meeting_name: str, model: str):
         offline_store.save_queue(minutes_gen.offline_queue)
 
     # Run interactive recorder
-    recorder = InteractiveRecorder(on_chunk_ready=on_chunk_ready)
+    recorder = InteractiveRecorder(on_chunk_ready=on_chunk_ready, key_source=key_source)
+    transcriber.stop = recorder.jobs.stop
+    profiler.set_output_dir(config.TRANSCRIPTS_DIR / recorder.session_id / "profile")
 
     try:
         session_dir = recorder.run()
@@ -153,8 +190,15 @@ def interactive_meeting(meeting_name: str, model: str):
             print(f"📝 Full transcript: {transcript_mgr.transcript_file}")
 
 
-def record_meeting(meeting_name: str, chunk_duration: int, model: str):
-    """Main recording loop with transcription and minutes generation."""
+def record_meeting(meeting_name: str, chunk_duration: int, model: str, max_chunks: int = None,
+                   auto_tune: bool = False, target_lag: float = None):
+    """
+    Main recording loop with transcription and minutes generation.
+
+    With auto_tune, chunks are processed in the background while recording
+    continues, and chunk length and model adapt to keep up (see autotune.py).
+    """
+    tuning = f"on, target lag {target_lag or config.AUTOTUNE_TARGET_LAG_SECONDS:g}s" if auto_tune else "off"
 
     print(f"""
 ╔══════════════════════════════════════════════════════════════╗
@@ -164,14 +208,22 @@ def record_meeting(meeting_name: str, chunk_duration: int, model: str):
 ║  Meeting: {meeting_name:<50} ║
 ║  Chunk duration: {chunk_duration}s                                        ║
 ║  Whisper model: {model:<44} ║
+║  Auto-tune: {tuning:<48} ║
 ║  Offline capable: Yes (transcripts queued when offline)     ║
 ╠══════════════════════════════════════════════════════════════╣
 ║  Press Ctrl+C to stop recording                              ║
 ╚══════════════════════════════════════════════════════════════╝
 """)
 
+    import archiver
+    import profiler
+    from minutes_generator import MinutesGenerator, OfflineMinutesStore
+    from recorder import AudioRecorder
+    from transcriber import Transcriber, TranscriptManager
+
     # Initialize components
     recorder = AudioRecorder(chunk_duration=chunk_duration)
+    profiler.set_output_dir(config.TRANSCRIPTS_DIR / recorder.session_id / "profile")
     transcriber = Transcriber(model=model)
     transcript_mgr = TranscriptManager(recorder.session_id)
     minutes_gen = MinutesGenerator(meeting_name, session_id=recorder.session_id)
@@ -182,25 +234,49 @@ def record_meeting(meeting_name: str, chunk_duration: int, model: str):
     if minutes_gen.offline_queue:
         print(f"Loaded {len(minutes_gen.offline_queue)} queued transcripts from previous session")
 
+    tuner, lane = None, None
+    pending: dict[int, float] = {}  # Chunks recorded but not yet processed -> when recorded
+    pending_lock = None  # Guards pending between the recording thread and the lane
+    if auto_tune:
+        import threading
+
+        import autotune
+        import metrics
+        from concurrent.futures import ThreadPoolExecutor
+
+        pending_lock = threading.Lock()
+
+        installed = [m for m in autotune.MODEL_COST if Transcriber(model=m).model_path.exists()]
+        tuner = autotune.AutoTuner(chunk_duration, model, target_lag, installed,
+                                   sink=metrics.for_session(recorder.session_id))
+        lane = ThreadPoolExecutor(max_workers=1, thread_name_prefix="record-lane")
+
     def process_chunk(audio_path):
         """Callback for each recorded chunk."""
+        chunk = int(audio_path.stem.split("_")[1])
+        chunk_transcriber = transcriber
         print(f"\n{'='*60}")
         print(f"Processing chunk: {audio_path.name}")
         print(f"{'='*60}")
 
         # Transcribe
-        result = transcriber.transcribe(audio_path)
+        started = time.perf_counter()
+        result = chunk_transcriber.transcribe(audio_path)
         text = result.get("text", "").strip()
+        if tuner and not result.get("error"):
+            tuner.observe_transcription(chunk_transcriber.model, archiver.audio_seconds(audio_path),
+                                        time.perf_counter() - started)
 
         if not text:
             print("  (No speech detected)")
             return
 
         # Save transcript
-        transcript_mgr.append(text, recorder.chunk_number - 1)
+        transcript_mgr.append(text, chunk)
 
         # Update minutes
-        minutes_gen.update_minutes(text, recorder.chunk_number - 1)
+        if minutes_gen.update_minutes(text, chunk) and tuner and minutes_gen.last_api_seconds is not None:
+            tuner.observe_minutes(minutes_gen.last_api_seconds)
 
         # Try to process queue if we have connectivity
         if minutes_gen.offline_queue:
@@ -211,11 +287,45 @@ def record_meeting(meeting_name: str, chunk_duration: int, model: str):
 
         print(f"\nWaiting for next chunk...")
 
+    def process_in_lane(audio_path):
+        try:
+            process_chunk(audio_path)
+        except Exception as e:
+            print(f"  [Warning] Processing {audio_path.name} failed: {e}")
+        finally:
+            with pending_lock:
+                pending.pop(int(audio_path.stem.split("_")[1]), None)
+
+    def on_chunk(audio_path):
+        """Process in line, or hand to the lane and re-tune before the next chunk."""
+        nonlocal transcriber
+        if lane is None:
+            process_chunk(audio_path)
+            return
+        with pending_lock:
+            pending[int(audio_path.stem.split("_")[1])] = time.time()
+        lane.submit(process_in_lane, audio_path)
+
+        with pending_lock:
+            oldest = min(pending.values(), default=time.time())
+        backlog = time.time() - oldest
+        decision = tuner.decide(backlog)
+        if decision:
+            recorder.chunk_duration = decision.chunk_seconds
+            if decision.model != transcriber.model:
+                transcriber = Transcriber(model=decision.model)
+
     try:
-        recorder.start_continuous(callback=process_chunk)
+        recorder.start_continuous(callback=on_chunk, max_chunks=max_chunks)
     except KeyboardInterrupt:
         pass
     finally:
+        if lane:
+            with pending_lock:
+                unfinished = len(pending)
+            if unfinished:
+                print(f"\nFinishing {unfinished} chunk(s) still being processed...")
+            lane.shutdown(wait=True)
         # Finalize minutes with end time
         minutes_gen.finalize()
         offline_store.save_queue(minutes_gen.offline_queue)
@@ -231,40 +341,62 @@ def record_meeting(meeting_name: str, chunk_duration: int, model: str):
 ║  Queued (offline): {len(minutes_gen.offline_queue):<41} ║
 ╚══════════════════════════════════════════════════════════════╝
 """)
+        if tuner:
+            print(f"Auto-tune: {len(tuner.decisions)} change(s); ended on {tuner.chunk_seconds}s chunks "
+                  f"with the {tuner.model} model")
 
 
 def transcribe_file(audio_path: str, model: str):
     """Transcribe a single audio file."""
-    from pathlib import Path
+    import archiver
+
     path = Path(audio_path)
-    if not path.exists():
+    if not path.exists() and not archiver.archived_entry(path):
         print(f"File not found: {audio_path}")
         sys.exit(1)
 
+    import profiler
+    from transcriber import Transcriber
+
+    profiler.set_output_dir(path.parent / f"{path.stem}_profile")
     transcriber = Transcriber(model=model)
     result = transcriber.transcribe(path)
     print(f"\nTranscription:\n{result.get('text', 'No text')}")
 
 
-def process_offline_queue():
+def process_offline_queue(use_batch: bool = False):
     """Find and process any queued transcripts from offline sessions."""
-    import json
+    import shutdown
+
+    # Chunks left unfinished when a recording was quit go into the queue first
+    for session_id in shutdown.pending_sessions():
+        print(f"Session {session_id}: finishing chunks left at shutdown...")
+        shutdown.resume_jobs(session_id)
+
+    if use_batch:
+        import batch_processor
+        requests, items = batch_processor.queue_requests()
+        if batch_processor.submit(requests, items):
+            print("Run 'batch-status --wait' to apply results when the batch ends.")
+        return
+
+    import catalog
+    from minutes_generator import OfflineMinutesStore, open_session
 
-    queue_files = list(config.DATA_DIR.glob("*_offline_queue.json"))
+    session_ids = catalog.get().queued_sessions()
 
-    if not queue_files:
+    if not session_ids:
         print("No offline queues found.")
         return
 
-    print(f"Found {len(queue_files)} offline queue(s):\n")
+    print(f"Found {len(session_ids)} offline queue(s):\n")
 
-    for queue_file in queue_files:
-        session_id = queue_file.stem.replace("_offline_queue", "")
+    for session_id in session_ids:
         print(f"Session: {session_id}")
 
         try:
-            with open(queue_file) as f:
-                queue = json.load(f)
+            store = OfflineMinutesStore(session_id)
+            queue = store.load_queue()
 
             if not queue:
                 print("  (empty queue)")
@@ -272,34 +404,18 @@ def process_offline_queue():
 
             print(f"  Queued chunks: {len(queue)}")
 
-            # Combine all transcripts
-            combined_text = "\n\n".join(
-                f"[Chunk {item.get('chunk', '?')}]\n{item.get('text', '')}"
-                for item in queue
-            )
-
-            # Try to find the meeting name from existing minutes
-            minutes_files = list(config.MINUTES_DIR.glob(f"{session_id}*.md"))
-            if minutes_files:
-                meeting_name = minutes_files[0].stem.split("_", 2)[-1] if "_" in minutes_files[0].stem else "Meeting"
-            else:
-                meeting_name = "Meeting"
-
-            print(f"  Meeting: {meeting_name}")
+            # Pick up the session's existing minutes and meeting name
+            gen = open_session(session_id)
+            print(f"  Meeting: {gen.meeting_name}")
             print(f"  Processing...")
 
-            # Create generator and process
-            gen = MinutesGenerator(meeting_name)
-            if minutes_files and minutes_files[0].exists():
-                gen.current_minutes = minutes_files[0].read_text()
-                gen.minutes_file = minutes_files[0]
-
-            success = gen.update_minutes(combined_text, -1)
+            gen.offline_queue = queue
+            success = gen.process_queue() > 0
 
             if success:
                 print(f"  ✅ Minutes updated: {gen.minutes_file}")
                 # Clear the queue file
-                queue_file.unlink()
+                store.clear()
                 print(f"  ✅ Queue cleared")
             else:
                 print(f"  ❌ Failed to process (still offline?)")
@@ -310,6 +426,53 @@ def process_offline_queue():
         print()
 
 
+def regenerate_sessions(session_ids: list[str], use_batch: bool = False):
+    """Rebuild minutes for past sessions from their full transcripts."""
+    if use_batch:
+        import batch_processor
+        requests, items = batch_processor.regenerate_requests(session_ids)
+        if batch_processor.submit(requests, items):
+            print("Run 'batch-status --wait' to apply results when the batch ends.")
+        return
+
+    from minutes_generator import open_session
+
+    for session_id in session_ids:
+        transcript_file = config.TRANSCRIPTS_DIR / session_id / "full_transcript.txt"
+        if not transcript_file.exists():
+            print(f"{session_id}: no transcript found, skipping")
+            continue
+
+        gen = open_session(session_id)
+        gen.current_minutes = gen.template_minutes()
+        print(f"{session_id}: regenerating minutes for {gen.meeting_name}...")
+        if gen.update_minutes(transcript_file.read_text(), -1):
+            if gen.session_end:
+                gen.finalize(ended=gen.session_end)
+            print(f"  ✅ Minutes updated: {gen.minutes_file}")
+        else:
+            print(f"  ❌ Failed to regenerate (still offline?)")
+
+
+def show_cache_stats(clear: bool = False):
+    """Print response cache statistics."""
+    from response_cache import ResponseCache
+    cache = ResponseCache()
+    if clear:
+        cache.clear()
+        print("Response cache cleared.")
+        return
+
+    stats = cache.stats()
+    print(f"Response cache: {cache.path}")
+    print(f"  Entries:   {stats['entries']} / {cache.max_entries}")
+    print(f"  Size:      {stats['bytes'] / (1024 * 1024):.1f} MB / {cache.max_bytes / (1024 * 1024):.0f} MB")
+    print(f"  Hits:      {stats['hits']}")
+    print(f"  Misses:    {stats['misses']}")
+    print(f"  Hit rate:  {stats['hit_rate']:.0%}")
+    print(f"  Evictions: {stats['evictions']}")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Minute Bot - Automated meeting minutes generation",
@@ -339,6 +502,16 @@ Examples:
         action="store_true",
         help="Use basic mode without UI (no audio level meter)"
     )
+    start_parser.add_argument(
+        "--serve",
+        nargs="?", type=int, const=config.LIVE_PORT, metavar="PORT",
+        help=f"Serve the live view while recording (default port: {config.LIVE_PORT})"
+    )
+    start_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile CPU and memory per pipeline stage (report saved with the session)"
+    )
 
     # Record command (timed chunks)
     record_parser = subparsers.add_parser("record", help="Record with timed chunks (auto-cut every N seconds)")
@@ -355,6 +528,26 @@ Examples:
         choices=["tiny", "base", "small", "medium", "large"],
         help=f"Whisper model to use (default: {config.WHISPER_MODEL})"
     )
+    record_parser.add_argument(
+        "--auto-tune",
+        action="store_true",
+        help="Adapt chunk length and step the model down/up to keep the minutes within --target-lag"
+    )
+    record_parser.add_argument(
+        "--target-lag",
+        type=float,
+        help=f"Seconds from speech to minutes that --auto-tune aims for (default: {config.AUTOTUNE_TARGET_LAG_SECONDS})"
+    )
+    record_parser.add_argument(
+        "--serve",
+        nargs="?", type=int, const=config.LIVE_PORT, metavar="PORT",
+        help=f"Serve the live view while recording (default port: {config.LIVE_PORT})"
+    )
+    record_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile CPU and memory per pipeline stage (report saved with the session)"
+    )
 
     # Test mic command
     subparsers.add_parser("test-mic", help="Test microphone recording")
@@ -367,12 +560,203 @@ Examples:
         default=config.WHISPER_MODEL,
         help=f"Whisper model (default: {config.WHISPER_MODEL})"
     )
+    transcribe_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile CPU and memory per pipeline stage (report saved with the session)"
+    )
+
+    # Import transcript command
+    import_parser = subparsers.add_parser("import-transcript", help="Generate minutes from an existing transcript (no audio)")
+    import_parser.add_argument("source", type=Path, help="Transcript file or folder (e.g. OCPC/2026-02-10/transcript)")
+    import_parser.add_argument("--meeting", help="Meeting name (default: from the file or folder name)")
+    import_parser.add_argument("--format", help="speaker, timestamped, vtt, srt or plain (default: detected per file)")
+    import_parser.add_argument(
+        "--chunk-duration", "-c",
+        type=int,
+        default=config.CHUNK_DURATION_SECONDS,
+        help=f"Meeting seconds per minutes update (default: {config.CHUNK_DURATION_SECONDS})"
+    )
+    import_parser.add_argument("--start", type=datetime.fromisoformat,
+                               help='When the recording started, e.g. "2026-02-10 19:34" (default: from the transcript)')
 
     # Process queue command
-    subparsers.add_parser("process-queue", help="Process queued transcripts from offline sessions")
+    queue_parser = subparsers.add_parser("process-queue", help="Process queued transcripts from offline sessions")
+    queue_parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Submit all queues as one Message Batches job instead of calling the API per session"
+    )
+
+    # Regenerate command
+    regen_parser = subparsers.add_parser("regenerate", help="Rebuild minutes for past sessions from their full transcripts")
+    regen_parser.add_argument("session_ids", nargs="+", help="Session IDs (e.g. 20260210_193400)")
+    regen_parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Submit as one Message Batches job (apply later with batch-status)"
+    )
+
+    # Cache stats command
+    cache_parser = subparsers.add_parser("cache-stats", help="Show response cache size and hit rate")
+    cache_parser.add_argument("--clear", action="store_true", help="Empty the response cache")
+
+    # Stats command
+    stats_parser = subparsers.add_parser("stats", help="Show per-stage pipeline metrics for a session")
+    stats_parser.add_argument("session_id", help="Session ID (e.g. 20260210_193400)")
+
+    # Live view command
+    serve_parser = subparsers.add_parser("serve", help="Serve sessions' live minutes and transcript over HTTP (read-only)")
+    serve_parser.add_argument("--host", default=config.LIVE_HOST, help=f"Address to listen on (default: {config.LIVE_HOST})")
+    serve_parser.add_argument("--port", "-p", type=int, default=config.LIVE_PORT,
+                              help=f"Port to listen on (default: {config.LIVE_PORT})")
+
+    # Minutes history commands
+    history_parser = subparsers.add_parser("history", help="List a session's minutes revisions")
+    history_parser.add_argument("session_id", help="Session ID (e.g. 20260210_193400)")
+    rev_parser = subparsers.add_parser("rev", help="Print the minutes as of one revision")
+    rev_parser.add_argument("session_id", help="Session ID (e.g. 20260210_193400)")
+    rev_parser.add_argument("rev", type=int, help="Revision number (see history)")
+    rev_parser.add_argument("--diff", action="store_true", help="Show the changes from the previous revision instead")
+
+    # Resume command (crash recovery)
+    resume_parser = subparsers.add_parser("resume", help="Repair a crashed session and process only its unfinished chunks")
+    resume_parser.add_argument("session_ids", nargs="+", help="Session ID(s) (e.g. 20260210_193400)")
+    resume_parser.add_argument("--meeting", help="Meeting name, if the session crashed before its minutes were created")
+    resume_parser.add_argument(
+        "--workers",
+        type=int,
+        default=config.RESUME_WORKERS,
+        help=f"Chunks to transcribe in parallel (default: {config.RESUME_WORKERS})"
+    )
+    resume_parser.add_argument(
+        "--model",
+        default=config.WHISPER_MODEL,
+        choices=["tiny", "base", "small", "medium", "large"],
+        help=f"Whisper model (default: {config.WHISPER_MODEL})"
+    )
+
+    # Archive command (compress finished sessions' audio)
+    archive_parser = subparsers.add_parser("archive", help="Compress finished sessions' audio and apply the retention policy")
+    archive_parser.add_argument("session_ids", nargs="*",
+                                help=f"Sessions to archive (default: finished sessions older than {config.ARCHIVE_AFTER_DAYS} days)")
+    archive_parser.add_argument("--format", choices=["flac", "opus"], default=config.ARCHIVE_FORMAT,
+                                help=f"Archive format (default: {config.ARCHIVE_FORMAT})")
+    archive_parser.add_argument("--dry-run", action="store_true", help="Show what would be archived or dropped")
+
+    # Search command (full-text index)
+    search_parser = subparsers.add_parser("search", help="Search transcripts, minutes and org archives")
+    search_parser.add_argument("query", nargs="+", help='Words or an FTS query, e.g. roof budget, "roof budget", vote NEAR roof')
+    search_parser.add_argument("--session", help="Only sessions matching this (e.g. 202602, OCPC)")
+    search_parser.add_argument("--kind", choices=["transcript", "minutes", "archive"], help="Only this kind of document")
+    search_parser.add_argument("--limit", type=int, default=20, help="Maximum hits (default: 20)")
+
+    # Sessions command (catalog queries)
+    sessions_parser = subparsers.add_parser("sessions", help="List sessions from the session catalog")
+    sessions_parser.add_argument("--unfinished", action="store_true",
+                                 help="Only sessions still recording, queued, or with chunks missing from the minutes")
+    sessions_parser.add_argument("--limit", type=int, help="Show at most this many sessions")
+    sessions_parser.add_argument("--rebuild", action="store_true", help="Re-index the catalog from the data folder")
+
+    # Watch command (headless inbox ingestion)
+    watch_parser = subparsers.add_parser("watch", help="Transcribe and write minutes for recordings dropped into an inbox folder")
+    watch_parser.add_argument(
+        "--inbox", "-i",
+        type=Path,
+        default=config.INBOX_DIR,
+        help=f"Folder to watch (default: {config.INBOX_DIR})"
+    )
+    watch_parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=config.WATCH_WORKERS,
+        help=f"Files processed in parallel (default: {config.WATCH_WORKERS})"
+    )
+    watch_parser.add_argument(
+        "--model", "-m",
+        default=config.WHISPER_MODEL,
+        choices=["tiny", "base", "small", "medium", "large"],
+        help=f"Whisper model to use (default: {config.WHISPER_MODEL})"
+    )
+    watch_parser.add_argument("--once", action="store_true", help="Process what is in the inbox, then exit")
+    watch_parser.add_argument("--status", action="store_true", help="List watch jobs and exit")
+
+    # Host command (several meetings in one process)
+    host_parser = subparsers.add_parser("host", help="Run concurrent sessions from per-room folders with shared transcription and API limits")
+    host_parser.add_argument(
+        "--root", "-r",
+        type=Path,
+        default=config.HOST_DIR,
+        help=f"Folder containing one subfolder per room (default: {config.HOST_DIR})"
+    )
+    host_parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=config.HOST_TRANSCRIBE_WORKERS,
+        help=f"Shared transcription workers (default: {config.HOST_TRANSCRIBE_WORKERS})"
+    )
+    host_parser.add_argument(
+        "--model", "-m",
+        default=config.WHISPER_MODEL,
+        choices=["tiny", "base", "small", "medium", "large"],
+        help=f"Whisper model to use (default: {config.WHISPER_MODEL})"
+    )
+
+    # Replay command (headless end-to-end run from a WAV file)
+    replay_parser = subparsers.add_parser("replay", help="Replay a WAV through the full pipeline with stub sox/whisper and the mock API")
+    replay_parser.add_argument("audio_file", type=Path, help="WAV to replay (e.g. a full_session_backup.wav)")
+    replay_parser.add_argument("--mode", choices=["basic", "ui", "record"], default="basic",
+                               help="Recorder to drive (default: basic)")
+    replay_parser.add_argument("--speed", "-s", type=float, default=10.0, help="Playback speed multiple (default: 10)")
+    replay_parser.add_argument("--cut-every", type=float, help="Press SPACE every N source seconds (default: --chunk-duration)")
+    replay_parser.add_argument("--cuts", help="Comma-separated source seconds to press SPACE at")
+    replay_parser.add_argument(
+        "--chunk-duration", "-c",
+        type=int,
+        default=config.CHUNK_DURATION_SECONDS,
+        help=f"Chunk length for record mode (default: {config.CHUNK_DURATION_SECONDS})"
+    )
+    replay_parser.add_argument("--transcript", type=Path, help="Reference transcript the stub whisper replays")
+    replay_parser.add_argument("--whisper-rtf", type=float, default=0.0,
+                               help="Simulated transcription time per audio second (default: 0)")
+    replay_parser.add_argument("--real-whisper", action="store_true", help="Use the real whisper-cli instead of the stub")
+    replay_parser.add_argument(
+        "--model", "-m",
+        default=config.WHISPER_MODEL,
+        choices=["tiny", "base", "small", "medium", "large"],
+        help=f"Whisper model to use (default: {config.WHISPER_MODEL})"
+    )
+    replay_parser.add_argument("--json", type=Path, help="Write the replay report to this JSON file")
+    replay_parser.add_argument("--auto-tune", action="store_true", help="Record mode with --auto-tune")
+
+    # Batch status command
+    batch_parser = subparsers.add_parser("batch-status", help="Poll submitted batches and apply finished results")
+    batch_parser.add_argument(
+        "--wait", "-w",
+        action="store_true",
+        help="Keep polling until all submitted batches are applied"
+    )
 
     args = parser.parse_args()
 
+    if not getattr(args, "profile", False):
+        run_command(parser, args)
+        return
+
+    import profiler
+    profiler.enable()
+    try:
+        run_command(parser, args)
+    finally:
+        profiler.finish()
+
+
+def run_command(parser: argparse.ArgumentParser, args: argparse.Namespace):
+    """Dispatch a parsed command line."""
+    if getattr(args, "serve", None):
+        import live_server
+        live_server.start_background(port=args.serve)
+
     if args.command == "start":
         if args.basic:
             interactive_meeting(args.meeting_name, args.model)
@@ -383,16 +767,104 @@ Examples:
         if not config.ANTHROPIC_API_KEY:
             print("Warning: ANTHROPIC_API_KEY not set. Running in offline mode.")
             print("Minutes will be generated when API key is available.\n")
-        record_meeting(args.meeting_name, args.chunk_duration, args.model)
+        record_meeting(args.meeting_name, args.chunk_duration, args.model,
+                       auto_tune=args.auto_tune, target_lag=args.target_lag)
 
     elif args.command == "test-mic":
+        from recorder import test_microphone
         test_microphone()
 
     elif args.command == "transcribe":
         transcribe_file(args.audio_file, args.model)
 
+    elif args.command == "import-transcript":
+        import transcript_import
+        if not args.source.exists():
+            print(f"Not found: {args.source}")
+            sys.exit(1)
+        try:
+            transcript_import.import_transcript(args.source, args.meeting, args.format, args.chunk_duration, args.start)
+        except ValueError as e:
+            print(e)
+            sys.exit(1)
+
     elif args.command == "process-queue":
-        process_offline_queue()
+        process_offline_queue(args.batch)
+
+    elif args.command == "regenerate":
+        regenerate_sessions(args.session_ids, args.batch)
+
+    elif args.command == "stats":
+        import metrics
+        metrics.print_stats(args.session_id)
+
+    elif args.command == "serve":
+        import live_server
+        try:
+            live_server.serve(args.host, args.port)
+        except OSError as e:
+            print(f"Could not serve on {args.host}:{args.port}: {e}")
+            sys.exit(1)
+
+    elif args.command == "history":
+        import minutes_store
+        minutes_store.print_history(args.session_id)
+
+    elif args.command == "rev":
+        import minutes_store
+        if not minutes_store.print_revision(args.session_id, args.rev, args.diff):
+            sys.exit(1)
+
+    elif args.command == "cache-stats":
+        show_cache_stats(args.clear)
+
+    elif args.command == "resume":
+        import recovery
+        for session_id in args.session_ids:
+            recovery.resume_session(session_id, args.model, args.workers, args.meeting)
+
+    elif args.command == "archive":
+        import archiver
+        archiver.run(args.session_ids, args.format, args.dry_run)
+
+    elif args.command == "search":
+        import search_index
+        search_index.print_search(" ".join(args.query), args.session, args.kind, args.limit)
+
+    elif args.command == "sessions":
+        import catalog
+        if args.rebuild:
+            cat = catalog.get()
+            if cat.enabled:
+                print(f"Indexed {cat.rebuild()} session(s) into {cat.path}")
+        catalog.print_sessions(args.unfinished, args.limit)
+
+    elif args.command == "watch":
+        import watcher
+        if args.status:
+            watcher.print_jobs()
+        else:
+            watcher.InboxWatcher(args.inbox, args.workers, args.model).run(once=args.once)
+
+    elif args.command == "host":
+        import host
+        host.SessionHost(args.root, args.workers, args.model).run()
+
+    elif args.command == "replay":
+        import replay
+        cuts = [float(t) for t in args.cuts.split(",")] if args.cuts else None
+        replay.run(
+            args.audio_file, mode=args.mode, speed=args.speed, cut_every=args.cut_every,
+            cuts=cuts, chunk_duration=args.chunk_duration, transcript=args.transcript,
+            whisper_rtf=args.whisper_rtf, real_whisper=args.real_whisper, model=args.model,
+            json_path=args.json, auto_tune=args.auto_tune,
+        )
+
+    elif args.command == "batch-status":
+        import batch_processor
+        pending = batch_processor.poll(wait=args.wait)
+        if pending:
+            print(f"{pending} batch(es) still processing.")
 
     else:
         parser.print_help()
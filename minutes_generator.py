@@ -8,18 +8,24 @@ FAIL-SAFE DESIGN:
 """
 
 import os
+import re
 import subprocess
+import threading
+import time
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional
 
-try:
-    import anthropic
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
-
+import catalog
 import config
+import metrics
+import minutes_store
+import profiler
+from agenda_aligner import AgendaAligner
+from extractor import DRAFT_NOTE, MinutesExtractor
+from normalizer import normalize
+from response_cache import get_cache
+from sample_index import select_samples, truncate_sample
 
 
 def read_file_content(file_path: Path) -> str:
@@ -47,6 +53,9 @@ def load_agenda() -> tuple[str, bool]:
     Load agenda from agendas folder.
     Returns (agenda_text, has_multiple_warning).
     """
+    if not config.AGENDAS_DIR.exists():
+        return "", False
+
     agenda_files = [f for f in config.AGENDAS_DIR.iterdir()
                     if f.is_file() and not f.name.startswith('.')]
 
@@ -62,36 +71,128 @@ def load_agenda() -> tuple[str, bool]:
     return agenda_content, has_multiple
 
 
-def load_sample_minutes() -> str:
-    """Load all sample minutes from samples folder."""
-    sample_files = [f for f in config.SAMPLES_DIR.iterdir()
-                    if f.is_file() and not f.name.startswith('.')]
-
-    if not sample_files:
+def load_sample_minutes(query: str = "") -> str:
+    """
+    Load the sample minutes most relevant to the query from samples folder.
+    Selection is capped by config.SAMPLE_TOP_K and config.SAMPLE_MAX_CHARS.
+    """
+    try:
+        sample_files = select_samples(query, reader=read_file_content)
+    except Exception as e:
+        print(f"  [Warning] Could not index sample minutes: {e}")
         return ""
 
     samples = []
-    for f in sorted(sample_files, key=lambda x: x.stat().st_mtime, reverse=True):
-        content = read_file_content(f)
+    budget = config.SAMPLE_MAX_CHARS
+    for f in sample_files:
+        content = truncate_sample(read_file_content(f), budget)
         if content:
             samples.append(f"=== Sample: {f.name} ===\n{content}")
+            budget -= len(content)
 
     return "\n\n".join(samples)
 
 # API timeout in seconds - don't wait forever
 API_TIMEOUT = 30
 
+MINUTES_MODEL = "claude-sonnet-4-20250514"
+MINUTES_MAX_TOKENS = 4096
+
+
+def create_client():
+    """Create the API client, or None if unavailable. Never raises."""
+    if config.MOCK_API:
+        from mock_anthropic import MockAnthropic
+        return MockAnthropic(latency=config.MOCK_API_LATENCY)
+    if not config.ANTHROPIC_API_KEY:
+        return None
+    # Imported here: the SDK is slow to load and offline commands never need it
+    try:
+        import anthropic
+    except ImportError:
+        return None
+    try:
+        return anthropic.Anthropic(
+            api_key=config.ANTHROPIC_API_KEY,
+            timeout=API_TIMEOUT
+        )
+    except Exception as e:
+        print(f"  [Warning] Could not initialize API client: {e}")
+    return None
+
+
+def find_session_minutes(session_id: str) -> tuple[Optional[Path], str]:
+    """Find an existing session's minutes file and meeting name."""
+    record = catalog.get().session(session_id)
+    if record and record["minutes_file"]:
+        return Path(record["minutes_file"]), record["meeting_name"] or "Meeting"
+
+    minutes_files = sorted(config.MINUTES_DIR.glob(f"{session_id}_*.md"))
+    if not minutes_files:
+        return None, "Meeting"
+    stem = minutes_files[0].stem
+    meeting_name = stem[len(session_id) + 1:] or "Meeting"
+    return minutes_files[0], meeting_name
+
+
+_HEADER_FIELD = re.compile(r"^\*\*(Date|Started|Ended):\*\* (.+)$", re.M)
+
+
+def session_times(session_id: str, minutes_text: str = "") -> tuple[datetime, Optional[datetime]]:
+    """
+    When a past session started and ended: from its minutes header if it has
+    one, else the catalog, else the session id (end unknown).
+    """
+    record = catalog.get().session(session_id) or {}
+    try:
+        start = datetime.strptime(session_id[:15], "%Y%m%d_%H%M%S")
+    except ValueError:
+        start = datetime.now()
+    if record.get("started"):
+        start = datetime.fromisoformat(record["started"])
+    end = datetime.fromisoformat(record["ended"]) if record.get("ended") else None
+
+    header = dict(_HEADER_FIELD.findall(minutes_text))
+    try:
+        clock = datetime.strptime(header["Started"].strip(), "%I:%M %p")
+        day = datetime.strptime(header["Date"].strip(), "%Y-%m-%d")
+        start = day.replace(hour=clock.hour, minute=clock.minute)
+    except (KeyError, ValueError):
+        pass
+    try:
+        clock = datetime.strptime(header["Ended"].strip(), "%I:%M %p")
+        end = start.replace(hour=clock.hour, minute=clock.minute, second=0)
+        if end < start:
+            end += timedelta(days=1)  # Ran past midnight
+    except (KeyError, ValueError):
+        pass
+    return start, end
+
+
+def open_session(session_id: str) -> "MinutesGenerator":
+    """Create a generator for an existing session, picking up its current minutes and times."""
+    minutes_file, meeting_name = find_session_minutes(session_id)
+    minutes_text = minutes_file.read_text() if minutes_file and minutes_file.exists() else ""
+    start, end = session_times(session_id, minutes_text)
+    gen = MinutesGenerator(meeting_name, session_id=session_id, session_start=start)
+    gen.session_end = end
+    if minutes_text:
+        gen.minutes_file = minutes_file
+        gen.current_minutes = minutes_text
+    return gen
+
 
 class MinutesGenerator:
     """Generates and updates meeting minutes using Claude."""
 
-    def __init__(self, meeting_name: str, session_id: Optional[str] = None, template: Optional[str] = None):
+    def __init__(self, meeting_name: str, session_id: Optional[str] = None, template: Optional[str] = None,
+                 session_start: Optional[datetime] = None):
         self.meeting_name = meeting_name
         self.template = template or config.DEFAULT_TEMPLATE
         self.session_id = session_id or datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.session_start = datetime.now()
+        self._session_start = session_start or datetime.now()
         self.session_end: Optional[datetime] = None
-        self.minutes_file = config.MINUTES_DIR / f"{self.session_id}_{meeting_name}.md"
+        self.minutes_file = config.ensure_dir(config.MINUTES_DIR) / f"{self.session_id}_{meeting_name}.md"
 
         # Nest raw transcripts by session_id like audio
         self.transcript_dir = config.TRANSCRIPTS_DIR / self.session_id
@@ -99,11 +200,20 @@ class MinutesGenerator:
         self.raw_transcript_file = self.transcript_dir / "raw_backup.txt"
 
         self.current_minutes = ""
+        self._template_minutes = ""
         self.offline_queue = []  # Queue transcripts when offline
+        self._processing = []  # Queue items included in the current batch update
+        self._transcript_tail = []  # Last normalized segments, to drop overlap at the next chunk boundary
+        self._save_lock = threading.RLock()
+        self._closed = False  # Finalized: late updates from abandoned workers are not saved
+        self._api_call = threading.local()  # Per thread: seconds the last update waited on the API
+
+        # Local pattern-based extraction for draft minutes while offline
+        self.extractor = MinutesExtractor()
 
         # Load agenda and samples for context
         self.agenda, has_multiple_agendas = load_agenda()
-        self.sample_minutes = load_sample_minutes()
+        self.sample_minutes = load_sample_minutes(f"{meeting_name}\n{self.agenda}")
 
         if has_multiple_agendas:
             print(f"  [Warning] Multiple agendas found in agendas/ folder. Using most recent.")
@@ -112,41 +222,90 @@ class MinutesGenerator:
         if self.sample_minutes:
             print(f"  [Info] Loaded sample minutes for style reference")
 
-        # Try to create client, but don't fail if we can't
-        self.client = None
-        if ANTHROPIC_AVAILABLE and config.ANTHROPIC_API_KEY:
-            try:
-                self.client = anthropic.Anthropic(
-                    api_key=config.ANTHROPIC_API_KEY,
-                    timeout=API_TIMEOUT
-                )
-            except Exception as e:
-                print(f"  [Warning] Could not initialize API client: {e}")
-
-    def _init_minutes(self):
-        """Initialize minutes from template."""
-        self.current_minutes = self.template.format(
+        # Route transcript lines to agenda sections locally
+        self.aligner = AgendaAligner(self.agenda) if self.agenda else None
+        if self.aligner and not self.aligner.enabled:
+            self.aligner = None
+
+        # The API client is created on first use (see the client property)
+        self._client = None
+        self._client_created = False
+        self.cache = get_cache()
+        self.metrics = metrics.for_session(self.session_id)
+        self.catalog = catalog.get()
+        self.catalog.add_session(self.session_id, meeting_name, self._session_start, self.minutes_file)
+        if session_start:
+            self.catalog.set_started(self.session_id, session_start)  # Replaces a start guessed earlier
+
+    @property
+    def session_start(self) -> datetime:
+        return self._session_start
+
+    @session_start.setter
+    def session_start(self, value: datetime):
+        """Set once the real meeting start is known; the catalog follows."""
+        self._session_start = value
+        self.catalog.set_started(self.session_id, value)
+
+    @property
+    def client(self):
+        """API client, created on first use so offline paths never load the SDK."""
+        if not self._client_created:
+            # Try to create client, but don't fail if we can't
+            self._client = create_client()
+            self._client_created = True
+        return self._client
+
+    @client.setter
+    def client(self, value):
+        self._client = value
+        self._client_created = True
+
+    @property
+    def last_api_seconds(self) -> Optional[float]:
+        """Time the calling thread's last update_minutes spent in the API call (None if it made none)."""
+        return getattr(self._api_call, "seconds", None)
+
+    def template_minutes(self) -> str:
+        """The empty minutes template filled in for this session."""
+        return self.template.format(
             date=self.session_start.strftime("%Y-%m-%d"),
             meeting_name=self.meeting_name,
             start_time=self.session_start.strftime("%-I:%M %p"),
             end_time="(in progress)"
         )
-        self._save()
-
-    def finalize(self):
-        """Mark the session as ended and update the end time in minutes."""
-        self.session_end = datetime.now()
-        if self.current_minutes:
-            self.current_minutes = self.current_minutes.replace(
-                "**Ended:** (in progress)",
-                f"**Ended:** {self.session_end.strftime('%-I:%M %p')}"
-            )
-            self._save()
 
-    def _save(self):
-        """Save current minutes to file."""
-        with open(self.minutes_file, "w") as f:
-            f.write(self.current_minutes)
+    def _init_minutes(self):
+        """Initialize minutes from template."""
+        self.current_minutes = self.template_minutes()
+        self._template_minutes = self.current_minutes
+        self._save(reason="template")
+
+    def finalize(self, ended: Optional[datetime] = None):
+        """
+        Mark the session as ended and update the end time in minutes.
+        Minutes are not saved again afterwards, so an update still running
+        on an abandoned worker can't overwrite the end time.
+        """
+        with self._save_lock:
+            self.session_end = ended or datetime.now()
+            if self.current_minutes:
+                self.current_minutes = self.current_minutes.replace(
+                    "**Ended:** (in progress)",
+                    f"**Ended:** {self.session_end.strftime('%-I:%M %p')}"
+                )
+                self._save(reason="finalize")
+            self._closed = True
+        self.catalog.end_session(self.session_id, self.session_end)
+
+    def _save(self, chunks: Optional[list[int]] = None, reason: str = "update"):
+        """Save current minutes to file (atomically) and record the revision."""
+        import search_index
+        with self._save_lock:
+            if self._closed:
+                return
+            minutes_store.save(self.minutes_file, self.current_minutes, self.session_id, chunks, reason)
+        search_index.index_file(self.minutes_file)
 
     def _save_raw_transcript(self, text: str, chunk_number: int):
         """
@@ -162,52 +321,129 @@ class MinutesGenerator:
             # Even if this fails, don't crash - just warn
             print(f"  [Warning] Could not save raw transcript: {e}")
 
-    def _queue_transcript(self, text: str, chunk_number: int, reason: str = "offline"):
-        """Queue a transcript for later processing."""
+    def _apply_offline_draft(self):
+        """
+        Fill the minutes with locally extracted content while offline.
+        Only touches minutes that no API pass has written yet.
+        """
+        if not (self.current_minutes == self._template_minutes
+                or DRAFT_NOTE in self.current_minutes):
+            return
+        try:
+            section_times = None
+            if self.aligner:
+                section_times = [(item.label, start) for item, start in self.aligner.section_times()]
+            self.current_minutes = self.extractor.render(self.current_minutes, section_times)
+            self._save(reason="draft")
+            print(f"  Offline draft updated: {self.minutes_file}")
+        except Exception as e:
+            print(f"  [Warning] Could not build offline draft: {e}")
+
+    def _normalize(self, text: str, chunk_number: int) -> str:
+        """The transcript as sent to the prompt (see normalizer.py). Never raises."""
+        if not config.NORMALIZE_TRANSCRIPTS:
+            return text
+        try:
+            # Batches carry their own chunk boundaries; only live chunks continue the tail
+            result = normalize(text, self._transcript_tail if chunk_number >= 0 else None)
+        except Exception as e:
+            print(f"  [Warning] Could not normalize transcript: {e}")
+            return text
+        if chunk_number >= 0:
+            self._transcript_tail = result.tail
+        self.metrics.count(metrics.NORMALIZE, "tokens_saved", result.tokens_saved, chunk=chunk_number,
+                           chars_before=result.chars_before, chars_after=result.chars_after,
+                           segments_dropped=result.segments_dropped)
+        if result.tokens_saved:
+            print(f"  Normalized: ~{result.tokens_saved} tokens saved "
+                  f"({result.chars_before} -> {result.chars_after} chars, {result.segments_dropped} segment(s) dropped)")
+        return result.text
+
+    def _queue_transcript(self, text: str, chunk_number: int, reason: str = "offline",
+                          section: Optional[int] = None):
+        """Queue a transcript for later processing (section: agenda item it started in)."""
         self.offline_queue.append({
             "chunk": chunk_number,
             "text": text,
             "timestamp": datetime.now().isoformat(),
-            "reason": reason
+            "reason": reason,
+            "section": section,
         })
+        self.metrics.gauge(metrics.QUEUE, "depth", len(self.offline_queue), chunk=chunk_number, reason=reason)
         print(f"  [Queued] {reason} (queue size: {len(self.offline_queue)})")
 
-    def update_minutes(self, new_transcript: str, chunk_number: int) -> bool:
+    def _route_transcript(self, text: str, chunk_number: int = -1) -> Optional[tuple[str, list]]:
         """
-        Update minutes with new transcript content.
-        Returns True if successful, False if queued for later (offline).
-
-        FAIL-SAFE: This method will NEVER raise an exception.
-        All errors result in queuing for later processing.
+        Group raw transcript lines under the agenda sections they belong to,
+        normalizing each section's lines for the prompt.
+        Returns (routed_text, active_agenda_items), or None without an agenda.
         """
-        # ALWAYS save raw transcript first - this is our backup
-        self._save_raw_transcript(new_transcript, chunk_number)
-
-        if not self.current_minutes:
-            try:
-                self._init_minutes()
-            except Exception as e:
-                print(f"  [Warning] Could not init minutes template: {e}")
-
-        if not self.client:
-            self._queue_transcript(new_transcript, chunk_number, "no API client")
-            return False
-
+        if not self.aligner:
+            return None
         try:
-            # Build context sections
-            context_parts = []
+            groups = self.aligner.align(text)
+        except Exception as e:
+            print(f"  [Warning] Could not align transcript to agenda: {e}")
+            return None
+
+        if not groups:
+            return None
+
+        blocks = []
+        active = []
+        tail = self._transcript_tail if chunk_number >= 0 else None
+        for index, lines in groups:
+            block = "\n".join(lines)
+            if config.NORMALIZE_TRANSCRIPTS:
+                try:
+                    result = normalize(block, tail)
+                    block, tail = result.text, result.tail
+                except Exception as e:
+                    print(f"  [Warning] Could not normalize transcript: {e}")
+            if not block:
+                continue
+            item = self.aligner.items[index]
+            if item not in active:
+                active.append(item)
+            blocks.append(f"(Agenda section: {item.label})\n" + block)
+        if not blocks:
+            return None
+        return "\n\n".join(blocks), active
+
+    def build_prompt(self, new_transcript: str, chunk_number: int,
+                     routed: Optional[tuple[str, list]] = None) -> str:
+        """Build the minutes update prompt for a transcript segment."""
+        # Build context sections
+        context_parts = []
 
-            if self.sample_minutes:
-                context_parts.append(f"""STYLE REFERENCE (match this format and tone):
+        if self.sample_minutes:
+            context_parts.append(f"""STYLE REFERENCE (match this format and tone):
 {self.sample_minutes}""")
 
+        if routed is None:
+            routed = self._route_transcript(new_transcript, chunk_number)
+
+        if routed:
+            transcript_section, active_items = routed
+            context_parts.append(f"""MEETING AGENDA OUTLINE (use this to organize topics):
+{self.aligner.outline()}""")
+            context_parts.append("""AGENDA DETAIL FOR SECTIONS IN THIS SEGMENT:
+""" + "\n\n".join(item.text for item in active_items))
+            section_times = "\n".join(
+                f"- {item.label}: {start}" for item, start in self.aligner.section_times()
+            )
+            if section_times:
+                context_parts.append(f"""SECTION START TIMES (computed from the transcript - use these exactly):
+{section_times}""")
+        else:
+            transcript_section = new_transcript
             if self.agenda:
                 context_parts.append(f"""MEETING AGENDA (use this to organize topics):
 {self.agenda}""")
 
-            context_section = "\n\n".join(context_parts)
+        context_section = "\n\n".join(context_parts)
 
-            prompt = f"""You are a meeting minutes assistant. Update the existing meeting minutes with new information from the latest transcript segment.
+        return f"""You are a meeting minutes assistant. Update the existing meeting minutes with new information from the latest transcript segment.
 
 {context_section}
 
@@ -215,7 +451,7 @@ CURRENT MINUTES:
 {self.current_minutes}
 
 NEW TRANSCRIPT SEGMENT (Chunk {chunk_number}):
-{new_transcript}
+{transcript_section}
 
 INSTRUCTIONS:
 1. Incorporate any new discussion points, decisions, or action items from the transcript
@@ -227,21 +463,118 @@ INSTRUCTIONS:
 7. If the transcript is unclear or contains small talk, you can skip it
 8. IMPORTANT: Extract timestamps from the transcript (format: [HH:MM AM/PM]) and include them:
    - Add the time the Opening/Prayer started
-   - Add the time each major agenda section started (when the topic was first mentioned)
+   - Add the time each major agenda section started (use SECTION START TIMES when given, otherwise when the topic was first mentioned)
    - Add the time the Closing/Adjournment occurred
    - Format: Include time in parentheses after section headers, e.g., "## 2. Opening (7:32 PM)"
-9. Return the complete updated minutes document
+9. If the minutes contain an "Offline draft" note, remove the note and rewrite the auto-extracted bullets as proper minutes
+10. Return the complete updated minutes document
 
 Return ONLY the updated minutes markdown, no explanations."""
 
-            response = self.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=4096,
-                messages=[{"role": "user", "content": prompt}]
-            )
+    def request_params(self, prompt: str) -> dict:
+        """Messages API parameters for a minutes update prompt."""
+        return {
+            "model": MINUTES_MODEL,
+            "max_tokens": MINUTES_MAX_TOKENS,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+
+    def apply_response(self, minutes_text: str, chunks: Optional[list[int]] = None):
+        """Adopt the model's updated minutes (covering the given chunks) and save them."""
+        with self._save_lock:
+            if self._closed:
+                print("  (Minutes already finalized; update not applied)")
+                return
+            self.current_minutes = minutes_text
+            if self.aligner:
+                self.current_minutes = self.aligner.apply_section_times(self.current_minutes)
+            self._save(chunks)
+        self.catalog.minutes_updated(self.session_id, chunks or [], len(self.current_minutes))
+
+    def _cache_response(self, params: dict, minutes_text: str):
+        """Store a response in the cache. Cache failures never affect minutes."""
+        if not self.cache:
+            return
+        try:
+            self.cache.put(params, minutes_text)
+        except Exception as e:
+            print(f"  [Warning] Could not cache response: {e}")
 
-            self.current_minutes = response.content[0].text
-            self._save()
+    def update_minutes(self, new_transcript: str, chunk_number: int) -> bool:
+        """
+        Update minutes with new transcript content.
+        Returns True if successful, False if queued for later (offline).
+
+        FAIL-SAFE: This method will NEVER raise an exception.
+        All errors result in queuing for later processing.
+        """
+        self._api_call.seconds = None
+
+        # ALWAYS save raw transcript first - this is our backup
+        # (batch and regenerate updates, -1, replay text that is already saved)
+        if chunk_number >= 0:
+            self._save_raw_transcript(new_transcript, chunk_number)
+
+        if not self.current_minutes:
+            try:
+                self._init_minutes()
+            except Exception as e:
+                print(f"  [Warning] Could not init minutes template: {e}")
+
+        # Align and extract before the API check so local results are recorded even offline.
+        # Both read the raw segments: normalizing merges a minute's segments into one
+        # line, which would hide a bare "Second." from the extractor.
+        section = self.aligner.current if self.aligner else None
+        routed = self._route_transcript(new_transcript, chunk_number)
+        try:
+            self.extractor.feed(new_transcript)
+        except Exception as e:
+            print(f"  [Warning] Could not extract from transcript: {e}")
+
+        # The prompt gets the normalized text; the queue keeps the raw text
+        prompt_transcript = self._normalize(new_transcript, chunk_number)
+        if not prompt_transcript:
+            print("  (Nothing left to add after normalization)")
+            self.catalog.minutes_updated(self.session_id, self._covered_chunks(chunk_number),
+                                         len(self.current_minutes))
+            return True
+
+        # Identical requests (replays, re-runs) are answered from the cache, even offline
+        params = None
+        try:
+            with profiler.stage("minutes.prompt"):
+                params = self.request_params(self.build_prompt(prompt_transcript, chunk_number, routed))
+            cached = self.cache.get(params) if self.cache else None
+            if cached is not None:
+                self.metrics.count(metrics.MINUTES, "cache_hits", chunk=chunk_number)
+                self.apply_response(cached, self._covered_chunks(chunk_number))
+                print(f"  Minutes updated (cached): {self.minutes_file}")
+                return True
+        except Exception as e:
+            print(f"  [Warning] Response cache lookup failed: {e}")
+
+        if not self.client:
+            self._queue_transcript(new_transcript, chunk_number, "no API client", section)
+            self._apply_offline_draft()
+            return False
+
+        try:
+            if params is None:
+                params = self.request_params(self.build_prompt(prompt_transcript, chunk_number, routed))
+            started = time.perf_counter()
+            with profiler.stage("minutes.api"):
+                response = self.client.messages.create(**params)
+            self._api_call.seconds = time.perf_counter() - started
+            usage = getattr(response, "usage", None)
+            self.metrics.timing(
+                metrics.MINUTES, self._api_call.seconds, chunk=chunk_number,
+                input_tokens=getattr(usage, "input_tokens", None),
+                output_tokens=getattr(usage, "output_tokens", None),
+                prompt_chars=len(params["messages"][0]["content"]),
+            )
+            minutes_text = response.content[0].text
+            self._cache_response(params, minutes_text)
+            self.apply_response(minutes_text, self._covered_chunks(chunk_number))
             print(f"  Minutes updated: {self.minutes_file}")
             return True
 
@@ -257,27 +590,53 @@ Return ONLY the updated minutes markdown, no explanations."""
             else:
                 reason = f"{error_name}: {str(e)[:50]}"
 
-            self._queue_transcript(new_transcript, chunk_number, reason)
+            self._queue_transcript(new_transcript, chunk_number, reason, section)
+            self._apply_offline_draft()
             return False
 
+    def combine_queue(self, queue: list) -> str:
+        """
+        Queued transcripts as one batch update (chunk -1). Aligning the chunks as
+        they were queued moved the aligner past them, so routing restarts from
+        the section the first one started in.
+        """
+        section = queue[0].get("section") if queue else None
+        if self.aligner and section is not None:
+            self.aligner.current = section
+        return "\n\n".join(f"[Chunk {item.get('chunk', '?')}]\n{item.get('text', '')}" for item in queue)
+
+    def batch_prompt(self, transcript: str) -> str:
+        """
+        The prompt update_minutes(transcript, -1) would send, routed and
+        normalized the same way so both paths share response cache keys.
+        Empty when normalization leaves nothing to add.
+        """
+        routed = self._route_transcript(transcript)
+        prompt_transcript = self._normalize(transcript, -1)
+        return self.build_prompt(prompt_transcript, -1, routed) if prompt_transcript else ""
+
+    def _covered_chunks(self, chunk_number: int) -> list[int]:
+        """Chunks an update covers: the chunk itself, or the queued chunks for a batch update (-1)."""
+        if chunk_number >= 0:
+            return [chunk_number]
+        return [item["chunk"] for item in self._processing]
+
     def process_queue(self) -> int:
         """Process queued transcripts when back online. Returns count processed."""
         if not self.client or not self.offline_queue:
             return 0
 
-        # Combine all queued transcripts
-        combined = "\n\n".join(
-            f"[Chunk {item['chunk']}]\n{item['text']}"
-            for item in self.offline_queue
-        )
-
+        combined = self.combine_queue(self.offline_queue)
         queue_size = len(self.offline_queue)
-        self.offline_queue = []
+        self._processing, self.offline_queue = self.offline_queue, []
 
-        if self.update_minutes(combined, -1):  # -1 indicates batch update
-            print(f"  Processed {queue_size} queued transcripts")
-            return queue_size
-        return 0
+        try:
+            if self.update_minutes(combined, -1):  # -1 indicates batch update
+                print(f"  Processed {queue_size} queued transcripts")
+                return queue_size
+            return 0
+        finally:
+            self._processing = []
 
     def get_minutes(self) -> str:
         """Get the current minutes content."""
@@ -296,8 +655,15 @@ class OfflineMinutesStore:
     def save_queue(self, queue: list):
         """Persist queue to disk."""
         import json
-        with open(self.store_file, "w") as f:
-            json.dump(queue, f)
+        config.ensure_dir(self.store_file.parent)
+        minutes_store.atomic_write(self.store_file, json.dumps(queue))
+        catalog.get().sync_queue(self.session_id, queue)
+
+    def clear(self):
+        """Remove the queue once everything in it is in the minutes."""
+        if self.store_file.exists():
+            self.store_file.unlink()
+        catalog.get().sync_queue(self.session_id, [])
 
     def load_queue(self) -> list:
         """Load queue from disk."""
@@ -0,0 +1,217 @@
+"""Crash-safe minutes saves with a per-session revision history.
+
+Every save writes the minutes to a temporary file beside the real one,
+fsyncs it and renames it over the original, so a crash or power cut leaves
+either the old minutes or the new ones, never a truncated file.
+
+Each saved version is also appended to
+data/transcripts/{session}/minutes_history.jsonl, one revision per line:
+
+    {"rev": 7, "t": 1739234040.1, "chunks": [6], "reason": "update", "chars": 5120, "sha": "3f2a...", "delta": [[12, 14, ["new line", ...]], ...]}
+
+A delta lists the line ranges of the previous revision that were replaced
+(start, end, new lines), so a typical update costs a few hundred bytes
+instead of the whole document. Every MINUTES_SNAPSHOT_EVERY revisions (or
+when the delta would be larger than the text) a full "text" is stored
+instead, so rebuilding any revision applies at most that many deltas.
+`history <session>` lists the revisions and `rev <session> N` prints one.
+"""
+
+import difflib
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import config
+import live_feed
+
+HISTORY_NAME = "minutes_history.jsonl"
+
+
+def atomic_write(path: Path, text: str):
+    """
+    Replace path with text in one rename (write to a temp file, fsync, rename).
+    The temp name is per process and thread, so concurrent saves of the same
+    file never write into each other's temp file.
+    """
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _sha(text: str) -> str:
+    return hashlib.sha1(text.encode()).hexdigest()[:12]
+
+
+def make_delta(old: list[str], new: list[str]) -> list:
+    """[start, end, replacement lines] for each changed range of old."""
+    matcher = difflib.SequenceMatcher(None, old, new, autojunk=False)
+    return [[i1, i2, new[j1:j2]] for op, i1, i2, j1, j2 in matcher.get_opcodes() if op != "equal"]
+
+
+def apply_delta(old: list[str], delta: list) -> list[str]:
+    out, pos = [], 0
+    for start, end, lines in delta:
+        out += old[pos:start] + lines
+        pos = end
+    return out + old[pos:]
+
+
+class MinutesHistory:
+    """Append-only revision log of one session's minutes."""
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.path = config.TRANSCRIPTS_DIR / session_id / HISTORY_NAME
+        self._lock = threading.Lock()
+        self._last: Optional[tuple[int, list[str], int]] = None  # (rev, lines, revisions since snapshot)
+
+    def _records(self) -> list[dict]:
+        if not self.path.exists():
+            return []
+        records = []
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue  # Torn last line after a crash
+        return records
+
+    def _tip(self) -> tuple[int, list[str], int]:
+        """Latest revision, lines and deltas since its snapshot (read from disk once)."""
+        if self._last is None:
+            records = self._records()
+            if not records:
+                self._last = (0, [], 0)
+            else:
+                since = next((i for i, r in enumerate(reversed(records)) if "text" in r), len(records))
+                self._last = (records[-1]["rev"], self._rebuild(records, records[-1]["rev"]), since)
+        return self._last
+
+    def record(self, text: str, chunks: Optional[list[int]] = None, reason: str = "update") -> Optional[int]:
+        """Append a revision if text changed. Returns its number, or None if unchanged."""
+        with self._lock:
+            rev, old, since = self._tip()
+            new = text.splitlines()
+            if rev and new == old:
+                return None
+            entry = {"rev": rev + 1, "t": round(time.time(), 3), "chunks": chunks or [], "reason": reason,
+                     "chars": len(text), "sha": _sha("\n".join(new))}
+            delta = make_delta(old, new) if rev else None
+            if delta is None or since + 1 >= config.MINUTES_SNAPSHOT_EVERY \
+                    or len(json.dumps(delta)) > len(text):
+                entry["text"] = "\n".join(new)
+                since = 0
+            else:
+                entry["delta"] = delta
+                since += 1
+
+            config.ensure_dir(self.path.parent)
+            with open(self.path, "a+") as f:
+                # Start on a fresh line if a crash left a partial one
+                if f.tell() and not self._ends_with_newline():
+                    f.write("\n")
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._last = (rev + 1, new, since)
+            return rev + 1
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def revisions(self) -> list[dict]:
+        """Every revision's metadata (no text)."""
+        return [{k: v for k, v in r.items() if k not in ("text", "delta")} | {"snapshot": "text" in r}
+                for r in self._records()]
+
+    def text(self, rev: int) -> Optional[str]:
+        """The minutes as of a revision, or None if there is no such revision."""
+        records = self._records()
+        if not any(r["rev"] == rev for r in records):
+            return None
+        return "\n".join(self._rebuild(records, rev))
+
+    @staticmethod
+    def _rebuild(records: list[dict], rev: int) -> list[str]:
+        """Lines of a revision: its latest snapshot, then the deltas after it."""
+        upto = [r for r in records if r["rev"] <= rev]
+        start = max(i for i, r in enumerate(upto) if "text" in r)
+        lines = upto[start]["text"].splitlines()
+        for r in upto[start + 1:]:
+            lines = apply_delta(lines, r["delta"])
+        if _sha("\n".join(lines)) != upto[-1]["sha"]:
+            raise ValueError(f"minutes history is inconsistent at revision {rev}")
+        return lines
+
+
+_histories: dict[str, MinutesHistory] = {}
+_histories_lock = threading.Lock()
+
+
+def history(session_id: str) -> MinutesHistory:
+    """The process-wide history for a session."""
+    with _histories_lock:
+        if session_id not in _histories:
+            _histories[session_id] = MinutesHistory(session_id)
+        return _histories[session_id]
+
+
+def save(path: Path, text: str, session_id: str, chunks: Optional[list[int]] = None, reason: str = "update"):
+    """Write minutes atomically and record the revision (history failures only warn)."""
+    atomic_write(path, text)
+    live_feed.publish(session_id)
+    if not config.MINUTES_HISTORY_ENABLED:
+        return
+    try:
+        history(session_id).record(text, chunks, reason)
+    except Exception as e:
+        print(f"  [Warning] Could not record minutes history: {e}")
+
+
+def print_history(session_id: str):
+    revisions = history(session_id).revisions()
+    if not revisions:
+        print(f"No minutes history for session {session_id}.")
+        return
+    print(f"{'rev':>4}  {'time':<19}  {'reason':<9} {'chunks':<14} {'chars':>7}")
+    for r in revisions:
+        when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(r["t"]))
+        chunks = ",".join(str(c) for c in r["chunks"]) or "-"
+        print(f"{r['rev']:>4}  {when:<19}  {r['reason']:<9} {chunks[:14]:<14} {r['chars']:>7}"
+              f"{'  (snapshot)' if r['snapshot'] else ''}")
+    size = history(session_id).path.stat().st_size
+    print(f"\n{len(revisions)} revision(s), {size / 1024:.1f} KB of history")
+
+
+def print_revision(session_id: str, rev: int, diff: bool = False) -> bool:
+    """Print a revision (or its diff against the previous one). Returns False if it doesn't exist."""
+    store = history(session_id)
+    try:
+        text = store.text(rev)
+        previous = (store.text(rev - 1) or "") if diff and text is not None else ""
+    except ValueError as e:
+        print(f"Could not rebuild revision {rev} of session {session_id}: {e}")
+        return False
+    if text is None:
+        print(f"Session {session_id} has no minutes revision {rev}.")
+        return False
+    if not diff:
+        print(text)
+        return True
+    print("\n".join(difflib.unified_diff(previous.splitlines(), text.splitlines(),
+                                         f"rev {rev - 1}", f"rev {rev}", lineterm="")))
+    return True
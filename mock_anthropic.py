@@ -0,0 +1,133 @@
+"""Local stand-in for the Anthropic client.
+
+Implements the parts of the client the bot uses - messages.create and the
+Message Batches endpoints - without network access. Batches are stored as
+JSON under data/mock_api/ so they can be submitted by one process and polled
+by another, like the real service.
+
+Enable with MINUTE_BOT_MOCK_API=1, or construct MockAnthropic directly.
+"""
+
+import json
+import re
+import time
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Iterator, Optional
+
+import config
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token for English)."""
+    return max(1, len(text) // 4)
+
+
+def default_responder(params: dict) -> str:
+    """Return the prompt's current minutes with a note of what was incorporated."""
+    prompt = params["messages"][-1]["content"]
+    match = re.search(r"CURRENT MINUTES:\n(.*?)\n\nNEW TRANSCRIPT SEGMENT[^\n]*\n(.*?)\n\nINSTRUCTIONS:",
+                      prompt, re.S)
+    if not match:
+        return "# Meeting Minutes\n\n(mock response)\n"
+    minutes, transcript = match.group(1).rstrip(), match.group(2)
+    lines = [line for line in transcript.splitlines() if line.strip()]
+    return f"{minutes}\n- (mock) Incorporated {len(lines)} transcript line(s)\n"
+
+
+def _message(text: str, params: dict) -> SimpleNamespace:
+    prompt = "".join(m["content"] for m in params.get("messages", []))
+    return SimpleNamespace(
+        id=f"msg_mock_{uuid.uuid4().hex[:12]}",
+        model=params.get("model"),
+        content=[SimpleNamespace(type="text", text=text)],
+        usage=SimpleNamespace(input_tokens=estimate_tokens(prompt),
+                              output_tokens=estimate_tokens(text)),
+        stop_reason="end_turn",
+    )
+
+
+class _Batches:
+    """messages.batches: create, retrieve, results, list."""
+
+    def __init__(self, client: "MockAnthropic"):
+        self._client = client
+
+    def _path(self, batch_id: str) -> Path:
+        return self._client.store_dir / f"{batch_id}.json"
+
+    def _load(self, batch_id: str) -> dict:
+        with open(self._path(batch_id)) as f:
+            return json.load(f)
+
+    def _batch(self, record: dict) -> SimpleNamespace:
+        ended = time.time() >= record["ends_at"]
+        return SimpleNamespace(
+            id=record["id"],
+            processing_status="ended" if ended else "in_progress",
+            request_counts=SimpleNamespace(
+                processing=0 if ended else len(record["requests"]),
+                succeeded=len(record["requests"]) if ended else 0,
+                errored=0, canceled=0, expired=0,
+            ),
+            created_at=record["created_at"],
+        )
+
+    def create(self, requests: list[dict]) -> SimpleNamespace:
+        self._client.store_dir.mkdir(parents=True, exist_ok=True)
+        batch_id = f"msgbatch_mock_{uuid.uuid4().hex[:16]}"
+        record = {
+            "id": batch_id,
+            "created_at": time.time(),
+            "ends_at": time.time() + self._client.batch_delay,
+            "requests": requests,
+        }
+        with open(self._path(batch_id), "w") as f:
+            json.dump(record, f)
+        return self._batch(record)
+
+    def retrieve(self, batch_id: str) -> SimpleNamespace:
+        return self._batch(self._load(batch_id))
+
+    def results(self, batch_id: str) -> Iterator[SimpleNamespace]:
+        record = self._load(batch_id)
+        if time.time() < record["ends_at"]:
+            raise RuntimeError(f"Batch {batch_id} is still in progress")
+        for request in record["requests"]:
+            text = self._client.responder(request["params"])
+            yield SimpleNamespace(
+                custom_id=request["custom_id"],
+                result=SimpleNamespace(type="succeeded", message=_message(text, request["params"])),
+            )
+
+    def list(self) -> list[SimpleNamespace]:
+        if not self._client.store_dir.exists():
+            return []
+        return [self._batch(self._load(p.stem)) for p in sorted(self._client.store_dir.glob("*.json"))]
+
+
+class _Messages:
+    def __init__(self, client: "MockAnthropic"):
+        self._client = client
+        self.batches = _Batches(client)
+
+    def create(self, **params) -> SimpleNamespace:
+        if self._client.latency:
+            time.sleep(self._client.latency)
+        self._client.requests.append(params)
+        return _message(self._client.responder(params), params)
+
+
+class MockAnthropic:
+    """Drop-in replacement for anthropic.Anthropic in tests and benchmarks."""
+
+    def __init__(self, responder: Optional[Callable[[dict], str]] = None,
+                 latency: float = 0.0, batch_delay: float = 0.0,
+                 store_dir: Optional[Path] = None, **_kwargs):
+        self.responder = responder or default_responder
+        self.latency = latency
+        self.batch_delay = batch_delay
+        self.store_dir = store_dir or config.DATA_DIR / "mock_api"
+        self.requests: list[dict] = []  # Every synchronous request, for inspection
+        self.messages = _Messages(self)
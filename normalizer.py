@@ -0,0 +1,186 @@
+"""Transcript normalization before the minutes prompt.
+
+Whisper output carries a lot the minutes never use, and every character of
+it is paid for as prompt tokens on every update:
+
+- hallucination loops ("Thank you. Thank you. Thank you.") and stutters,
+  within a segment and across consecutive segments;
+- filler words (um, uh, erm, hmm);
+- segments with nothing to minute: [BLANK_AUDIO], (music), a lone "you";
+- sentences whisper repeats on both sides of a chunk boundary;
+- a "[7:52 PM]" marker on every segment, where one per minute says the same.
+
+normalize() runs on the text sent to the minutes prompt; saved transcripts,
+raw_backup.txt and the offline queue stay verbatim, and the extractor and
+agenda aligner read the raw segments. Wall-clock markers are kept (merged
+per minute) so section times still come through, and lines that matter to
+motions ("Second.", "Aye.") are never dropped.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+from agenda_aligner import parse_segments
+
+CHARS_PER_TOKEN = 4  # Same estimate as the host API limiter
+BOUNDARY_SEGMENTS = 3  # Segments either side of a chunk boundary compared for overlap
+
+MAX_LOOP_WORDS = 8  # Longest phrase looked for in repeat loops
+
+# Lowercase only: "ER", "Um" as a name or "Hmm" opening a sentence are left alone.
+# Sentence punctuation after a trailing filler is kept ("said hmm." -> "said.").
+_FILLER = re.compile(r"(?:,\s*)?\b(?:u+m+|u+h+m*|e+r+m+|h+m+)\b,?(?=[\s.!?]|$)")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+_NON_SPEECH = re.compile(r"^[\[(*♪].*[\])*♪]$")
+_WALL_TIME = re.compile(r"^\d{1,2}:\d{2}\s*[AP]M$", re.I)
+_CHUNK_HEADER = re.compile(r"^\[Chunk -?\d+\]$")
+_SPACING = re.compile(r"\s+([,.!?])|\s{2,}")
+
+# Repeats of these are votes being cast, not loops
+VOTE_WORDS = {"aye", "ayes", "nay", "nays", "yes", "no", "opposed"}
+
+# Whole segments that say nothing the minutes could use
+LOW_INFORMATION = {
+    "you", "thank you", "thanks", "thank you very much", "thank you so much",
+    "okay", "ok", "all right", "alright", "so", "bye", "oh", "right",
+    "thanks for watching", "thank you for watching", "please subscribe",
+}
+
+
+def _key(text: str) -> str:
+    """Comparison key: lowercase words only."""
+    return " ".join(re.findall(r"[a-z0-9']+", text.lower()))
+
+
+def collapse_loops(text: str) -> str:
+    """
+    Collapse a word repeated 3+ times, or a phrase repeated 3+ times (2+ for
+    phrases of 4+ words), to one occurrence ending with the last one's punctuation.
+    """
+    words = text.split()
+    keys = [_key(w) for w in words]
+    out = []
+    i = 0
+    while i < len(words):
+        n, repeats = _loop_at(keys, i)
+        if repeats:
+            out += words[i:i + n - 1] + [words[i + repeats * n - 1]]
+            i += repeats * n
+        else:
+            out.append(words[i])
+            i += 1
+    return " ".join(out)
+
+
+def _loop_at(keys: list[str], i: int) -> tuple[int, int]:
+    """(phrase length, repeats) of the shortest loop starting at word i, or (0, 0)."""
+    for n in range(1, MAX_LOOP_WORDS + 1):
+        phrase = keys[i:i + n]
+        if len(phrase) < n or not all(phrase):
+            break
+        if set(phrase) <= VOTE_WORDS:
+            continue
+        repeats = 1
+        while keys[i + repeats * n:i + (repeats + 1) * n] == phrase:
+            repeats += 1
+        if repeats >= (3 if n < 4 else 2):
+            return n, repeats
+    return 0, 0
+
+
+def clean_segment(text: str) -> str:
+    """Drop fillers and collapse repeated words, phrases and sentences within one segment."""
+    text = collapse_loops(_FILLER.sub("", text))
+
+    sentences = []
+    for sentence in _SENTENCE_SPLIT.split(text):
+        key = _key(sentence)
+        if key and (not sentences or key != _key(sentences[-1]) or set(key.split()) <= VOTE_WORDS):
+            sentences.append(sentence)
+    text = " ".join(sentences)
+
+    text = _SPACING.sub(lambda m: m.group(1) or " ", text).strip(" ,")
+    return text[:1].upper() + text[1:]
+
+
+def is_low_information(text: str) -> bool:
+    key = _key(text)
+    return not key or key in LOW_INFORMATION or bool(_NON_SPEECH.match(text.strip()))
+
+
+def _minutes(stamp: Optional[str]) -> Optional[int]:
+    if not stamp or not _WALL_TIME.match(stamp):
+        return None
+    clock, half = stamp.upper().split()
+    hour, minute = (int(p) for p in clock.split(":"))
+    return (hour % 12 + (12 if half == "PM" else 0)) * 60 + minute
+
+
+def _overlaps(stamp: Optional[str], key: str, tail: list[tuple[Optional[str], str]]) -> bool:
+    """Whether a segment just after a boundary repeats one just before it."""
+    for tail_stamp, tail_key in tail:
+        start, end = _minutes(stamp), _minutes(tail_stamp)
+        if start is not None and end is not None and not 0 <= start - end <= 1:
+            continue  # Too far apart in time to be the same utterance
+        if key == tail_key or (len(key.split()) >= 4 and (key in tail_key or tail_key in key)):
+            return True
+    return False
+
+
+@dataclass
+class NormalizeResult:
+    text: str
+    chars_before: int
+    chars_after: int
+    segments_dropped: int = 0
+    tail: list = field(default_factory=list)  # Last segments, for the boundary with the next chunk
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(self.chars_before - self.chars_after, 0) // CHARS_PER_TOKEN
+
+
+def normalize(text: str, tail: Optional[list] = None) -> NormalizeResult:
+    """
+    Normalize one chunk's timestamped transcript (or a batch of "[Chunk N]"
+    blocks). tail is the previous chunk's NormalizeResult.tail, so overlap
+    across the boundary is removed too.
+    """
+    tail = list(tail or [])
+    lines: list[list] = []  # [stamp, text]; stamp None for plain lines and chunk headers
+    segments: list[tuple[Optional[str], str]] = []  # (stamp, key) of every kept segment
+    since_boundary = 0
+    dropped = 0
+
+    for stamp, segment in parse_segments(text):
+        if _CHUNK_HEADER.match(segment):
+            tail = segments[-BOUNDARY_SEGMENTS:] or tail
+            lines.append([None, segment])
+            since_boundary = 0
+            continue
+
+        cleaned = clean_segment(segment)
+        key = _key(cleaned)
+        if is_low_information(cleaned) \
+                or (segments and key == segments[-1][1] and since_boundary) \
+                or (since_boundary < BOUNDARY_SEGMENTS and _overlaps(stamp, key, tail)):
+            dropped += 1
+            continue
+        since_boundary += 1
+        segments.append((stamp, key))
+
+        # One marker per minute: fold a segment into the previous line with the same time
+        if lines and stamp and lines[-1][0] == stamp and _WALL_TIME.match(stamp):
+            lines[-1][1] += " " + cleaned
+        else:
+            lines.append([stamp, cleaned])
+
+    normalized = "\n".join(f"[{stamp}] {line}" if stamp else line for stamp, line in lines)
+    return NormalizeResult(
+        text=normalized,
+        chars_before=len(text),
+        chars_after=len(normalized),
+        segments_dropped=dropped,
+        tail=(segments[-BOUNDARY_SEGMENTS:] or tail),
+    )
@@ -0,0 +1,142 @@
+"""Thread-safe model of chunks moving through the processing pipeline.
+
+Recording threads, processing threads and the UI all read and write this
+state, so every access goes through one lock. The UI renders a snapshot()
+each frame to show per-chunk stages, whisper speed, API latency and whether
+processing is keeping up with real time.
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+# Chunk stages
+QUEUED = "queued"
+TRANSCRIBING = "transcribing"
+MINUTES = "minutes"
+QUEUED_OFFLINE = "queued-offline"
+DONE = "done"
+FAILED = "failed"
+
+ACTIVE_STAGES = (QUEUED, TRANSCRIBING, MINUTES)
+
+# Recent samples kept for the rolling averages
+SAMPLE_WINDOW = 10
+
+
+@dataclass
+class ChunkStatus:
+    number: int
+    audio_seconds: float
+    stage: str = QUEUED
+    created: float = field(default_factory=time.monotonic)
+    stage_since: float = field(default_factory=time.monotonic)
+    error: str = ""
+
+
+@dataclass
+class PipelineSnapshot:
+    """Point-in-time view of the pipeline for display."""
+    active: list[ChunkStatus]
+    completed: int
+    offline: int
+    failed: int
+    rtf: Optional[float]
+    api_latency: Optional[float]
+    backlog_age: float
+    backlog_audio: float
+    catch_up: Optional[float]
+    last_transcript: str
+    last_error: str
+
+
+class PipelineState:
+    """Per-chunk stage tracking plus rolling transcription and API speed."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._chunks: dict[int, ChunkStatus] = {}
+        self._rtf = deque(maxlen=SAMPLE_WINDOW)
+        self._api = deque(maxlen=SAMPLE_WINDOW)
+        self._completed = 0
+        self._offline = 0
+        self._failed = 0
+        self._last_transcript = ""
+        self._last_error = ""
+
+    def add(self, chunk: int, audio_seconds: float = 0.0):
+        """Register a cut chunk waiting to be processed."""
+        with self._lock:
+            self._chunks[chunk] = ChunkStatus(number=chunk, audio_seconds=audio_seconds)
+
+    def set_stage(self, chunk: int, stage: str, error: str = ""):
+        """Move a chunk to a new stage. Finished chunks leave the active list."""
+        with self._lock:
+            status = self._chunks.get(chunk)
+            if status is None:
+                status = self._chunks[chunk] = ChunkStatus(number=chunk, audio_seconds=0.0)
+            status.stage = stage
+            status.stage_since = time.monotonic()
+            if stage in ACTIVE_STAGES:
+                return
+
+            del self._chunks[chunk]
+            if stage == DONE:
+                self._completed += 1
+            elif stage == QUEUED_OFFLINE:
+                self._offline += 1
+            elif stage == FAILED:
+                self._failed += 1
+                self._last_error = f"Chunk {chunk}: {error}" if error else f"Chunk {chunk} failed"
+
+    def stage_of(self, chunk: int) -> Optional[str]:
+        with self._lock:
+            status = self._chunks.get(chunk)
+            return status.stage if status else None
+
+    def record_transcription(self, elapsed: float, audio_seconds: float, text: str = ""):
+        """Record one whisper run (elapsed wall time vs. audio length)."""
+        with self._lock:
+            if audio_seconds > 0:
+                self._rtf.append(elapsed / audio_seconds)
+            if text:
+                self._last_transcript = text
+
+    def record_api(self, latency: float):
+        """Record one minutes API round trip."""
+        with self._lock:
+            self._api.append(latency)
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._chunks)
+
+    def snapshot(self) -> PipelineSnapshot:
+        """Consistent copy of the state plus derived backlog figures."""
+        now = time.monotonic()
+        with self._lock:
+            active = sorted((ChunkStatus(**vars(c)) for c in self._chunks.values()),
+                            key=lambda c: c.number)
+            rtf = sum(self._rtf) / len(self._rtf) if self._rtf else None
+            api = sum(self._api) / len(self._api) if self._api else None
+            completed, offline, failed = self._completed, self._offline, self._failed
+            last_transcript, last_error = self._last_transcript, self._last_error
+
+        backlog_age = max((now - c.created for c in active), default=0.0)
+        untranscribed = [c for c in active if c.stage in (QUEUED, TRANSCRIBING)]
+        backlog_audio = sum(c.audio_seconds for c in untranscribed)
+
+        # Estimated time to drain the backlog at recent speeds
+        catch_up = None
+        if active and (rtf is not None or not untranscribed):
+            catch_up = backlog_audio * (rtf or 0.0) + len(active) * (api or 0.0)
+
+        return PipelineSnapshot(
+            active=active, completed=completed, offline=offline, failed=failed,
+            rtf=rtf, api_latency=api, backlog_age=backlog_age,
+            backlog_audio=backlog_audio, catch_up=catch_up,
+            last_transcript=last_transcript, last_error=last_error,
+        )
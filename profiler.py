@@ -0,0 +1,190 @@
+"""Opt-in CPU and memory profiling per pipeline stage.
+
+Enabled with --profile on start/record/transcribe. Each instrumented stage
+(UI redraw, audio callback, whisper run, transcript parsing, API call...)
+gets its own cProfile statistics, wall-clock totals and tracemalloc
+allocation figures. Reports are written next to the session data.
+
+When profiling is off, stage() returns a shared no-op context manager, so
+hot paths like the audio callback pay one global lookup per call, and the
+cProfile/pstats/tracemalloc modules are not even imported.
+
+tracemalloc snapshots allocate and can take milliseconds, so stages only
+ask for one; checkpoint() takes it on the recording loop at chunk
+boundaries (and before the report), never inside the audio callback.
+"""
+
+import contextlib
+import io
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import config
+
+_NULL_STAGE = contextlib.nullcontext()
+_active: Optional["Profiler"] = None
+
+
+class _StageStats:
+    def __init__(self):
+        self.calls = 0
+        self.wall = 0.0
+        self.max_wall = 0.0
+        self.alloc_bytes = 0
+        self.stats: Optional["pstats.Stats"] = None
+        self.snapshot: Optional["tracemalloc.Snapshot"] = None
+        self.snapshot_at = 0.0
+        self.snapshot_due = False
+
+
+class Profiler:
+    """Collects per-stage cProfile stats and tracemalloc figures."""
+
+    def __init__(self, output_dir: Optional[Path] = None):
+        import tracemalloc
+        self.output_dir = output_dir
+        self.started = datetime.now()
+        self._stages: dict[str, _StageStats] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        tracemalloc.start(config.PROFILE_TRACEMALLOC_FRAMES)
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        import cProfile
+        import tracemalloc
+        # One cProfile per thread at a time: nested stages only add timing
+        outer = getattr(self._local, "busy", False)
+        profile = None
+        if not outer:
+            self._local.busy = True
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                profile = None  # Another profiler is active on this thread
+
+        mem_before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start
+            if profile:
+                profile.disable()
+            if not outer:
+                self._local.busy = False
+            mem_delta = tracemalloc.get_traced_memory()[0] - mem_before
+            self._record(name, wall, mem_delta, profile)
+
+    def _record(self, name: str, wall: float, mem_delta: int, profile: Optional["cProfile.Profile"]):
+        import pstats
+        now = time.time()
+        with self._lock:
+            s = self._stages.setdefault(name, _StageStats())
+            s.calls += 1
+            s.wall += wall
+            s.max_wall = max(s.max_wall, wall)
+            s.alloc_bytes += max(mem_delta, 0)
+            if profile:
+                if s.stats is None:
+                    s.stats = pstats.Stats(profile)
+                else:
+                    s.stats.add(profile)
+            # Full snapshots are expensive; at most one per stage per interval, at the next checkpoint()
+            if now - s.snapshot_at >= config.PROFILE_SNAPSHOT_SECONDS:
+                s.snapshot_due = True
+
+    def checkpoint(self):
+        """Take one tracemalloc snapshot for every stage that is due one."""
+        import tracemalloc
+        with self._lock:
+            due = [s for s in self._stages.values() if s.snapshot_due]
+        if not due:
+            return
+        snapshot = tracemalloc.take_snapshot()
+        now = time.time()
+        with self._lock:
+            for s in due:
+                s.snapshot, s.snapshot_at, s.snapshot_due = snapshot, now, False
+
+    def write_reports(self) -> Optional[Path]:
+        """Write a text report plus one .prof file per stage. Returns the report path."""
+        import tracemalloc
+        self.checkpoint()
+        output_dir = self.output_dir or config.DATA_DIR / "profiles" / self.started.strftime("%Y%m%d_%H%M%S")
+        output_dir.mkdir(parents=True, exist_ok=True)
+        current, peak = tracemalloc.get_traced_memory()
+
+        with self._lock:
+            stages = sorted(self._stages.items(), key=lambda kv: kv[1].wall, reverse=True)
+
+        out = io.StringIO()
+        out.write(f"Profile started {self.started:%Y-%m-%d %H:%M:%S}, "
+                  f"written {datetime.now():%H:%M:%S}\n")
+        out.write(f"Traced memory: current {current / 1e6:.1f} MB, peak {peak / 1e6:.1f} MB\n\n")
+        out.write(f"{'Stage':<24} {'calls':>8} {'wall s':>10} {'mean ms':>9} {'max ms':>9} {'alloc MB':>9}\n")
+        for name, s in stages:
+            out.write(f"{name:<24} {s.calls:>8} {s.wall:>10.3f} {1000 * s.wall / s.calls:>9.2f} "
+                      f"{1000 * s.max_wall:>9.2f} {s.alloc_bytes / 1e6:>9.2f}\n")
+
+        for name, s in stages:
+            out.write(f"\n{'=' * 70}\n{name}\n{'=' * 70}\n")
+            if s.stats:
+                s.stats.dump_stats(str(output_dir / f"{name}.prof"))
+                s.stats.stream = out
+                s.stats.sort_stats("cumulative").print_stats(config.PROFILE_TOP_N)
+            if s.snapshot:
+                out.write(f"Top allocations (snapshot):\n")
+                for stat in s.snapshot.statistics("lineno")[:config.PROFILE_TOP_N]:
+                    out.write(f"  {stat}\n")
+
+        report = output_dir / "profile_report.txt"
+        report.write_text(out.getvalue())
+        return report
+
+
+def enable(output_dir: Optional[Path] = None) -> Profiler:
+    """Turn on profiling for this process."""
+    global _active
+    if _active is None:
+        _active = Profiler(output_dir)
+    return _active
+
+
+def set_output_dir(output_dir: Path):
+    """Point reports at a session directory once it is known."""
+    if _active is not None:
+        _active.output_dir = output_dir
+
+
+def stage(name: str):
+    """Context manager profiling a pipeline stage (a no-op when profiling is off)."""
+    if _active is None:
+        return _NULL_STAGE
+    return _active.stage(name)
+
+
+def checkpoint():
+    """Take the memory snapshots stages are due (call at chunk boundaries; no-op when off)."""
+    if _active is not None:
+        _active.checkpoint()
+
+
+def finish():
+    """Write reports and stop profiling."""
+    global _active
+    if _active is None:
+        return
+    try:
+        report = _active.write_reports()
+        print(f"\n🔬 Profile report: {report}")
+    except Exception as e:
+        print(f"  [Warning] Could not write profile report: {e}")
+    finally:
+        import tracemalloc
+        tracemalloc.stop()
+        _active = None
@@ -3,11 +3,14 @@
 import subprocess
 import signal
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
 import config
+import metrics
+import wav_header
 
 
 class AudioRecorder:
@@ -20,6 +23,8 @@ class AudioRecorder:
         self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.session_dir = config.AUDIO_DIR / self.session_id
         self.session_dir.mkdir(parents=True, exist_ok=True)
+        self.metrics = metrics.for_session(self.session_id)
+        self.checkpointer = wav_header.HeaderCheckpointer()  # Keeps headers valid if we crash mid-recording
 
     def get_chunk_path(self) -> Path:
         """Get the path for the current chunk."""
@@ -27,10 +32,11 @@ class AudioRecorder:
 
     def record_chunk(self) -> Path:
         """Record a single audio chunk. Returns path to recorded file."""
+        import catalog
         output_path = self.get_chunk_path()
 
         cmd = [
-            "sox",
+            config.SOX_BIN,
             "-d",  # Default audio device (microphone)
             "-c", str(config.CHANNELS),
             "-r", str(config.SAMPLE_RATE),
@@ -42,6 +48,8 @@ class AudioRecorder:
         print(f"Recording chunk {self.chunk_number} ({self.chunk_duration}s)...")
         print(f"  Output: {output_path}")
 
+        started = time.perf_counter()
+        self.checkpointer.watch(output_path)
         try:
             result = subprocess.run(cmd, capture_output=True, text=True)
             if result.returncode != 0:
@@ -49,21 +57,30 @@ class AudioRecorder:
         except KeyboardInterrupt:
             print("\n  Recording interrupted by user")
             raise
+        finally:
+            self.checkpointer.unwatch(output_path)
+
+        self.metrics.timing(metrics.CAPTURE, time.perf_counter() - started,
+                            chunk=self.chunk_number, target_seconds=self.chunk_duration)
+        catalog.get().chunk_recorded(self.session_id, self.chunk_number, output_path)
 
         self.chunk_number += 1
         return output_path
 
-    def start_continuous(self, callback=None):
-        """Start continuous recording, calling callback after each chunk."""
+    def start_continuous(self, callback=None, max_chunks: Optional[int] = None):
+        """Start continuous recording, calling callback after each chunk (until max_chunks, if given)."""
         print(f"Starting continuous recording session: {self.session_id}")
         print(f"Chunk duration: {self.chunk_duration}s")
         print("Press Ctrl+C to stop\n")
+        import profiler
 
         try:
-            while True:
+            while max_chunks is None or self.chunk_number < max_chunks:
                 chunk_path = self.record_chunk()
                 if callback and chunk_path.exists():
                     callback(chunk_path)
+                profiler.checkpoint()
+            return self.session_dir
         except KeyboardInterrupt:
             print("\n\nRecording session ended.")
             return self.session_dir
@@ -72,10 +89,10 @@ class AudioRecorder:
 def test_microphone():
     """Quick test to verify microphone is working."""
     print("Testing microphone (3 second recording)...")
-    test_file = config.AUDIO_DIR / "mic_test.wav"
+    test_file = config.ensure_dir(config.AUDIO_DIR) / "mic_test.wav"
 
     cmd = [
-        "sox", "-d",
+        config.SOX_BIN, "-d",
         "-c", "1", "-r", "16000", "-b", "16",
         str(test_file),
         "trim", "0", "3"
@@ -0,0 +1,144 @@
+"""Crash recovery for recorded sessions.
+
+`resume <session>` picks a session up after a crash or power cut:
+
+1. Repairs the WAV headers sox never finalized (backup and chunks), and
+   takes over chunks left unfinished at a quit deadline (shutdown.py).
+2. Finds chunks without a transcript and transcribes only those, in parallel.
+3. Folds every transcribed chunk that isn't in the minutes yet into one
+   minutes update (through the offline queue, so nothing is lost if the
+   API is unreachable - process-queue finishes it later).
+4. Marks the session ended at the end of its audio.
+
+Chunk state comes from the session catalog when enabled; otherwise a chunk
+with a transcript file that isn't in the offline queue counts as done.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Optional
+
+import archiver
+import catalog
+import config
+import shutdown
+import wav_header
+
+
+def _chunk_number(path) -> int:
+    return int(path.stem.split("_")[1])
+
+
+def resume_session(session_id: str, model: str = config.WHISPER_MODEL, workers: Optional[int] = None,
+                   meeting_name: Optional[str] = None) -> bool:
+    """Repair and finish one session. Returns False if the session doesn't exist."""
+    from minutes_generator import OfflineMinutesStore, open_session
+    from transcriber import Transcriber, TranscriptManager
+
+    audio_dir = config.AUDIO_DIR / session_id
+    if not audio_dir.is_dir():
+        print(f"No audio found for session {session_id} ({audio_dir})")
+        return False
+    started = time.perf_counter()
+    transcript_dir = config.TRANSCRIPTS_DIR / session_id
+    rows = catalog.get().chunks(session_id)
+
+    # 1. Headers
+    wavs = sorted(audio_dir.glob("*.wav"))
+    repaired = [p.name for p in wavs if wav_header.repair(p)]
+    print(f"Session {session_id}: {len(wavs)} WAV file(s), {len(repaired)} header(s) repaired")
+
+    # Chunks left unfinished at a quit deadline carry their exact start times
+    if shutdown.load_jobs(session_id):
+        print(f"Finishing {shutdown.resume_jobs(session_id, model)} chunk(s) left at shutdown")
+
+    # Chunk start times: recorded ones from the catalog, else back to back from the session start
+    chunk_paths = sorted(archiver.session_chunks(audio_dir), key=_chunk_number)
+    session_start = datetime.strptime(session_id[:15], "%Y%m%d_%H%M%S")
+    starts, clock = {}, session_start
+    for path in chunk_paths:
+        n = _chunk_number(path)
+        row = (rows or {}).get(n) or {}
+        clock = datetime.fromisoformat(row["started"]) if row.get("started") else clock
+        starts[n] = clock
+        clock += timedelta(seconds=archiver.audio_seconds(path))
+    audio_end = clock
+
+    # 2. Transcripts
+    def transcribed(n: int) -> bool:
+        row = (rows or {}).get(n)
+        return (row is not None and row["transcribed"] is not None) or \
+            (transcript_dir / f"chunk_{n:04d}.txt").exists()
+
+    missing = [p for p in chunk_paths if not transcribed(_chunk_number(p))]
+    texts: dict[int, str] = {}
+    if missing:
+        transcriber = Transcriber(model=model)
+        workers = workers or config.RESUME_WORKERS
+        print(f"Transcribing {len(missing)} chunk(s) with {workers} worker(s)...")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="resume") as pool:
+            results = pool.map(lambda p: transcriber.transcribe(p, output_dir=transcript_dir,
+                                                                chunk_start_time=starts[_chunk_number(p)]),
+                               missing)
+            for path, result in zip(missing, results):
+                if result.get("error"):
+                    print(f"  ❌ {path.name}: {result['error'][:100]}")
+                    continue
+                texts[_chunk_number(path)] = (result.get("timestamped_text") or result.get("text", "")).strip()
+
+        transcript_mgr = TranscriptManager(session_id)
+        for n in sorted(texts):
+            if texts[n]:
+                transcript_mgr.append(texts[n], n)
+
+    # 3. Minutes
+    store = OfflineMinutesStore(session_id)
+    queue = store.load_queue()
+    queued = {item.get("chunk") for item in queue}
+    for path in chunk_paths:
+        n = _chunk_number(path)
+        if n in queued:
+            continue
+        row = (rows or {}).get(n)
+        if n in texts:
+            text = texts[n]
+        elif rows is not None and row is not None and row["in_minutes"] is None and transcribed(n):
+            chunk_file = transcript_dir / f"chunk_{n:04d}.txt"
+            text = chunk_file.read_text().strip() if chunk_file.exists() else ""
+        else:
+            continue
+        if text:
+            queue.append({"chunk": n, "text": text, "timestamp": datetime.now().isoformat(),
+                          "reason": "resume"})
+    queue.sort(key=lambda item: item.get("chunk", -1))
+
+    gen = open_session(session_id)
+    if meeting_name and not gen.minutes_file.exists():
+        # Crashed before the first minutes were written, so the name was never saved
+        gen.meeting_name = meeting_name
+        gen.minutes_file = config.ensure_dir(config.MINUTES_DIR) / f"{session_id}_{meeting_name}.md"
+        gen.catalog.add_session(session_id, meeting_name, session_start, gen.minutes_file)
+    gen.session_start = session_start
+    if not gen.current_minutes:
+        gen.current_minutes = gen.template_minutes()
+
+    applied = 0
+    if queue:
+        print(f"Updating minutes with {len(queue)} chunk(s)...")
+        gen.offline_queue = queue
+        applied = gen.process_queue()
+        if gen.offline_queue:
+            store.save_queue(gen.offline_queue)
+            print(f"  📦 {len(gen.offline_queue)} item(s) queued (run process-queue when online)")
+        else:
+            store.clear()
+
+    # 4. End time
+    if "**Ended:** (in progress)" in gen.current_minutes or not gen.minutes_file.exists():
+        gen.finalize(ended=audio_end)
+
+    print(f"✅ Resumed {session_id} in {time.perf_counter() - started:.1f}s: "
+          f"{len(texts)} transcribed, {applied} folded into minutes")
+    print(f"📋 Minutes: {gen.minutes_file}")
+    return True
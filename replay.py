@@ -0,0 +1,400 @@
+"""Replay harness: drive the full pipeline from a WAV file, no microphone.
+
+A recorded session (e.g. data/audio/<session>/full_session_backup.wav) is
+played back through the real recorders at N× speed:
+
+- a stub `sox` "captures" the part of the source WAV between its start and
+  its termination on the replay clock (or `trim 0 N` seconds), snapped to
+  the scripted cut times so chunk windows are reproducible; a raw capture to
+  stdout (capture.PcmCapture) streams the source in step with the clock;
+- a stub `whisper-cli` emits segments for its chunk's window of the source
+  (found by locating the chunk's samples in the source when piped on stdin),
+  taken from a reference transcript if given, after sleeping
+  audio_seconds × rtf (scaled by relative model cost when auto-tune
+  switches models) to simulate transcription load;
+- scripted SPACE presses cut chunks at given source times, then Q quits;
+- minutes go to the mock API client (mock_anthropic.py).
+
+Usage:
+    python minute_bot.py replay full_session_backup.wav --speed 20 --cut-every 300
+    python minute_bot.py replay meeting.wav --mode record --chunk-duration 120 --json replay.json
+
+Set MINUTE_BOT_DATA_DIR to keep replayed sessions out of data/.
+"""
+
+import io
+import json
+import math
+import os
+import re
+import shutil
+import signal
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+from typing import Optional
+
+import config
+
+# Environment shared with the stub executables
+ENV_SOURCE = "MINUTE_BOT_REPLAY_SOURCE"
+ENV_START = "MINUTE_BOT_REPLAY_START"
+ENV_SPEED = "MINUTE_BOT_REPLAY_SPEED"
+ENV_TRANSCRIPT = "MINUTE_BOT_REPLAY_TRANSCRIPT"
+ENV_RTF = "MINUTE_BOT_REPLAY_RTF"
+ENV_CUTS = "MINUTE_BOT_REPLAY_CUTS"
+ENV_MODEL = "MINUTE_BOT_REPLAY_MODEL"  # Model the --whisper-rtf applies to
+
+SIDECAR_SUFFIX = ".replay.json"  # Source window a stub capture covers
+SYNTHETIC_SEGMENT_SECONDS = 10
+
+_WHISPER_LINE = re.compile(r'\[(\d+):(\d+):(\d+(?:\.\d+)?) --> [^\]]+\]\s*(.*)')
+_WALL_LINE = re.compile(r'\[(\d{1,2}):(\d{2})\s*([AP]M)\]\s*(.*)', re.IGNORECASE)
+
+
+def replay_clock() -> float:
+    """Seconds into the source audio, per the shared replay start and speed."""
+    start = float(os.environ[ENV_START])
+    speed = float(os.environ.get(ENV_SPEED, "1"))
+    return (time.time() - start) * speed
+
+
+def wav_seconds(path: Path) -> float:
+    with wave.open(str(path), "rb") as w:
+        return w.getnframes() / float(w.getframerate())
+
+
+def copy_window(source: Path, dest: Path, start: float, end: float):
+    """Write source[start:end] seconds to dest as a WAV with the source's format."""
+    with wave.open(str(source), "rb") as src:
+        rate = src.getframerate()
+        first = min(int(start * rate), src.getnframes())
+        last = min(int(end * rate), src.getnframes())
+        src.setpos(first)
+        frames = src.readframes(max(0, last - first))
+        with wave.open(str(dest), "wb") as out:
+            out.setnchannels(src.getnchannels())
+            out.setsampwidth(src.getsampwidth())
+            out.setframerate(rate)
+            out.writeframes(frames)
+
+
+def stream_source(source: Path, speed: float) -> int:
+    """Write the source's samples to stdout as the replay clock reaches them, until terminated."""
+    stopped = []
+    signal.signal(signal.SIGTERM, lambda *_: stopped.append(True))
+    signal.signal(signal.SIGINT, lambda *_: stopped.append(True))
+    out = sys.stdout.buffer
+    with wave.open(str(source), "rb") as src:
+        rate, total = src.getframerate(), src.getnframes()
+        src.setpos(min(int(replay_clock() * rate), total))
+        while not stopped:
+            due = min(int(replay_clock() * rate), total)
+            if due > src.tell():
+                try:
+                    out.write(src.readframes(due - src.tell()))
+                    out.flush()
+                except BrokenPipeError:
+                    return 0
+            time.sleep(0.02)
+    return 0
+
+
+def fake_sox(argv: list[str]) -> int:
+    """Stub for `sox -d ... out.wav [trim 0 N]`, `sox -d ... -t raw -` and `sox in.wav ... out.wav`."""
+    if "-d" in argv and argv[-1] == "-":
+        return stream_source(Path(os.environ[ENV_SOURCE]), float(os.environ.get(ENV_SPEED, "1")))
+    if "-d" not in argv:
+        # Conversion (watch mode): inputs are assumed to be WAV already
+        paths = [a for a in argv if a.lower().endswith(".wav")]
+        copy_window(Path(paths[0]), Path(paths[-1]), 0, math.inf)
+        return 0
+
+    source = Path(os.environ[ENV_SOURCE])
+    speed = float(os.environ.get(ENV_SPEED, "1"))
+    trim = None
+    if "trim" in argv:
+        i = argv.index("trim")
+        trim = float(argv[i + 2])
+        argv = argv[:i]
+    dest = Path(argv[-1])
+
+    stopped = []
+    signal.signal(signal.SIGTERM, lambda *_: stopped.append(True))
+    signal.signal(signal.SIGINT, lambda *_: stopped.append(True))
+
+    # Snap to the scripted boundaries so windows don't depend on process start-up lag
+    duration = wav_seconds(source)
+    boundaries = sorted({0.0, duration, *(float(c) for c in os.environ.get(ENV_CUTS, "").split(",") if c)})
+    clock = replay_clock()
+    if trim is not None:
+        # Carry on from the previous chunk, so windows stay contiguous when the length changes
+        ends = [json.loads(p.read_text())["end"] for p in dest.parent.glob("*" + SIDECAR_SUFFIX)]
+        start = max(ends) if ends else math.floor(clock / trim) * trim
+        if start >= duration:
+            os.kill(os.getppid(), signal.SIGINT)  # Source used up: stop recording like Ctrl+C
+            return 0
+    else:
+        start = max(b for b in boundaries if b <= clock)
+
+    while not stopped:
+        if trim is not None and replay_clock() - start >= trim:
+            break
+        time.sleep(0.02 if trim is None else min(0.2, trim / speed / 10))
+
+    if trim is not None:
+        end = start + trim
+    else:
+        clock = replay_clock()
+        end = max(b for b in boundaries if b <= clock)
+        if end <= start:
+            end = clock
+    copy_window(source, dest, start, end)
+    Path(str(dest) + SIDECAR_SUFFIX).write_text(json.dumps(
+        {"start": round(min(start, duration), 3), "end": round(min(end, duration), 3)}))
+    return 0
+
+
+def load_reference(path: Optional[Path], duration: float) -> list[tuple[float, str]]:
+    """
+    Reference transcript as [(source_seconds, text)]. Accepts whisper output
+    lines, wall-clock lines like "[7:34 PM] text" (offsets from the first
+    one) or plain lines (spread evenly over the audio).
+    """
+    if not path or not path.exists():
+        return []
+    lines = [l.strip() for l in path.read_text().splitlines() if l.strip()]
+    timed, untimed = [], []
+    first_wall = None
+    for line in lines:
+        m = _WHISPER_LINE.match(line)
+        if m:
+            timed.append((int(m[1]) * 3600 + int(m[2]) * 60 + float(m[3]), m[4]))
+            continue
+        m = _WALL_LINE.match(line)
+        if m:
+            minutes = (int(m[1]) % 12 + (12 if m[3].upper() == "PM" else 0)) * 60 + int(m[2])
+            first_wall = minutes if first_wall is None else first_wall
+            timed.append(((minutes - first_wall) * 60.0, m[4]))
+            continue
+        if not line.startswith("---"):
+            untimed.append(line)
+
+    if timed:
+        return timed
+    step = duration / max(len(untimed), 1)
+    return [(i * step, text) for i, text in enumerate(untimed)]
+
+
+def _format_ts(seconds: float) -> str:
+    seconds = max(seconds, 0.0)
+    h, rem = divmod(seconds, 3600)
+    m, s = divmod(rem, 60)
+    return f"{int(h):02d}:{int(m):02d}:{s:06.3f}"
+
+
+def locate_window(source: Path, data: bytes) -> dict:
+    """Source window of a WAV piped on stdin, found by matching its first samples."""
+    with wave.open(io.BytesIO(data), "rb") as chunk:
+        frame = chunk.getsampwidth() * chunk.getnchannels()
+        seconds = chunk.getnframes() / float(chunk.getframerate())
+        probe = chunk.readframes(chunk.getframerate())
+    with wave.open(str(source), "rb") as src:
+        rate = src.getframerate()
+        samples = src.readframes(src.getnframes())
+    offset = samples.find(probe) if probe else -1
+    while offset > 0 and offset % frame:
+        offset = samples.find(probe, offset + 1)
+    start = offset / frame / rate if offset >= 0 else 0.0
+    return {"start": start, "end": start + seconds}
+
+
+def fake_whisper(argv: list[str]) -> int:
+    """Stub for `whisper-cli -m model -f chunk.wav|- ...`: prints whisper-style segments."""
+    if argv[argv.index("-f") + 1] == "-":
+        data = sys.stdin.buffer.read()
+        with wave.open(io.BytesIO(data), "rb") as w:
+            chunk_seconds = w.getnframes() / float(w.getframerate())
+        source = os.environ.get(ENV_SOURCE)
+        window = locate_window(Path(source), data) if source else {"start": 0.0, "end": chunk_seconds}
+    else:
+        audio = Path(argv[argv.index("-f") + 1])
+        chunk_seconds = wav_seconds(audio)
+        sidecar = Path(str(audio) + SIDECAR_SUFFIX)
+        window = json.loads(sidecar.read_text()) if sidecar.exists() else {"start": 0.0, "end": chunk_seconds}
+
+    # Simulated transcription cost, scaled from the replayed model to the one asked for
+    from autotune import MODEL_COST
+    model = Path(argv[argv.index("-m") + 1]).stem.replace("ggml-", "").split(".")[0]
+    scale = MODEL_COST.get(model, 1.0) / MODEL_COST.get(os.environ.get(ENV_MODEL, model), 1.0)
+    time.sleep(chunk_seconds * float(os.environ.get(ENV_RTF, "0")) * scale)
+
+    transcript = os.environ.get(ENV_TRANSCRIPT)
+    source = os.environ.get(ENV_SOURCE)
+    total = wav_seconds(Path(source)) if source else chunk_seconds
+    reference = load_reference(Path(transcript) if transcript else None, total)
+
+    start, end = window["start"], window["end"]
+    if reference:
+        segments = [(t - start, text) for t, text in reference if start <= t < end]
+    else:
+        segments = [
+            (t - start, f"Replayed audio from {_format_ts(t)[:8]} to {_format_ts(min(t + SYNTHETIC_SEGMENT_SECONDS, end))[:8]}.")
+            for t in _frange(start, end, SYNTHETIC_SEGMENT_SECONDS)
+        ]
+
+    for i, (offset, text) in enumerate(segments):
+        next_offset = segments[i + 1][0] if i + 1 < len(segments) else end - start
+        print(f"[{_format_ts(offset)} --> {_format_ts(next_offset)}]   {text}")
+    return 0
+
+
+def _frange(start: float, end: float, step: float):
+    t = start
+    while t < end:
+        yield t
+        t += step
+
+
+def write_stubs(bin_dir: Path) -> tuple[Path, Path]:
+    """Create executable sox and whisper-cli stubs that call back into this module."""
+    stubs = []
+    for name, func in [("sox", "fake_sox"), ("whisper-cli", "fake_whisper")]:
+        path = bin_dir / name
+        path.write_text(
+            f"#!{sys.executable}\n"
+            f"import sys\n"
+            f"sys.path.insert(0, {str(config.BASE_DIR)!r})\n"
+            f"import replay\n"
+            f"sys.exit(replay.{func}(sys.argv[1:]))\n"
+        )
+        path.chmod(0o755)
+        stubs.append(path)
+    return stubs[0], stubs[1]
+
+
+class ScriptedKeys:
+    """Key source that presses SPACE at scripted source times, then Q at the end."""
+
+    def __init__(self, cut_times: list[float], end_time: float):
+        self.cuts = sorted(t for t in cut_times if 0 < t < end_time)
+        self.end_time = end_time
+
+    def __call__(self, timeout: Optional[float]) -> Optional[str]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            now = replay_clock()
+            if self.cuts and now >= self.cuts[0]:
+                self.cuts.pop(0)
+                return " "
+            if now >= self.end_time:
+                return "q"
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(0.01)
+
+
+def _latencies(session_id: str) -> dict:
+    """Per-chunk cut-to-minutes latency and transcription speed from metrics.jsonl."""
+    import metrics
+
+    events = metrics.load_events(session_id)
+    cut_at = {}
+    done_at = {}
+    rtfs = []
+    for e in events:
+        chunk = e.get("chunk")
+        if e["stage"] in (metrics.CUT, metrics.CAPTURE) and e["kind"] == "timing":
+            cut_at.setdefault(chunk, e["t"])
+        elif e["stage"] == metrics.TRANSCRIBE and e.get("rtf") is not None:
+            rtfs.append(e["rtf"])
+        elif e["stage"] in (metrics.MINUTES, metrics.QUEUE):
+            done_at[chunk] = e["t"]
+
+    latencies = [done_at[c] - cut_at[c] for c in done_at if c in cut_at]
+    return {
+        "chunks_with_minutes": len(latencies),
+        "latency_p50": round(metrics.percentile(latencies, 50), 3),
+        "latency_p90": round(metrics.percentile(latencies, 90), 3),
+        "latency_max": round(max(latencies), 3) if latencies else 0.0,
+        "transcribe_rtf_p50": round(metrics.percentile(rtfs, 50), 4),
+    }
+
+
+def run(source: Path, mode: str = "basic", speed: float = 10.0, cut_every: Optional[float] = None,
+        cuts: Optional[list[float]] = None, chunk_duration: int = config.CHUNK_DURATION_SECONDS,
+        transcript: Optional[Path] = None, whisper_rtf: float = 0.0, real_whisper: bool = False,
+        model: str = config.WHISPER_MODEL, meeting_name: str = "Replay",
+        json_path: Optional[Path] = None, auto_tune: bool = False) -> dict:
+    """Replay source through the chosen recording mode and report throughput."""
+    import minute_bot
+
+    duration = wav_seconds(source)
+    bin_dir = Path(tempfile.mkdtemp(prefix="minute_bot_replay_"))
+    sox_stub, whisper_stub = write_stubs(bin_dir)
+
+    os.environ.update({
+        ENV_SOURCE: str(source.resolve()),
+        ENV_SPEED: str(speed),
+        ENV_RTF: str(whisper_rtf),
+        ENV_MODEL: model,
+    })
+    if transcript:
+        os.environ[ENV_TRANSCRIPT] = str(transcript.resolve())
+    config.SOX_BIN = str(sox_stub)
+    config.MOCK_API = True
+    if not real_whisper:
+        config.WHISPER_CLI = str(whisper_stub)
+        config.WHISPER_MODEL_DIR = bin_dir
+        from transcriber import MODEL_MAP
+        # Auto-tune may step down to any smaller model
+        for name in (MODEL_MAP if auto_tune else [model]):
+            (bin_dir / MODEL_MAP.get(name, f"ggml-{name}.bin")).write_text("stub")
+
+    before = set(config.AUDIO_DIR.glob("2*")) if config.AUDIO_DIR.exists() else set()
+    print(f"⏩ Replaying {source.name} ({duration / 60:.1f} min) at {speed:g}x in {mode} mode")
+
+    os.environ[ENV_START] = repr(time.time())
+    started = time.perf_counter()
+    try:
+        if mode == "record":
+            # Auto-tuned chunk lengths vary; the stub sox stops the recording when the source runs out
+            max_chunks = None if auto_tune else math.ceil(duration / chunk_duration)
+            minute_bot.record_meeting(meeting_name, chunk_duration, model, max_chunks=max_chunks,
+                                      auto_tune=auto_tune)
+        else:
+            step = cut_every or chunk_duration
+            cut_times = cuts or list(_frange(step, duration, step))
+            os.environ[ENV_CUTS] = ",".join(str(t) for t in cut_times)
+            keys = ScriptedKeys(cut_times, duration)
+            if mode == "ui":
+                minute_bot.ui_meeting(meeting_name, model, key_source=keys)
+            else:
+                minute_bot.interactive_meeting(meeting_name, model, key_source=keys)
+    finally:
+        shutil.rmtree(bin_dir, ignore_errors=True)
+    wall = time.perf_counter() - started
+
+    after = set(config.AUDIO_DIR.glob("2*")) - before
+    session_id = max(after).name if after else None
+    report = {
+        "source": str(source),
+        "mode": mode,
+        "speed": speed,
+        "audio_seconds": round(duration, 2),
+        "wall_seconds": round(wall, 2),
+        "effective_speed": round(duration / wall, 2) if wall else None,
+        "session_id": session_id,
+    }
+    if session_id:
+        report.update(_latencies(session_id))
+
+    print(f"\nReplay report:")
+    for key, value in report.items():
+        print(f"  {key:<20} {value}")
+    if json_path:
+        json_path.write_text(json.dumps(report, indent=2))
+        print(f"  Saved: {json_path}")
+    return report
@@ -0,0 +1,142 @@
+"""Deterministic response cache for minutes generation.
+
+Responses are keyed by a hash of the full request (model, parameters and
+prompt), so replaying a session or re-running process-queue with unchanged
+inputs costs nothing. The cache is a small SQLite file with LRU eviction
+bounded by entry count and total size.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import config
+
+
+def request_key(params: dict) -> str:
+    """Stable hash of a Messages API request."""
+    blob = json.dumps(params, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed LRU cache of model responses."""
+
+    def __init__(self, path: Optional[Path] = None,
+                 max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = None):
+        self.path = path or config.RESPONSE_CACHE_FILE
+        self.max_entries = config.RESPONSE_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.max_bytes = config.RESPONSE_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, response TEXT NOT NULL,"
+                " size INTEGER NOT NULL, created REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses(last_used)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+
+    def _bump(self, name: str):
+        self._conn.execute(
+            "INSERT INTO counters(name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1", (name,)
+        )
+
+    def get(self, params: dict) -> Optional[str]:
+        """Return the cached response text for a request, or None."""
+        key = request_key(params)
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._bump("misses")
+                return None
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._bump("hits")
+            return row[0]
+
+    def put(self, params: dict, response: str):
+        """Store a response and evict least recently used entries over the bounds."""
+        self.put_key(request_key(params), response)
+
+    def put_key(self, key: str, response: str):
+        """Store a response under a precomputed request_key()."""
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses(key, response, size, created, last_used) "
+                "VALUES (?, ?, ?, ?, ?)", (key, response, size, now, now)
+            )
+            self._evict()
+
+    def _evict(self):
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall()
+        evicted = []
+        for key, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            count -= 1
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        for _ in evicted:
+            self._bump("evictions")
+
+    def stats(self) -> dict:
+        """Entry count, size and hit/miss counters."""
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            counters = dict(self._conn.execute("SELECT name, value FROM counters").fetchall())
+        hits, misses = counters.get("hits", 0), counters.get("misses", 0)
+        return {
+            "entries": count,
+            "bytes": total,
+            "hits": hits,
+            "misses": misses,
+            "evictions": counters.get("evictions", 0),
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        }
+
+    def clear(self):
+        """Drop all cached responses and counters."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.execute("DELETE FROM counters")
+
+
+_shared: Optional[ResponseCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_cache() -> Optional[ResponseCache]:
+    """
+    The process-wide cache, or None when disabled or unavailable. Mock and
+    replay runs (config.MOCK_API) get no cache, so their canned minutes are
+    never served to a later live run with the same request.
+    """
+    global _shared
+    if not config.RESPONSE_CACHE_ENABLED or config.MOCK_API:
+        return None
+    with _shared_lock:
+        if _shared is None:
+            try:
+                _shared = ResponseCache()
+            except Exception as e:
+                print(f"  [Warning] Response cache unavailable: {e}")
+                return None
+        return _shared
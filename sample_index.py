@@ -0,0 +1,183 @@
+"""Relevance-ranked sample minutes library.
+
+Sample minutes are indexed locally with BM25 so that only the few samples
+most similar to the current meeting are sent as style reference, no matter
+how many past minutes live in samples/. The index is cached on disk and only
+re-reads files whose size or mtime changed.
+"""
+
+import json
+import math
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Optional
+
+import config
+
+# BM25 tuning (standard defaults)
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+INDEX_VERSION = 1
+
+STOPWORDS = {
+    "the", "and", "for", "that", "this", "with", "are", "was", "were", "will",
+    "from", "have", "has", "had", "not", "but", "all", "any", "can", "our",
+    "you", "your", "they", "their", "them", "there", "what", "when", "who",
+    "which", "would", "should", "could", "been", "being", "into", "about",
+    "also", "than", "then", "its", "his", "her", "she", "him", "out", "one",
+    "two", "per", "via",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens, minus short words and stopwords."""
+    return [t for t in _TOKEN_RE.findall(text.lower())
+            if len(t) > 2 and t not in STOPWORDS]
+
+
+class SampleIndex:
+    """BM25 index over the files in a samples directory."""
+
+    def __init__(self, samples_dir: Path, index_file: Path,
+                 reader: Callable[[Path], str]):
+        self.samples_dir = samples_dir
+        self.index_file = index_file
+        self.reader = reader
+        self.docs: dict[str, dict] = {}
+
+    def _load_cache(self) -> dict:
+        if not self.index_file.exists():
+            return {}
+        try:
+            with open(self.index_file) as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION:
+                return {}
+            return data.get("docs", {})
+        except Exception as e:
+            print(f"  [Warning] Could not read sample index: {e}")
+            return {}
+
+    def _save_cache(self):
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.index_file, "w") as f:
+                json.dump({"version": INDEX_VERSION, "docs": self.docs}, f)
+        except Exception as e:
+            print(f"  [Warning] Could not save sample index: {e}")
+
+    def refresh(self) -> "SampleIndex":
+        """Sync the index with the samples directory, re-reading only changed files."""
+        cached = self._load_cache()
+        docs = {}
+        changed = False
+
+        if self.samples_dir.exists():
+            files = [f for f in self.samples_dir.iterdir()
+                     if f.is_file() and not f.name.startswith('.')]
+        else:
+            files = []
+
+        for f in files:
+            stat = f.stat()
+            entry = cached.get(f.name)
+            if entry and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+                docs[f.name] = entry
+                continue
+
+            content = self.reader(f)
+            tokens = tokenize(content)
+            docs[f.name] = {
+                "mtime": stat.st_mtime,
+                "size": stat.st_size,
+                "chars": len(content),
+                "length": len(tokens),
+                "tf": dict(Counter(tokens)),
+            }
+            changed = True
+
+        if changed or set(docs) != set(cached):
+            self.docs = docs
+            self._save_cache()
+        else:
+            self.docs = docs
+        return self
+
+    def rank(self, query: str) -> list[tuple[str, float]]:
+        """Return (file name, score) pairs, best first. Ties go to the newest file."""
+        if not self.docs:
+            return []
+
+        terms = set(tokenize(query))
+        n_docs = len(self.docs)
+        avg_len = sum(d["length"] for d in self.docs.values()) / n_docs or 1.0
+
+        doc_freq = Counter()
+        for d in self.docs.values():
+            for term in terms:
+                if term in d["tf"]:
+                    doc_freq[term] += 1
+
+        scored = []
+        for name, d in self.docs.items():
+            score = 0.0
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * d["length"] / avg_len)
+            for term in terms:
+                tf = d["tf"].get(term, 0)
+                if not tf:
+                    continue
+                idf = math.log(1 + (n_docs - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+                score += idf * tf * (BM25_K1 + 1) / (tf + norm)
+            scored.append((name, score, d["mtime"]))
+
+        scored.sort(key=lambda x: (x[1], x[2]), reverse=True)
+        return [(name, score) for name, score, _ in scored]
+
+    def select(self, query: str, top_k: int, max_chars: int) -> list[Path]:
+        """
+        Pick up to top_k of the most relevant samples that fit within max_chars.
+        If none fits, the best-ranked sample is returned alone; the caller cuts
+        it to max_chars (see truncate_sample).
+        """
+        chosen = []
+        best = None
+        budget = max_chars
+        for name, _score in self.rank(query):
+            if len(chosen) >= top_k:
+                break
+            chars = self.docs[name]["chars"]
+            if chars == 0:
+                continue
+            best = best or name
+            if chars > budget:
+                continue
+            chosen.append(self.samples_dir / name)
+            budget -= chars
+        if not chosen and best and top_k > 0 and max_chars > 0:
+            chosen.append(self.samples_dir / best)
+        return chosen
+
+
+def truncate_sample(content: str, max_chars: int) -> str:
+    """Cut a sample to max_chars, at a line break when one is in the second half."""
+    if len(content) <= max_chars:
+        return content
+    cut = content[:max_chars]
+    line_end = cut.rfind("\n")
+    return cut[:line_end] if line_end > max_chars // 2 else cut
+
+
+def select_samples(query: str, reader: Callable[[Path], str],
+                   top_k: Optional[int] = None,
+                   max_chars: Optional[int] = None) -> list[Path]:
+    """Select the sample files most relevant to the query from the configured samples folder."""
+    index = SampleIndex(config.SAMPLES_DIR, config.SAMPLE_INDEX_FILE, reader).refresh()
+    return index.select(
+        query,
+        top_k=config.SAMPLE_TOP_K if top_k is None else top_k,
+        max_chars=config.SAMPLE_MAX_CHARS if max_chars is None else max_chars,
+    )
@@ -0,0 +1,261 @@
+"""Full-text search across sessions and archived minutes.
+
+An SQLite FTS5 index (data/search.sqlite) of every transcript chunk,
+minutes file, and the org archives in SEARCH_ARCHIVE_DIRS (e.g.
+OCPC/*/minutes/, KCS/minutes/). Each indexed row is one line with the
+wall-clock time it belongs to, so a hit reads:
+
+    20260210_193400  2026-02-10  7:52 PM  transcript  ...we [voted] on the [roof] budget...
+
+Transcript chunks and minutes are indexed as they are committed; anything
+else (archives, files edited by hand, sessions from before the index) is
+picked up by refresh(), which only re-reads files whose size or mtime
+changed. Like the catalog, indexing never interrupts the pipeline.
+"""
+
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+import config
+
+TRANSCRIPT = "transcript"
+MINUTES = "minutes"
+ARCHIVE = "archive"
+
+_WALL_TIME = re.compile(r"[\[(](\d{1,2}:\d{2}) ?([AP]M)[\])]", re.I)
+_SPEAKER_LINE = re.compile(r"^Speaker \d+ \| (\d+(?::\d+)+)\s*$")
+_FILE_CLOCK = re.compile(r"^(\d{1,2})_(\d{2})_(am|pm)", re.I)
+_SESSION_DATE = re.compile(r"^(\d{4})(\d{2})(\d{2})_\d{6}")
+_FOLDER_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# Line rowids are (doc id << DOC_SHIFT) + line number, so a document's lines
+# are one rowid range and re-indexing it never scans the whole table
+DOC_SHIFT = 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    path TEXT UNIQUE NOT NULL,
+    kind TEXT NOT NULL,
+    session TEXT NOT NULL,
+    date TEXT,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS lines USING fts5(
+    text, time UNINDEXED, doc UNINDEXED, tokenize = 'porter unicode61'
+);
+"""
+
+
+def _line_times(path: Path, text: str) -> list[tuple[str, str]]:
+    """(wall time, line) for each non-empty line; the time carries forward from the last one seen."""
+    current = ""
+    # OCPC-style exports: "Speaker N | mm:ss" offsets from a clock in the file name
+    clock = _FILE_CLOCK.match(path.name)
+    base = ((int(clock[1]) % 12 + (12 if clock[3].lower() == "pm" else 0)) * 60 + int(clock[2])) if clock else None
+
+    rows = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("--- Chunk"):
+            continue
+        speaker = _SPEAKER_LINE.match(line)
+        if speaker:
+            if base is not None:
+                parts = [int(p) for p in speaker[1].split(":")]
+                minutes = base + (parts[-3] * 60 if len(parts) > 2 else 0) + parts[-2]
+                hour, minute = divmod(minutes % 1440, 60)
+                current = f"{hour % 12 or 12}:{minute:02d} {'PM' if hour >= 12 else 'AM'}"
+            continue
+        wall = _WALL_TIME.search(line)
+        if wall:
+            current = f"{wall[1]} {wall[2].upper()}"
+        rows.append((current, line))
+    return rows
+
+
+def describe(path: Path) -> Optional[tuple[str, str, Optional[str]]]:
+    """(kind, session, date) for an indexable file, or None."""
+    path = path.resolve()
+    transcripts, minutes = config.TRANSCRIPTS_DIR.resolve(), config.MINUTES_DIR.resolve()
+    if path.parent.parent == transcripts and path.name.startswith("chunk_") and path.suffix == ".txt":
+        session = path.parent.name
+    elif path.parent == minutes and path.suffix == ".md":
+        session = path.stem[:15]
+    else:
+        for root in config.SEARCH_ARCHIVE_DIRS:
+            root = root.resolve()
+            if root in path.parents and path.suffix in (".md", ".txt"):
+                # OCPC/2026-01-13/minutes/x.md -> "OCPC 2026-01-13"; KCS/minutes/x.md -> its stem
+                rel = path.relative_to(root.parent)
+                dated = [p for p in rel.parts[:-1] if _FOLDER_DATE.fullmatch(p)]
+                session = f"{rel.parts[0]} {dated[0]}" if dated else path.stem
+                return ARCHIVE, session, dated[0] if dated else None
+        return None
+
+    m = _SESSION_DATE.match(session)
+    date = f"{m[1]}-{m[2]}-{m[3]}" if m else None
+    return (TRANSCRIPT if path.parent.parent == transcripts else MINUTES), session, date
+
+
+class SearchIndex:
+    """SQLite FTS5 index of transcript and minutes lines."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or config.SEARCH_INDEX_FILE
+        self._lock = threading.Lock()
+        config.ensure_dir(self.path.parent)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def index_file(self, path: Path) -> bool:
+        """(Re)index one file. Returns False if it isn't an indexable source. Never raises."""
+        try:
+            info = describe(path)
+            if info is None or not path.exists():
+                return False
+            kind, session, date = info
+            stat = path.stat()
+            rows = _line_times(path, path.read_text(errors="replace"))
+            with self._lock, self._conn:
+                self._delete(str(path.resolve()))
+                doc = self._conn.execute(
+                    "INSERT INTO docs(path, kind, session, date, size, mtime) VALUES (?, ?, ?, ?, ?, ?)",
+                    (str(path.resolve()), kind, session, date, stat.st_size, stat.st_mtime)
+                ).lastrowid
+                self._conn.executemany("INSERT INTO lines(rowid, text, time, doc) VALUES (?, ?, ?, ?)",
+                                       [((doc << DOC_SHIFT) + i, line, time, doc)
+                                        for i, (time, line) in enumerate(rows[:1 << DOC_SHIFT])])
+            return True
+        except Exception as e:
+            print(f"  [Warning] Could not index {path.name}: {e}")
+            return False
+
+    def _delete(self, path: str):
+        row = self._conn.execute("SELECT id FROM docs WHERE path = ?", (path,)).fetchone()
+        if row:
+            self._conn.execute("DELETE FROM lines WHERE rowid BETWEEN ? AND ?",
+                               (row[0] << DOC_SHIFT, ((row[0] + 1) << DOC_SHIFT) - 1))
+            self._conn.execute("DELETE FROM docs WHERE id = ?", (row[0],))
+
+    def sources(self) -> list[Path]:
+        """Every file the index should cover."""
+        files = []
+        if config.TRANSCRIPTS_DIR.exists():
+            files += config.TRANSCRIPTS_DIR.glob("*/chunk_*.txt")
+        if config.MINUTES_DIR.exists():
+            files += config.MINUTES_DIR.glob("*.md")
+        for root in config.SEARCH_ARCHIVE_DIRS:
+            if root.exists():
+                files += [p for p in root.rglob("*") if p.suffix in (".md", ".txt")
+                          and p.parent.name in ("minutes", "transcript", "transcripts")]
+        return files
+
+    def refresh(self) -> int:
+        """Index new or changed sources and drop vanished ones. Returns files (re)indexed."""
+        with self._lock:
+            known = {path: (size, mtime) for path, size, mtime in
+                     self._conn.execute("SELECT path, size, mtime FROM docs").fetchall()}
+        seen, changed = set(), 0
+        for path in self.sources():
+            key = str(path.resolve())
+            seen.add(key)
+            stat = path.stat()
+            if known.get(key) != (stat.st_size, stat.st_mtime):
+                changed += self.index_file(path)
+        gone = set(known) - seen
+        if gone:
+            with self._lock, self._conn:
+                for path in gone:
+                    self._delete(path)
+        return changed
+
+    def search(self, query: str, session: Optional[str] = None, kind: Optional[str] = None,
+               limit: int = 20) -> list[dict]:
+        """Best-matching lines, each with session, date, wall time and a highlighted snippet."""
+        sql = """
+            SELECT d.session, d.date, l.time, d.kind, d.path,
+                   snippet(lines, 0, '[', ']', '...', 16) AS snippet
+            FROM lines l JOIN docs d ON d.id = l.doc
+            WHERE lines MATCH ?
+        """
+        params: list = []
+        if session:
+            sql += " AND d.session LIKE ?"
+            params.append(f"%{session}%")
+        if kind:
+            sql += " AND d.kind = ?"
+            params.append(kind)
+        sql += " ORDER BY bm25(lines) LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            try:
+                cursor = self._conn.execute(sql, [query] + params)
+            except sqlite3.OperationalError:
+                # Not valid FTS syntax (stray quotes, colons...): search the words literally
+                words = " ".join('"' + w.replace('"', '""') + '"' for w in query.split())
+                cursor = self._conn.execute(sql, [words] + params)
+            names = [d[0] for d in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def stats(self) -> dict:
+        with self._lock:
+            docs = dict(self._conn.execute("SELECT kind, COUNT(*) FROM docs GROUP BY kind").fetchall())
+            lines = self._conn.execute("SELECT COUNT(*) FROM lines").fetchone()[0]
+        return {"docs": docs, "lines": lines}
+
+
+_shared: Optional[SearchIndex] = None
+_shared_lock = threading.Lock()
+
+
+def get() -> Optional[SearchIndex]:
+    """The process-wide index, or None when disabled or unavailable."""
+    global _shared
+    if not config.SEARCH_INDEX_ENABLED:
+        return None
+    with _shared_lock:
+        if _shared is None:
+            try:
+                _shared = SearchIndex()
+            except Exception as e:
+                print(f"  [Warning] Search index unavailable: {e}")
+                return None
+        return _shared
+
+
+def index_file(path: Path):
+    """Index a file as it is committed (no-op when the index is disabled)."""
+    index = get()
+    if index:
+        index.index_file(path)
+
+
+def print_search(query: str, session: Optional[str] = None, kind: Optional[str] = None, limit: int = 20):
+    """Refresh the index, then print the best hits for a query."""
+    import time
+
+    index = get()
+    if index is None:
+        print("Search index is disabled (SEARCH_INDEX_ENABLED in config.py).")
+        return
+    started = time.perf_counter()
+    changed = index.refresh()
+    refreshed = time.perf_counter()
+    hits = index.search(query, session, kind, limit)
+    elapsed_ms = 1000 * (time.perf_counter() - refreshed)
+
+    if not hits:
+        print(f"No matches for {query!r}.")
+    for hit in hits:
+        print(f"{hit['session'][:28]:<28} {hit['date'] or '':<10} {hit['time'] or '':>8}  "
+              f"{hit['kind']:<10} {hit['snippet']}")
+    note = f", {changed} file(s) re-indexed in {1000 * (refreshed - started):.0f} ms" if changed else ""
+    print(f"\n{len(hits)} hit(s) in {elapsed_ms:.1f} ms{note}")
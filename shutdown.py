@@ -0,0 +1,211 @@
+"""Deadline-based shutdown for the interactive recorders.
+
+Each cut chunk is processed on its own background thread (transcription,
+then the minutes update). On quit, the final chunk joins them and the
+coordinator waits for all of them against one deadline,
+SHUTDOWN_DEADLINE_SECONDS from the moment recording stopped, instead of
+processing the last chunk in the foreground and then joining each thread
+for up to two minutes in turn.
+
+Whatever is unfinished at the deadline (or on a second Ctrl+C) is written
+to data/{session}_pending_jobs.json, one job per chunk:
+
+    {"chunk": 7, "stage": "transcribe", "audio": ".../chunk_0007.wav", "chunk_start": "...", ...}
+    {"chunk": 6, "stage": "minutes", "text": "[7:52 PM] ...", ...}
+
+The session's running whisper processes are stopped and the threads are
+abandoned: a minutes update already waiting on the API at the deadline is
+discarded when it returns, since the minutes are finalized by then.
+`process-queue` and `resume` pick the jobs up: chunks still to transcribe
+are transcribed, and every chunk's transcript goes through the offline
+queue into the minutes.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+import config
+
+TRANSCRIBE = "transcribe"
+MINUTES = "minutes"
+
+_JOBS_SUFFIX = "_pending_jobs.json"
+
+
+def jobs_file(session_id: str) -> Path:
+    return config.DATA_DIR / f"{session_id}{_JOBS_SUFFIX}"
+
+
+def load_jobs(session_id: str) -> list[dict]:
+    path = jobs_file(session_id)
+    if not path.exists():
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_jobs(session_id: str, jobs: list[dict]):
+    """Write a session's jobs atomically (or remove the file when there are none)."""
+    path = jobs_file(session_id)
+    if not jobs:
+        if path.exists():
+            path.unlink()
+        return
+    config.ensure_dir(path.parent)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(sorted(jobs, key=lambda job: job["chunk"]), f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def pending_sessions() -> list[str]:
+    """Sessions with jobs left over from a shutdown."""
+    return sorted(p.name[:-len(_JOBS_SUFFIX)] for p in config.DATA_DIR.glob(f"*{_JOBS_SUFFIX}"))
+
+
+class ShutdownCoordinator:
+    """Runs chunk jobs in the background and bounds how long quitting waits for them."""
+
+    def __init__(self, session_id: str, deadline_seconds: float = config.SHUTDOWN_DEADLINE_SECONDS):
+        self.session_id = session_id
+        self.deadline_seconds = deadline_seconds
+        self._lock = threading.Lock()
+        self._jobs: dict[int, dict] = {}  # Unfinished jobs by chunk number
+        self._threads: dict[int, threading.Thread] = {}
+        self._handed_off: set[int] = set()
+        self.stop = threading.Event()  # Give it to the session's Transcriber; set at the deadline
+
+    def start(self, target: Callable[..., None], chunk_path: Path, chunk_num: int,
+              chunk_start: Optional[datetime], pcm: Optional[bytes] = None):
+        """Run target(chunk_path, chunk_num, chunk_start, pcm) on a tracked background thread."""
+        with self._lock:
+            self._jobs[chunk_num] = {
+                "chunk": chunk_num,
+                "stage": TRANSCRIBE,
+                "audio": str(chunk_path),
+                "chunk_start": chunk_start.isoformat() if chunk_start else None,
+                "timestamp": datetime.now().isoformat(),
+            }
+
+        def run():
+            try:
+                target(chunk_path, chunk_num, chunk_start, pcm)
+            finally:
+                with self._lock:
+                    self._jobs.pop(chunk_num, None)
+
+        # Daemon: a job still running at the deadline is persisted, not waited for
+        thread = threading.Thread(target=run, name=f"chunk-{chunk_num}", daemon=True)
+        self._threads[chunk_num] = thread
+        thread.start()
+
+    def transcribed(self, chunk_num: int, text: str) -> bool:
+        """
+        Note that a chunk is transcribed and only its minutes update is left.
+        Returns False once the chunk has been handed off at shutdown, in which
+        case the caller should stop (process-queue will do the update).
+        """
+        with self._lock:
+            if chunk_num in self._handed_off:
+                return False
+            job = self._jobs.get(chunk_num)
+            if job is not None:
+                job.update(stage=MINUTES, text=text)
+            return True
+
+    def abandoned(self, chunk_num: int) -> bool:
+        """Whether a chunk was handed off at shutdown; its thread must not save anything more."""
+        with self._lock:
+            return chunk_num in self._handed_off
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._jobs)
+
+    def shutdown(self, notify: Callable[[str], None] = print) -> list[dict]:
+        """
+        Wait for running jobs until the deadline, then persist the rest.
+        Returns the persisted jobs (empty when everything finished).
+        """
+        deadline = time.monotonic() + self.deadline_seconds
+        if self.pending():
+            notify(f"⏳ Finishing {self.pending()} chunk(s) (up to {self.deadline_seconds:g}s)...")
+        try:
+            for thread in list(self._threads.values()):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                thread.join(timeout=remaining)
+        except KeyboardInterrupt:
+            pass  # Second Ctrl+C: stop waiting, keep the work
+
+        with self._lock:
+            unfinished = [dict(job) for job in self._jobs.values()]
+            self._handed_off.update(self._jobs)
+        unfinished = [job for job in unfinished if job["stage"] == TRANSCRIBE or job.get("text")]
+        if not unfinished:
+            return []
+
+        from transcriber import stop_running
+        stop_running(self.stop)
+
+        try:
+            jobs = {job["chunk"]: job for job in load_jobs(self.session_id)}
+            jobs.update({job["chunk"]: job for job in unfinished})
+            save_jobs(self.session_id, list(jobs.values()))
+            notify(f"📦 {len(unfinished)} unfinished chunk(s) saved to {jobs_file(self.session_id).name}; "
+                   f"run process-queue to finish them")
+        except Exception as e:
+            notify(f"[Warning] Could not save unfinished chunks: {e}; run resume {self.session_id}")
+        return unfinished
+
+
+def resume_jobs(session_id: str, model: str = config.WHISPER_MODEL) -> int:
+    """
+    Move a session's leftover jobs into its offline queue, transcribing the
+    chunks that never were. Returns the number of jobs moved; jobs that fail
+    to transcribe stay in the file.
+    """
+    jobs = load_jobs(session_id)
+    if not jobs:
+        return 0
+
+    from minutes_generator import OfflineMinutesStore
+    from transcriber import Transcriber, TranscriptManager
+
+    store = OfflineMinutesStore(session_id)
+    queue = store.load_queue()
+    queued = {item.get("chunk") for item in queue}
+    transcriber, remaining, moved = None, [], 0
+
+    for job in sorted(jobs, key=lambda job: job["chunk"]):
+        text = job.get("text", "")
+        if job["stage"] == TRANSCRIBE:
+            transcriber = transcriber or Transcriber(model=model)
+            start = datetime.fromisoformat(job["chunk_start"]) if job.get("chunk_start") else None
+            result = transcriber.transcribe(Path(job["audio"]), output_dir=config.TRANSCRIPTS_DIR / session_id,
+                                            chunk_start_time=start)
+            if result.get("error"):
+                print(f"  ❌ Chunk {job['chunk']}: {result['error'][:100]}")
+                remaining.append(job)
+                continue
+            text = (result.get("timestamped_text") or result.get("text", "")).strip()
+            if text:
+                TranscriptManager(session_id).append(text, job["chunk"])
+        if text and job["chunk"] not in queued:
+            queue.append({"chunk": job["chunk"], "text": text, "timestamp": job["timestamp"],
+                          "reason": "shutdown"})
+        moved += 1
+
+    if moved and queue:
+        queue.sort(key=lambda item: item.get("chunk", -1))
+        store.save_queue(queue)
+    save_jobs(session_id, remaining)
+    return moved
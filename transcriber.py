@@ -2,11 +2,38 @@
 
 import subprocess
 import re
+import threading
+import time
+import wave
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Optional
 
 import config
+import live_feed
+import metrics
+import profiler
+
+
+# whisper-cli processes in flight -> the stop event of the transcriber that started them
+_running: dict[subprocess.Popen, Optional[threading.Event]] = {}
+_running_lock = threading.Lock()
+
+
+def stop_running(stop: threading.Event):
+    """
+    Set stop and kill the whisper-cli processes started under it (shutdown
+    deadline passed). Transcribers sharing that event start no more; other
+    sessions in the process are unaffected.
+    """
+    with _running_lock:
+        stop.set()
+        processes = [process for process, owner in _running.items() if owner is stop]
+    for process in processes:
+        try:
+            process.kill()
+        except OSError:
+            pass
 
 
 def parse_whisper_timestamp(ts_str: str) -> timedelta:
@@ -23,8 +50,59 @@ def format_wall_time(base_time: datetime, offset: timedelta) -> str:
     actual_time = base_time + offset
     return actual_time.strftime("%-I:%M %p")
 
+def wav_duration(path: Path) -> float:
+    """Duration of a WAV file in seconds (0.0 if unreadable)."""
+    try:
+        with wave.open(str(path), "rb") as w:
+            return w.getnframes() / float(w.getframerate() or 1)
+    except Exception:
+        return 0.0
+
+
+def session_metrics(audio_path: Path) -> metrics.NullMetrics:
+    """Metrics sink for a chunk recorded under data/audio/{session}/."""
+    if audio_path.parent.parent == config.AUDIO_DIR:
+        return metrics.for_session(audio_path.parent.name)
+    return metrics.NULL_METRICS
+
+_SEGMENT_RE = re.compile(r'\[(\d+:\d+:\d+\.\d+) --> (\d+:\d+:\d+\.\d+)\]\s*(.*)')
+
+
+def parse_whisper_output(stdout: str, chunk_start_time: Optional[datetime] = None
+                         ) -> tuple[list[str], list[str], list[tuple[str, str, str]]]:
+    """
+    Parse whisper-cli output into (text_lines, timestamped_lines, segments).
+
+    whisper-cpp outputs lines like:
+    [00:00:00.000 --> 00:00:02.980]   Test, test, one, two, three.
+    """
+    text_lines = []
+    timestamped_lines = []
+    segments = []
+
+    for line in stdout.split("\n"):
+        match = _SEGMENT_RE.match(line)
+        if match:
+            start_ts = match.group(1)
+            end_ts = match.group(2)
+            text_content = match.group(3).strip()
+
+            if text_content:
+                text_lines.append(text_content)
+
+                # Convert to wall clock time if we have a start time
+                if chunk_start_time:
+                    wall_time = format_wall_time(chunk_start_time, parse_whisper_timestamp(start_ts))
+                    timestamped_lines.append(f"[{wall_time}] {text_content}")
+                else:
+                    timestamped_lines.append(f"[{start_ts}] {text_content}")
+
+                segments.append((start_ts, end_ts, text_content))
+
+    return text_lines, timestamped_lines, segments
+
 # Model path for whisper-cpp ggml models
-WHISPER_CPP_MODEL_DIR = Path.home() / ".cache" / "whisper-cpp"
+WHISPER_CPP_MODEL_DIR = config.WHISPER_MODEL_DIR
 
 # Map friendly names to ggml model files
 MODEL_MAP = {
@@ -39,16 +117,20 @@ MODEL_MAP = {
 class Transcriber:
     """Transcribes audio files using whisper-cpp."""
 
-    def __init__(self, model: str = config.WHISPER_MODEL):
+    def __init__(self, model: str = config.WHISPER_MODEL, threads: Optional[int] = config.WHISPER_THREADS,
+                 stop: Optional[threading.Event] = None):
         self.model = model
+        self.threads = threads
+        self.stop = stop  # Set by stop_running() at a shutdown deadline
         self.transcripts_dir = config.TRANSCRIPTS_DIR
-        self.model_path = WHISPER_CPP_MODEL_DIR / MODEL_MAP.get(model, f"ggml-{model}.bin")
+        self.model_path = config.WHISPER_MODEL_DIR / MODEL_MAP.get(model, f"ggml-{model}.bin")
 
     def transcribe(
         self,
         audio_path: Path,
         output_dir: Optional[Path] = None,
-        chunk_start_time: Optional[datetime] = None
+        chunk_start_time: Optional[datetime] = None,
+        pcm: Optional[bytes] = None
     ) -> dict:
         """
         Transcribe an audio file using whisper-cpp CLI.
@@ -57,6 +139,8 @@ class Transcriber:
             audio_path: Path to the audio file
             output_dir: Where to save transcript files
             chunk_start_time: When this chunk started recording (for wall clock times)
+            pcm: The chunk's raw samples from capture.PcmCapture; piped to whisper-cli
+                 over stdin instead of reading audio_path (which names the outputs)
 
         Returns dict with:
             - 'text': Plain text transcript
@@ -71,22 +155,23 @@ class Transcriber:
         if not self.model_path.exists():
             return {"text": "", "timestamped_text": "", "segments": [], "error": f"Model not found: {self.model_path}"}
 
-        cmd = [
-            "whisper-cli",
-            "-m", str(self.model_path),
-            "-f", str(audio_path),
-            "-l", config.WHISPER_LANGUAGE,
-        ]
-
         print(f"Transcribing: {audio_path.name} (model: {self.model})")
 
+        import archiver
+        import capture
+        started = time.perf_counter()
+        handoff = pcm is not None and config.PCM_HANDOFF
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minute timeout
-            )
+            if handoff:
+                # Straight from the capture buffer, no WAV round trip
+                result = self._run_whisper("-", capture.wav_bytes(pcm))
+                if result.returncode != 0 and audio_path.exists():
+                    print(f"  [Warning] whisper-cli failed on stdin, retrying from {audio_path.name}")
+                    handoff = False
+            if not handoff:
+                # Archived chunks are decoded to a temporary WAV first
+                with archiver.open_wav(audio_path) as wav_path:
+                    result = self._run_whisper(str(wav_path))
 
             if result.returncode != 0:
                 print(f"  Warning: {result.stderr[:200]}")
@@ -94,40 +179,28 @@ class Transcriber:
 
         except subprocess.TimeoutExpired:
             return {"text": "", "timestamped_text": "", "segments": [], "error": "Transcription timed out"}
+        except RuntimeError as e:
+            return {"text": "", "timestamped_text": "", "segments": [], "error": str(e)}
 
-        # Parse output - whisper-cpp outputs lines like:
-        # [00:00:00.000 --> 00:00:02.980]   Test, test, one, two, three.
-        text_lines = []
-        timestamped_lines = []
-        segments = []
-
-        for line in result.stdout.split("\n"):
-            match = re.match(r'\[(\d+:\d+:\d+\.\d+) --> (\d+:\d+:\d+\.\d+)\]\s*(.*)', line)
-            if match:
-                start_ts = match.group(1)
-                end_ts = match.group(2)
-                text_content = match.group(3).strip()
-
-                if text_content:
-                    text_lines.append(text_content)
-
-                    # Parse timestamps
-                    start_offset = parse_whisper_timestamp(start_ts)
-                    end_offset = parse_whisper_timestamp(end_ts)
-
-                    # Convert to wall clock time if we have a start time
-                    if chunk_start_time:
-                        wall_time = format_wall_time(chunk_start_time, start_offset)
-                        timestamped_lines.append(f"[{wall_time}] {text_content}")
-                    else:
-                        timestamped_lines.append(f"[{start_ts}] {text_content}")
-
-                    segments.append((start_ts, end_ts, text_content))
+        with profiler.stage("transcribe.parse"):
+            text_lines, timestamped_lines, segments = parse_whisper_output(result.stdout, chunk_start_time)
 
         text = " ".join(text_lines)
         timestamped_text = "\n".join(timestamped_lines)
         print(f"  Done: {len(text)} chars")
 
+        sink = session_metrics(audio_path)
+        if sink.enabled:
+            elapsed = time.perf_counter() - started
+            audio_seconds = capture.pcm_seconds(pcm) if pcm is not None else archiver.audio_seconds(audio_path)
+            sink.timing(
+                metrics.TRANSCRIBE, elapsed,
+                chunk=audio_path.stem, model=self.model,
+                audio_seconds=round(audio_seconds, 2),
+                rtf=round(elapsed / audio_seconds, 4) if audio_seconds else None,
+                segments=len(segments), chars=len(text),
+            )
+
         # Save transcript to file
         txt_output = output_dir / f"{audio_path.stem}.txt"
         with open(txt_output, "w") as f:
@@ -139,9 +212,45 @@ class Transcriber:
             "segments": segments
         }
 
+    def _run_whisper(self, source: str, stdin: Optional[bytes] = None) -> subprocess.CompletedProcess:
+        """Run whisper-cli on a WAV path, or on WAV bytes piped to stdin with source "-"."""
+        cmd = [
+            config.WHISPER_CLI,
+            "-m", str(self.model_path),
+            "-f", source,
+            "-l", config.WHISPER_LANGUAGE,
+        ]
+        if self.threads:
+            cmd += ["-t", str(self.threads)]
+
+        with profiler.stage("transcribe.whisper"):
+            with _running_lock:
+                if self.stop is not None and self.stop.is_set():
+                    raise RuntimeError("Stopped at shutdown")
+                process = subprocess.Popen(
+                    cmd,
+                    stdin=subprocess.PIPE if stdin is not None else None,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                )
+                _running[process] = self.stop
+            try:
+                stdout, stderr = process.communicate(input=stdin, timeout=300)  # 5 minute timeout
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.communicate()
+                raise
+            finally:
+                with _running_lock:
+                    _running.pop(process, None)
+        return subprocess.CompletedProcess(cmd, process.returncode,
+                                           stdout.decode(errors="replace"),
+                                           stderr.decode(errors="replace"))
+
     def transcribe_session(self, session_dir: Path) -> str:
         """Transcribe all chunks in a session directory."""
-        chunks = sorted(session_dir.glob("chunk_*.wav"))
+        import archiver
+        chunks = archiver.session_chunks(session_dir)
         all_text = []
 
         for chunk in chunks:
@@ -165,18 +274,28 @@ class TranscriptManager:
 
     def append(self, text: str, chunk_number: int):
         """Append new transcript text."""
+        import catalog
+        import search_index
+        started = time.perf_counter()
         timestamp = datetime.now().strftime("%H:%M:%S")
-        header = f"\n\n--- Chunk {chunk_number} [{timestamp}] ---\n"
+        header = f"\n--- Chunk {chunk_number} [{timestamp}] ---\n"
 
+        # Every chunk ends its last line, so a reader can tell a line still being written
         with open(self.transcript_file, "a") as f:
-            f.write(header + text)
+            f.write(header + text.rstrip("\n") + "\n")
 
         # Also save individual chunk file
         chunk_file = self.session_dir / f"chunk_{chunk_number:04d}.txt"
         with open(chunk_file, "w") as f:
             f.write(text)
+        search_index.index_file(chunk_file)
 
         self.chunks_processed += 1
+        catalog.get().chunk_transcribed(self.session_id, chunk_number, len(text))
+        live_feed.publish(self.session_id)
+        metrics.for_session(self.session_id).timing(
+            metrics.COMMIT, time.perf_counter() - started, chunk=chunk_number, chars=len(text)
+        )
         print(f"  Transcript updated: {self.transcript_file}")
 
     def get_full_transcript(self) -> str:
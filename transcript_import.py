@@ -0,0 +1,365 @@
+"""Minutes from existing transcripts, without audio.
+
+`import-transcript <file or folder>` reads transcripts made by other tools
+and feeds them through the normal minutes pipeline, skipping Whisper
+entirely. Each format has a parser that streams Segments from the file's
+lines, so a long transcript is never held in memory:
+
+- speaker:    "Speaker 1 | 01:03" headers over paragraphs (OCPC exports;
+              a "7_34_pm_..." file name gives the wall clock)
+- timestamped: this bot's own "[7:52 PM] text" lines and whisper-cli
+              "[00:00:01.000 --> 00:00:04.000] text" output
+- vtt / srt:  subtitle cues (Zoom, Teams, YouTube...); cues that run on
+              mid-sentence are joined
+- plain:      anything else, one segment per line, untimed
+
+Parsers are tried in PARSERS order on the first lines of each file;
+register() adds one. Segments become the same "[h:mm PM] text" lines the
+Transcriber produces and are cut into batches of CHUNK_DURATION_SECONDS of
+meeting time (at most IMPORT_BATCH_MAX_CHARS each). Every batch is
+committed like a recorded chunk (transcript files, search index, catalog)
+and sent through MinutesGenerator, queueing offline as usual.
+"""
+
+import re
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import chain, islice
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+import config
+
+SNIFF_LINES = 20  # Lines read to detect a file's format
+
+_FILE_CLOCK = re.compile(r"^(\d{1,2})_(\d{2})_(am|pm)", re.I)
+_FOLDER_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_SENTENCE_END = re.compile(r"[.!?…\"')\]]$")
+
+
+@dataclass
+class Segment:
+    start: Optional[float]  # Seconds since midnight if wall, else into the recording; None if untimed
+    text: str
+    speaker: Optional[str] = None
+    wall: bool = False
+
+
+def _seconds(stamp: str) -> float:
+    """Seconds in "01:03", "1:02:03", "00:01:02.500" or "00:01:02,500"."""
+    total = 0.0
+    for part in stamp.replace(",", ".").split(":"):
+        total = total * 60 + float(part)
+    return total
+
+
+def _clock(hour: int, minute: int, meridiem: str) -> int:
+    return ((hour % 12) + (12 if meridiem.upper() == "PM" else 0)) * 3600 + minute * 60
+
+
+class TranscriptParser(ABC):
+    """One transcript format: detection from the first lines, then streaming segments."""
+
+    name = ""
+    suffixes: tuple[str, ...] = ()
+
+    @abstractmethod
+    def sniff(self, head: list[str]) -> bool:
+        """Whether the first lines of a file look like this format."""
+
+    @abstractmethod
+    def parse(self, lines: Iterable[str]) -> Iterator[Segment]:
+        """Segments of the transcript, in order."""
+
+
+class SpeakerParser(TranscriptParser):
+    name = "speaker"
+    _HEADER = re.compile(r"^(.{1,60}?)\s*\|\s*(\d+(?::\d{2}){1,2})\s*$")
+
+    def sniff(self, head):
+        return any(self._HEADER.match(line.strip()) for line in head)
+
+    def parse(self, lines):
+        start, speaker = None, None
+        for line in lines:
+            line = line.strip()
+            header = self._HEADER.match(line)
+            if header:
+                speaker, start = header[1], _seconds(header[2])
+            elif line:
+                yield Segment(start, line, speaker)
+
+
+class TimestampedParser(TranscriptParser):
+    name = "timestamped"
+    suffixes = (".txt",)
+    _WALL = re.compile(r"^\[(\d{1,2}):(\d{2})\s*([AP]M)\]\s*(.*)$", re.I)
+    _WHISPER = re.compile(r"^\[(\d+:\d{2}:\d{2}(?:[.,]\d+)?)\s*-->\s*[^\]]*\]\s*(.*)$")
+    _CHUNK = re.compile(r"^--- Chunk .* ---$")
+
+    def sniff(self, head):
+        return any(self._WALL.match(line.strip()) or self._WHISPER.match(line.strip()) for line in head)
+
+    def parse(self, lines):
+        for line in lines:
+            line = line.strip()
+            if not line or self._CHUNK.match(line):
+                continue
+            wall = self._WALL.match(line)
+            whisper = self._WHISPER.match(line)
+            if wall:
+                yield Segment(_clock(int(wall[1]), int(wall[2]), wall[3]), wall[4], wall=True)
+            elif whisper:
+                yield Segment(_seconds(whisper[1]), whisper[2])
+            else:
+                yield Segment(None, line)
+
+
+class SubtitleParser(TranscriptParser):
+    """Timed cues separated by blank lines; lines outside cues (ids, headers, notes) are skipped."""
+
+    _TIMING = re.compile(r"^((?:\d+:)?\d{1,2}:\d{2}[.,]\d{3})\s*-->\s*((?:\d+:)?\d{1,2}:\d{2}[.,]\d{3})")
+    _VOICE = re.compile(r"^<v(?:\.[^ >]*)?\s+([^>]+)>")
+    _TAG = re.compile(r"<[^>]+>")
+
+    def parse(self, lines):
+        pending: Optional[Segment] = None
+        cue: Optional[Segment] = None
+        for line in chain(lines, [""]):
+            line = line.strip()
+            timing = self._TIMING.match(line)
+            if timing:
+                cue = Segment(_seconds(timing[1]), "")
+            elif cue is not None and line:
+                voice = self._VOICE.match(line)
+                if voice:
+                    cue.speaker = voice[1].strip()
+                text = self._TAG.sub("", line).strip()
+                if text:
+                    cue.text = f"{cue.text} {text}".strip()
+            elif cue is not None:
+                # End of cue: join it onto the previous one if that stopped mid-sentence
+                if cue.text:
+                    if pending and pending.speaker == cue.speaker and not _SENTENCE_END.search(pending.text):
+                        pending.text = f"{pending.text} {cue.text}"
+                    else:
+                        if pending:
+                            yield pending
+                        pending = cue
+                cue = None
+        if pending:
+            yield pending
+
+
+class WebVttParser(SubtitleParser):
+    name = "vtt"
+    suffixes = (".vtt",)
+
+    def sniff(self, head):
+        return bool(head) and head[0].lstrip("﻿").startswith("WEBVTT")
+
+
+class SrtParser(SubtitleParser):
+    name = "srt"
+    suffixes = (".srt",)
+
+    def sniff(self, head):
+        return any("-->" in line and "," in line.split("-->")[0] for line in head)
+
+
+class PlainParser(TranscriptParser):
+    name = "plain"
+
+    def sniff(self, head):
+        return True
+
+    def parse(self, lines):
+        for line in lines:
+            if line.strip():
+                yield Segment(None, line.strip())
+
+
+PARSERS: list[TranscriptParser] = [WebVttParser(), SrtParser(), TimestampedParser(), SpeakerParser(), PlainParser()]
+
+
+def register(parser: TranscriptParser, first: bool = True):
+    """Add a parser; by default it is tried before the built-in ones."""
+    PARSERS.insert(0 if first else len(PARSERS) - 1, parser)
+
+
+def find_parser(name: str) -> TranscriptParser:
+    for parser in PARSERS:
+        if parser.name == name:
+            return parser
+    raise ValueError(f"Unknown transcript format {name!r} (known: {', '.join(p.name for p in PARSERS)})")
+
+
+def read_segments(path: Path, fmt: Optional[str] = None) -> tuple[str, Iterator[Segment]]:
+    """(format name, segments) for one file, detecting the format unless given."""
+    parser = find_parser(fmt) if fmt else None
+    f = open(path, encoding="utf-8", errors="replace")
+    head = list(islice(f, SNIFF_LINES))
+    if parser is None:
+        by_suffix = [p for p in PARSERS if path.suffix.lower() in p.suffixes and p.sniff(head)]
+        parser = (by_suffix or [p for p in PARSERS if p.sniff(head)])[0]
+
+    def stream():
+        with f:
+            yield from parser.parse(chain(head, f))
+
+    return parser.name, stream()
+
+
+def file_clock(path: Path) -> Optional[int]:
+    """Wall clock (seconds since midnight) from a name like "7_34_pm_..._transcript.txt"."""
+    m = _FILE_CLOCK.match(path.name)
+    return _clock(int(m[1]), int(m[2]), m[3]) if m else None
+
+
+def meeting_date(path: Path) -> datetime:
+    """The meeting's date from a YYYY-MM-DD folder in its path, else the file's mtime."""
+    for part in reversed(path.resolve().parts):
+        if _FOLDER_DATE.fullmatch(part):
+            return datetime.strptime(part, "%Y-%m-%d")
+    return datetime.fromtimestamp(path.stat().st_mtime).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def source_files(source: Path) -> list[Path]:
+    """One file, or a folder's transcripts in meeting order (by clock in the name, then name)."""
+    if source.is_file():
+        return [source]
+    files = [p for p in source.iterdir() if p.is_file() and not p.name.startswith(".")]
+    return sorted(files, key=lambda p: (file_clock(p) is None, file_clock(p) or 0, p.name))
+
+
+def timed_lines(files: list[Path], fmt: Optional[str] = None,
+                start: Optional[datetime] = None) -> Iterator[tuple[Optional[datetime], Optional[float], str]]:
+    """
+    Stream (wall time, offset, line) across files. Wall times come from the
+    segments themselves, from start or a clock in the file name plus their
+    offsets; otherwise only the offset is known. Untimed segments inherit the
+    last time seen.
+    """
+    for path in files:
+        name, segments = read_segments(path, fmt)
+        clock = file_clock(path)
+        day = (start or meeting_date(path)).replace(hour=0, minute=0, second=0, microsecond=0)
+        if start is not None:
+            base = start
+        elif clock is not None:
+            base = day + timedelta(seconds=clock)
+        else:
+            base = None
+        print(f"  {path.name}: {name} format")
+
+        wall, offset = None, None
+        for segment in segments:
+            if segment.start is not None:
+                if segment.wall:
+                    wall, offset = day + timedelta(seconds=segment.start), None
+                else:
+                    offset = segment.start
+                    wall = base + timedelta(seconds=offset) if base else None
+            speaker = f"{segment.speaker}: " if segment.speaker else ""
+            yield wall, offset, speaker + segment.text
+
+
+def _format_offset(seconds: float) -> str:
+    """Same form as whisper's segment starts: 00:01:23.456."""
+    hours, rest = divmod(seconds, 3600)
+    return f"{int(hours):02d}:{int(rest // 60):02d}:{rest % 60:06.3f}"
+
+
+def batches(lines: Iterable[tuple[Optional[datetime], Optional[float], str]], chunk_seconds: float,
+            max_chars: int = None) -> Iterator[tuple[Optional[datetime], Optional[datetime], str]]:
+    """Group lines into (first wall time, last wall time, "[h:mm PM] text" lines) batches."""
+    max_chars = max_chars or config.IMPORT_BATCH_MAX_CHARS
+    out: list[str] = []
+    chars, batch_start, first, last = 0, None, None, None
+    for wall, offset, text in lines:
+        position = wall.timestamp() if wall else offset
+        if out and ((position is not None and batch_start is not None and position - batch_start >= chunk_seconds)
+                    or chars + len(text) > max_chars):
+            yield first, last, "\n".join(out)
+            out, chars, batch_start, first = [], 0, None, None
+        if batch_start is None:
+            batch_start = position
+        first, last = first or wall, wall or last
+
+        if wall:
+            out.append(f"[{wall.strftime('%-I:%M %p')}] {text}")
+        elif offset is not None:
+            out.append(f"[{_format_offset(offset)}] {text}")
+        else:
+            out.append(text)
+        chars += len(text) + 1
+    if out:
+        yield first, last, "\n".join(out)
+
+
+def new_session_id(started: datetime) -> str:
+    """Session id from the meeting start, bumped a second if already taken."""
+    while True:
+        session_id = started.strftime("%Y%m%d_%H%M%S")
+        if not (config.TRANSCRIPTS_DIR / session_id).exists() and not (config.AUDIO_DIR / session_id).exists():
+            config.ensure_dir(config.TRANSCRIPTS_DIR / session_id)
+            return session_id
+        started += timedelta(seconds=1)
+
+
+def import_transcript(source: Path, meeting_name: Optional[str] = None, fmt: Optional[str] = None,
+                      chunk_seconds: float = config.CHUNK_DURATION_SECONDS,
+                      start: Optional[datetime] = None) -> Optional[str]:
+    """Turn a transcript file or folder into a session with minutes. Returns the session id."""
+    from minutes_generator import MinutesGenerator, OfflineMinutesStore
+    from transcriber import TranscriptManager
+
+    files = source_files(source)
+    if not files:
+        print(f"No transcript files found in {source}")
+        return None
+    meeting_name = meeting_name or (source.parent.name if source.is_dir() and source.name == "transcript"
+                                    else source.stem)
+    print(f"📥 Importing {len(files)} transcript file(s) from {source}")
+
+    started = time.perf_counter()
+    stream = batches(timed_lines(files, fmt, start), chunk_seconds)
+    first = next(stream, None)
+    if first is None:
+        print("  (no transcript text found)")
+        return None
+
+    session_start = first[0] or start or datetime.now()
+    session_id = new_session_id(session_start)
+    transcript_mgr = TranscriptManager(session_id)
+    gen = MinutesGenerator(meeting_name, session_id=session_id, session_start=session_start)
+    store = OfflineMinutesStore(session_id)
+
+    updated = queued = chars = 0
+    meeting_end = None
+    for chunk, (batch_first, batch_last, text) in enumerate(chain([first], stream)):
+        span = f"{batch_first:%-I:%M %p}-{batch_last:%-I:%M %p}, " if batch_first and batch_last else ""
+        print(f"\nBatch {chunk}: {span}{len(text):,} chars")
+        meeting_end = batch_last or meeting_end
+        chars += len(text)
+
+        transcript_mgr.append(text, chunk)
+        if gen.update_minutes(text, chunk):
+            updated += 1
+        else:
+            queued += 1
+        if gen.offline_queue:
+            gen.process_queue()
+        store.save_queue(gen.offline_queue)
+
+    gen.finalize(ended=meeting_end)
+    if not gen.offline_queue:
+        store.clear()
+
+    covered = f", {(meeting_end - session_start).total_seconds() / 60:.0f} min of meeting" if meeting_end else ""
+    print(f"\n✅ Imported {chunk + 1} batch(es) ({chars:,} chars{covered}) into session {session_id} "
+          f"in {time.perf_counter() - started:.1f}s: {updated} minutes update(s), {queued} queued")
+    print(f"📋 Minutes: {gen.minutes_file}")
+    return session_id
@@ -1,8 +1,6 @@
 """Interactive recorder with real-time audio level display."""
 
-import subprocess
 import sys
-import threading
 import time
 import numpy as np
 from datetime import datetime
@@ -23,7 +21,15 @@ from rich.table import Table
 from rich.text import Text
 from rich import box
 
+import capture
 import config
+import metrics
+import shutdown
+import wav_header
+import pipeline_state
+import profiler
+from pipeline_state import PipelineState
+from transcriber import wav_duration
 
 
 class AudioLevelMonitor:
@@ -37,12 +43,13 @@ class AudioLevelMonitor:
 
     def _audio_callback(self, indata, frames, time_info, status):
         """Called by sounddevice for each audio block."""
-        # Calculate RMS level
-        rms = np.sqrt(np.mean(indata**2))
-        self.level = min(rms * 10, 1.0)  # Scale and cap at 1.0
-        self.peak = max(self.peak, self.level)
-        # Decay peak slowly
-        self.peak = max(self.peak * 0.95, self.level)
+        with profiler.stage("ui.audio_callback"):
+            # Calculate RMS level
+            rms = np.sqrt(np.mean(indata**2))
+            self.level = min(rms * 10, 1.0)  # Scale and cap at 1.0
+            self.peak = max(self.peak, self.level)
+            # Decay peak slowly
+            self.peak = max(self.peak * 0.95, self.level)
 
     def start(self):
         """Start monitoring audio levels."""
@@ -73,28 +80,31 @@ class AudioLevelMonitor:
 class UIRecorder:
     """Interactive recorder with rich terminal UI."""
 
-    def __init__(self, on_chunk_ready: Optional[Callable[[Path, int, datetime], None]] = None):
+    def __init__(self, on_chunk_ready: Optional[Callable[..., None]] = None,
+                 pipeline: Optional[PipelineState] = None,
+                 key_source: Optional[Callable[[Optional[float]], Optional[str]]] = None):
         """
         Args:
-            on_chunk_ready: Callback with (audio_path, chunk_number, chunk_start_time)
+            on_chunk_ready: Callback with (audio_path, chunk_number, chunk_start_time, pcm)
+            pipeline: Shared stage tracker; the callback reports its progress here
+            key_source: Reads one key within a timeout instead of the terminal (headless replay)
         """
         self.on_chunk_ready = on_chunk_ready
+        self.key_source = key_source
+        self.pipeline = pipeline or PipelineState()
         self.session_start_time = datetime.now()
         self.session_id = self.session_start_time.strftime("%Y%m%d_%H%M%S")
         self.session_dir = config.AUDIO_DIR / self.session_id
         self.session_dir.mkdir(parents=True, exist_ok=True)
+        self.metrics = metrics.for_session(self.session_id)
         self.chunk_start_time: Optional[datetime] = None  # When current chunk started
 
         self.chunk_number = 0
-        self.recording_process: Optional[subprocess.Popen] = None
-        self.backup_process: Optional[subprocess.Popen] = None
-        self.backup_file: Optional[Path] = None
+        self.backup_file = self.session_dir / "full_session_backup.wav"
         self.running = False
-        self._processing_threads: list[threading.Thread] = []
-        self._pending_chunks = 0
-        self._completed_chunks = 0
-        self._last_transcript = ""
-        self._status_message = ""
+        self.jobs = shutdown.ShutdownCoordinator(self.session_id)  # Background chunk processing
+        self.checkpointer = wav_header.HeaderCheckpointer()  # Keeps headers valid if we crash mid-recording
+        self.capture = capture.PcmCapture(self.backup_file, self.checkpointer)
 
         self.console = Console()
         self.level_monitor = AudioLevelMonitor()
@@ -102,70 +112,100 @@ class UIRecorder:
     def _get_chunk_path(self) -> Path:
         return self.session_dir / f"chunk_{self.chunk_number:04d}.wav"
 
-    def _start_backup_recording(self):
-        self.backup_file = self.session_dir / "full_session_backup.wav"
-        cmd = [
-            "sox", "-d", "-c", str(config.CHANNELS),
-            "-r", str(config.SAMPLE_RATE), "-b", "16",
-            str(self.backup_file),
-        ]
-        self.backup_process = subprocess.Popen(
-            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-        )
-
-    def _stop_backup_recording(self):
-        if self.backup_process:
-            self.backup_process.terminate()
-            try:
-                self.backup_process.wait(timeout=2)
-            except subprocess.TimeoutExpired:
-                self.backup_process.kill()
-            self.backup_process = None
-
     def _start_recording(self) -> Path:
+        """Start capturing the backup and the first chunk."""
         output_path = self._get_chunk_path()
         self.chunk_start_time = datetime.now()  # Track when this chunk started
-        cmd = [
-            "sox", "-d", "-c", str(config.CHANNELS),
-            "-r", str(config.SAMPLE_RATE), "-b", "16",
-            str(output_path),
-        ]
-        self.recording_process = subprocess.Popen(
-            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-        )
+        self.capture.start(output_path)
         return output_path
 
-    def _stop_recording(self) -> tuple[Optional[Path], Optional[datetime]]:
-        """Stop recording and return (path, start_time) tuple."""
-        if self.recording_process is None:
-            return None, None
+    def _stop_recording(self, final: bool = False) -> tuple[Optional[Path], Optional[datetime], Optional[bytes]]:
+        """Cut the current chunk (or stop capturing if final) and return (path, start_time, pcm)."""
+        if self.capture.process is None:
+            return None, None, None
 
         current_path = self._get_chunk_path()
         start_time = self.chunk_start_time
-        self.recording_process.terminate()
-        try:
-            self.recording_process.wait(timeout=2)
-        except subprocess.TimeoutExpired:
-            self.recording_process.kill()
-            self.recording_process.wait()
+        cut_started = time.perf_counter()
+        if final:
+            pcm = self.capture.stop()
+        else:
+            pcm = self.capture.cut(self.session_dir / f"chunk_{self.chunk_number + 1:04d}.wav")
+            self.chunk_start_time = datetime.now()
 
-        self.recording_process = None
+        self.metrics.timing(metrics.CUT, time.perf_counter() - cut_started, chunk=self.chunk_number)
+        if start_time:
+            self.metrics.gauge(metrics.CAPTURE, "chunk_seconds",
+                               (datetime.now() - start_time).total_seconds(), chunk=self.chunk_number)
         self.chunk_number += 1
 
-        if current_path.exists() and current_path.stat().st_size > 1000:
-            return current_path, start_time
-        return None, None
+        if pcm is None or len(pcm) > 1000:
+            import catalog
+            catalog.get().chunk_recorded(self.session_id, self.chunk_number - 1, current_path, start_time)
+            return current_path, start_time, pcm
+        return None, None, None
 
-    def _process_chunk_background(self, chunk_path: Path, chunk_num: int, chunk_start: datetime):
-        self._pending_chunks += 1
+    def _queue_chunk(self, chunk_path: Path, chunk_num: int, pcm: Optional[bytes] = None):
+        """Register a cut chunk with the pipeline before its thread starts."""
+        self.pipeline.add(chunk_num, capture.pcm_seconds(pcm) if pcm is not None else wav_duration(chunk_path))
+
+    def _process_chunk_background(self, chunk_path: Path, chunk_num: int, chunk_start: datetime,
+                                  pcm: Optional[bytes] = None):
         try:
             if self.on_chunk_ready:
-                self.on_chunk_ready(chunk_path, chunk_num, chunk_start)
-            self._completed_chunks += 1
+                self.on_chunk_ready(chunk_path, chunk_num, chunk_start, pcm)
+            # Callbacks that don't report a final stage count as done
+            if self.pipeline.stage_of(chunk_num) is not None:
+                self.pipeline.set_stage(chunk_num, pipeline_state.DONE)
         except Exception as e:
-            self._status_message = f"Error on chunk {chunk_num}: {str(e)[:30]}"
-        finally:
-            self._pending_chunks -= 1
+            self.pipeline.set_stage(chunk_num, pipeline_state.FAILED, str(e)[:30])
+
+    def _pipeline_rows(self, table: Table):
+        """Per-chunk stages and throughput figures."""
+        snap = self.pipeline.snapshot()
+
+        if snap.active:
+            now = time.monotonic()
+            colors = {
+                pipeline_state.QUEUED: "dim",
+                pipeline_state.TRANSCRIBING: "yellow",
+                pipeline_state.MINUTES: "cyan",
+            }
+            stages = "  ".join(
+                f"[{colors.get(c.stage, 'white')}]#{c.number} {c.stage} {now - c.stage_since:.0f}s"
+                f"[/{colors.get(c.stage, 'white')}]"
+                for c in snap.active[:4]
+            )
+            if len(snap.active) > 4:
+                stages += f"  [dim]+{len(snap.active) - 4} more[/dim]"
+            table.add_row("Pipeline", Text.from_markup(stages))
+        else:
+            table.add_row("Pipeline", Text.from_markup("[green]Ready[/green]"))
+
+        done = f"{snap.completed} done"
+        if snap.offline:
+            done += f", [yellow]{snap.offline} queued-offline[/yellow]"
+        if snap.failed:
+            done += f", [red]{snap.failed} failed[/red]"
+        table.add_row("Chunks", Text.from_markup(done))
+
+        # Whisper slower than real time means the backlog can only grow
+        if snap.rtf is not None:
+            color = "green" if snap.rtf < 0.5 else "yellow" if snap.rtf < 1.0 else "red"
+            table.add_row("Whisper", Text.from_markup(f"[{color}]{snap.rtf:.2f}x real time[/{color}]"))
+        if snap.api_latency is not None:
+            table.add_row("API", f"{snap.api_latency:.1f}s per update")
+
+        if snap.active:
+            color = "red" if snap.backlog_age > config.PIPELINE_BEHIND_SECONDS else "yellow"
+            backlog = f"[{color}]oldest {snap.backlog_age:.0f}s, {snap.backlog_audio:.0f}s audio pending[/{color}]"
+            table.add_row("Backlog", Text.from_markup(backlog))
+            if snap.catch_up is not None:
+                table.add_row("Catch-up", f"~{snap.catch_up:.0f}s")
+
+        if snap.last_error:
+            table.add_row("Error", Text(snap.last_error[:50], style="red"))
+        return snap
 
     def _build_display(self) -> Panel:
         """Build the rich display panel."""
@@ -202,16 +242,13 @@ class UIRecorder:
         level_bar = "".join(bar_chars)
         table.add_row("Level", Text.from_markup(level_bar))
 
-        # Processing status
-        if self._pending_chunks > 0:
-            status = f"[yellow]Processing {self._pending_chunks} chunk(s)...[/yellow]"
-        else:
-            status = "[green]Ready[/green]"
-        table.add_row("Status", Text.from_markup(status))
+        # Processing pipeline
+        snap = self._pipeline_rows(table)
 
         # Last transcript preview
-        if self._last_transcript:
-            preview = self._last_transcript[:45] + "..." if len(self._last_transcript) > 45 else self._last_transcript
+        if snap.last_transcript:
+            last = snap.last_transcript
+            preview = last[:45] + "..." if len(last) > 45 else last
             table.add_row("Last", preview)
 
         # Controls
@@ -233,67 +270,71 @@ class UIRecorder:
             box=box.ROUNDED
         )
 
+    def _poll_key(self, timeout: float) -> Optional[str]:
+        """A key pressed within timeout seconds, or None."""
+        if self.key_source:
+            return self.key_source(timeout)
+        import select
+        if select.select([sys.stdin], [], [], timeout)[0]:
+            return sys.stdin.read(1)
+        return None
+
     def run(self, meeting_name: str = "Meeting"):
         """Main recording loop with UI."""
         self.running = True
 
-        # Start backup and first chunk
-        self._start_backup_recording()
+        # Start capturing: backup and first chunk
         self._start_recording()
         self.level_monitor.start()
 
         # Set up keyboard input
-        import tty
-        import termios
-        old_settings = termios.tcgetattr(sys.stdin)
+        old_settings = None
+        if self.key_source is None:
+            import tty
+            import termios
+            old_settings = termios.tcgetattr(sys.stdin)
 
         try:
-            tty.setcbreak(sys.stdin.fileno())  # Use cbreak instead of raw for better compat
+            if old_settings:
+                tty.setcbreak(sys.stdin.fileno())  # Use cbreak instead of raw for better compat
 
             with Live(self._build_display(), console=self.console, refresh_per_second=15) as live:
                 while self.running:
-                    live.update(self._build_display())
+                    with profiler.stage("ui.build_display"):
+                        live.update(self._build_display())
 
                     # Non-blocking key check
-                    import select
-                    if select.select([sys.stdin], [], [], 0.05)[0]:
-                        key = sys.stdin.read(1)
-
+                    key = self._poll_key(0.05)
+                    if key:
                         if key == ' ':
                             # Cut chunk
                             current_chunk_num = self.chunk_number
-                            chunk_path, chunk_start = self._stop_recording()
-                            self._start_recording()
+                            chunk_path, chunk_start, pcm = self._stop_recording()
 
                             if chunk_path and chunk_start:
-                                thread = threading.Thread(
-                                    target=self._process_chunk_background,
-                                    args=(chunk_path, current_chunk_num, chunk_start),
-                                    daemon=False
-                                )
-                                thread.start()
-                                self._processing_threads.append(thread)
+                                self._queue_chunk(chunk_path, current_chunk_num, pcm)
+                                self.jobs.start(self._process_chunk_background, chunk_path,
+                                                current_chunk_num, chunk_start, pcm)
+                            profiler.checkpoint()
 
                         elif key.lower() == 'q' or ord(key) == 3:
                             self.running = False
 
         finally:
-            termios.tcsetattr(sys.stdin, termios.TCSADRAIN, old_settings)
+            if old_settings:
+                termios.tcsetattr(sys.stdin, termios.TCSADRAIN, old_settings)
             self.level_monitor.stop()
 
-            # Stop final recording
-            final_chunk, final_start = self._stop_recording()
+            # Stop capturing (final chunk and backup)
+            final_chunk, final_start, final_pcm = self._stop_recording(final=True)
+            self.checkpointer.stop()
             if final_chunk and final_start and self.on_chunk_ready:
-                self._process_chunk_background(final_chunk, self.chunk_number - 1, final_start)
-
-            self._stop_backup_recording()
+                self._queue_chunk(final_chunk, self.chunk_number - 1, final_pcm)
+                self.jobs.start(self._process_chunk_background, final_chunk, self.chunk_number - 1,
+                                final_start, final_pcm)
 
-            # Wait for pending threads
-            pending = [t for t in self._processing_threads if t.is_alive()]
-            if pending:
-                self.console.print(f"\n[yellow]Waiting for {len(pending)} chunk(s)...[/yellow]")
-                for t in pending:
-                    t.join(timeout=120)
+            # One deadline for everything still processing; the rest is saved for process-queue
+            self.jobs.shutdown(notify=lambda message: self.console.print(f"\n[yellow]{message}[/yellow]"))
 
             # Final summary
             backup_size = ""
@@ -314,7 +355,7 @@ class UIRecorder:
 
 def test_ui():
     """Test the UI recorder."""
-    def on_chunk(path, num, start_time):
+    def on_chunk(path, num, start_time, pcm=None):
         time.sleep(2)  # Simulate processing
         print(f"Processed: {path} (started at {start_time})")
 
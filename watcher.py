@@ -0,0 +1,340 @@
+"""Headless watch-folder ingestion.
+
+Recordings dropped into the inbox (config.INBOX_DIR) by a room recorder or
+a file sync are picked up once their size has stopped changing, then run
+through transcription and minutes generation on a shared worker pool.
+
+Job state is kept in data/watch_jobs.json so a restarted watcher resumes
+interrupted jobs and never processes the same file twice:
+
+    {"/path/inbox/board.m4a": {"status": "done", "session_id": "20260210_193400", ...}}
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+import catalog
+import config
+
+# Job states
+PENDING = "pending"
+CONVERTING = "converting"
+TRANSCRIBING = "transcribing"
+MINUTES = "minutes"
+DONE = "done"
+FAILED = "failed"
+
+RUNNING_STATES = (CONVERTING, TRANSCRIBING, MINUTES)
+
+
+class JobStore:
+    """Durable per-file job state, saved atomically on every change."""
+
+    def __init__(self, path: Path = None):
+        self.path = path or config.WATCH_JOBS_FILE
+        self._lock = threading.Lock()
+        self.jobs: dict[str, dict] = {}
+        if self.path.exists():
+            try:
+                self.jobs = json.loads(self.path.read_text())
+            except Exception as e:
+                print(f"  [Warning] Could not read job state {self.path}: {e}")
+
+        # Jobs interrupted by a crash or shutdown start over
+        for job in self.jobs.values():
+            if job["status"] in RUNNING_STATES:
+                job["status"] = PENDING
+
+    def _save(self, key: Optional[str] = None):
+        config.ensure_dir(self.path.parent)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.jobs, indent=2))
+        os.replace(tmp, self.path)
+        if key:
+            job = self.jobs[key]
+            catalog.get().set_job(key, "watch", job["status"], job.get("session_id"), job.get("error", ""))
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            job = self.jobs.get(key)
+            return dict(job) if job else None
+
+    def add(self, key: str, size: int, mtime: float):
+        with self._lock:
+            self.jobs[key] = {
+                "status": PENDING, "size": size, "mtime": mtime,
+                "session_id": None, "attempts": 0, "error": "",
+                "added": datetime.now().isoformat(timespec="seconds"),
+            }
+            self._save(key)
+
+    def update(self, key: str, **fields):
+        with self._lock:
+            self.jobs[key].update(fields, updated=datetime.now().isoformat(timespec="seconds"))
+            self._save(key)
+
+    def pending(self) -> list[str]:
+        with self._lock:
+            return [k for k, job in self.jobs.items()
+                    if job["status"] == PENDING
+                    or (job["status"] == FAILED and job["attempts"] < config.WATCH_MAX_ATTEMPTS)]
+
+
+def is_audio(path: Path) -> bool:
+    return (path.is_file() and not path.name.startswith(".")
+            and path.suffix.lower() in config.WATCH_EXTENSIONS)
+
+
+def convert_to_wav(source: Path, dest: Path):
+    """Convert any input to 16 kHz mono WAV (ffmpeg if present, else sox)."""
+    if shutil.which("ffmpeg"):
+        cmd = ["ffmpeg", "-nostdin", "-y", "-loglevel", "error", "-i", str(source),
+               "-ar", str(config.SAMPLE_RATE), "-ac", str(config.CHANNELS), str(dest)]
+    else:
+        cmd = [config.SOX_BIN, str(source), "-c", str(config.CHANNELS),
+               "-r", str(config.SAMPLE_RATE), "-b", "16", str(dest)]
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
+    if result.returncode != 0 or not dest.exists():
+        raise RuntimeError(f"{cmd[0]} failed: {result.stderr.strip()[:200]}")
+
+
+def split_wav(path: Path, chunk_seconds: float, out_dir: Path) -> list[Path]:
+    """Split a WAV into chunk_seconds pieces named chunk_NNNN.wav (0 = keep whole)."""
+    if not chunk_seconds:
+        return [path]
+    chunks = []
+    with wave.open(str(path), "rb") as src:
+        per_chunk = int(chunk_seconds * src.getframerate())
+        i = 0
+        while True:
+            frames = src.readframes(per_chunk)
+            if not frames:
+                break
+            chunk = out_dir / f"chunk_{i:04d}.wav"
+            with wave.open(str(chunk), "wb") as out:
+                out.setparams(src.getparams())
+                out.writeframes(frames)
+            chunks.append(chunk)
+            i += 1
+    return chunks
+
+
+def new_session_id(started: datetime) -> str:
+    """Session id from the recording's timestamp, bumped a second if already taken."""
+    while True:
+        session_id = started.strftime("%Y%m%d_%H%M%S")
+        session_dir = config.AUDIO_DIR / session_id
+        try:
+            session_dir.mkdir(parents=True)
+            return session_id
+        except FileExistsError:
+            started += timedelta(seconds=1)
+
+
+class StableFiles:
+    """Tracks files in a folder and reports those that have stopped growing."""
+
+    def __init__(self, stable_seconds: float = None):
+        self.stable_seconds = config.WATCH_STABLE_SECONDS if stable_seconds is None else stable_seconds
+        self._sizes: dict[str, tuple[int, float, float]] = {}  # key -> (size, mtime, stable since)
+
+    def scan(self, folder: Path) -> list[Path]:
+        """Audio files in folder whose size and mtime haven't changed for stable_seconds."""
+        now = time.monotonic()
+        ready = []
+        seen = set()
+        for path in sorted(folder.iterdir()):
+            if not is_audio(path):
+                continue
+            key = str(path.resolve())
+            seen.add(key)
+            stat = path.stat()
+            previous = self._sizes.get(key)
+            if previous is None or previous[:2] != (stat.st_size, stat.st_mtime):
+                self._sizes[key] = (stat.st_size, stat.st_mtime, now)
+                if self.stable_seconds > 0:
+                    continue
+                previous = self._sizes[key]
+            if now - previous[2] >= self.stable_seconds:
+                ready.append(path)
+
+        # Forget files that disappeared
+        for key in set(self._sizes) - seen:
+            del self._sizes[key]
+        return ready
+
+    def __iter__(self):
+        return iter(self._sizes)
+
+
+class InboxWatcher:
+    """Polls the inbox and schedules complete files on a worker pool."""
+
+    def __init__(self, inbox: Path = None, workers: int = None, model: str = config.WHISPER_MODEL,
+                 jobs: Optional[JobStore] = None):
+        from transcriber import Transcriber
+
+        self.inbox = config.ensure_dir(inbox or config.INBOX_DIR)
+        self.processed_dir = self.inbox / "processed"
+        self.workers = workers or config.WATCH_WORKERS
+        self.transcriber = Transcriber(model=model)
+        self.jobs = jobs or JobStore()
+        self.files = StableFiles()
+        self._scheduled: set[str] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def scan(self) -> list[Path]:
+        """Register stable inbox files as jobs. Returns the stable files."""
+        ready = self.files.scan(self.inbox)
+        for path in ready:
+            key = str(path.resolve())
+            stat = path.stat()
+            job = self.jobs.get(key)
+            if job is None or (job["size"], job["mtime"]) != (stat.st_size, stat.st_mtime):
+                # New file, or the same name replaced with a new recording
+                self.jobs.add(key, stat.st_size, stat.st_mtime)
+        return ready
+
+    def process(self, key: str):
+        """
+        Convert an inbox file, then transcribe it in CHUNK_DURATION_SECONDS
+        chunks with a minutes update per chunk. A retried job picks up after
+        the last chunk it finished (job["chunks_done"]).
+        """
+        from minutes_generator import MinutesGenerator, OfflineMinutesStore, find_session_minutes, open_session
+        from transcriber import TranscriptManager, wav_duration
+
+        source = Path(key)
+        job = self.jobs.get(key)
+        self.jobs.update(key, attempts=job["attempts"] + 1, error="")
+        try:
+            # Recorders write the file as they go, so mtime marks the end of the meeting
+            session_id = job.get("session_id")
+            if not session_id:
+                session_id = new_session_id(datetime.fromtimestamp(job["mtime"]))
+                self.jobs.update(key, session_id=session_id)
+            session_dir = config.ensure_dir(config.AUDIO_DIR / session_id)
+            wav_path = session_dir / "full_session_backup.wav"
+            ended = datetime.fromtimestamp(job["mtime"])
+
+            self.jobs.update(key, status=CONVERTING)
+            convert_to_wav(source, wav_path)
+            duration = wav_duration(wav_path)
+            started = ended - timedelta(seconds=duration)
+            chunks = split_wav(wav_path, config.CHUNK_DURATION_SECONDS, session_dir)
+
+            done = job.get("chunks_done", 0)
+            gen, store = None, OfflineMinutesStore(session_id)
+            for chunk_num, chunk_path in enumerate(chunks):
+                if chunk_num < done:
+                    continue  # Transcribed and minuted before a retry
+                self.jobs.update(key, status=TRANSCRIBING)
+                chunk_start = started + timedelta(seconds=chunk_num * config.CHUNK_DURATION_SECONDS)
+                result = self.transcriber.transcribe(chunk_path, output_dir=config.TRANSCRIPTS_DIR / session_id,
+                                                     chunk_start_time=chunk_start)
+                if result.get("error"):
+                    raise RuntimeError(f"chunk {chunk_num}: {result['error'][:200]}")
+                text = result.get("timestamped_text") or result.get("text", "")
+
+                if text.strip():
+                    TranscriptManager(session_id).append(text, chunk_num)
+
+                    self.jobs.update(key, status=MINUTES)
+                    if gen is None:
+                        # A retry continues the minutes written before it failed
+                        if done:
+                            gen = open_session(session_id)
+                        else:
+                            gen = MinutesGenerator(source.stem, session_id=session_id, session_start=started)
+                        gen.offline_queue = store.load_queue()
+                    gen.update_minutes(text, chunk_num)
+                    store.save_queue(gen.offline_queue)
+                self.jobs.update(key, chunks_done=chunk_num + 1)
+
+            if gen is None and done and find_session_minutes(session_id)[0]:
+                gen = open_session(session_id)  # Retry whose remaining chunks had no speech
+            minutes = "no speech"
+            if gen is not None:
+                gen.finalize(ended=ended)
+                minutes = "queued-offline" if store.load_queue() else "updated"
+
+            self.jobs.update(key, status=DONE, minutes=minutes, chunks=len(chunks),
+                             audio_seconds=round(duration, 1))
+            self._archive_source(source)
+            print(f"✅ {source.name} → session {session_id} (minutes {minutes})")
+
+        except Exception as e:
+            self.jobs.update(key, status=FAILED, error=str(e)[:300])
+            print(f"❌ {source.name}: {e}")
+        finally:
+            with self._lock:
+                self._scheduled.discard(key)
+
+    def _archive_source(self, source: Path):
+        """Move a processed file out of the inbox."""
+        try:
+            config.ensure_dir(self.processed_dir)
+            source.rename(self.processed_dir / source.name)
+        except Exception as e:
+            print(f"  [Warning] Could not move {source.name} to processed/: {e}")
+
+    def run(self, once: bool = False):
+        """Poll until stopped (or, with once, until the inbox is drained)."""
+        print(f"👀 Watching {self.inbox} ({self.workers} worker(s), Ctrl+C to stop)")
+        if config.ARCHIVE_BACKGROUND and not once:
+            import archiver
+            archiver.start_background()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="watch") as pool:
+            try:
+                while not self._stop.is_set():
+                    self.scan()
+                    for key in self.jobs.pending():
+                        if not Path(key).exists():
+                            continue
+                        with self._lock:
+                            if key in self._scheduled:
+                                continue
+                            self._scheduled.add(key)
+                        pool.submit(self.process, key)
+
+                    if once and not self._scheduled and not self._unsettled():
+                        break
+                    # In once mode, re-check quickly for newly stable files
+                    self._stop.wait(1 if once else config.WATCH_POLL_SECONDS)
+            except KeyboardInterrupt:
+                print("\nStopping: waiting for running jobs to finish...")
+                self._stop.set()
+
+    def _unsettled(self) -> bool:
+        """Whether inbox files are still waiting to become stable or be queued."""
+        for key in self.files:
+            job = self.jobs.get(key)
+            if job is None or job["status"] == PENDING or job["status"] in RUNNING_STATES:
+                return True
+        return False
+
+    def stop(self):
+        self._stop.set()
+
+
+def print_jobs(jobs: Optional[JobStore] = None):
+    """Summarize watcher job state."""
+    jobs = jobs or JobStore()
+    if not jobs.jobs:
+        print("No watch jobs recorded.")
+        return
+    for key, job in sorted(jobs.jobs.items(), key=lambda kv: kv[1].get("added", "")):
+        line = f"{job['status']:<13} {Path(key).name:<40} {job.get('session_id') or '-'}"
+        if job.get("error"):
+            line += f"  ({job['error'][:60]})"
+        print(line)
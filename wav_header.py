@@ -0,0 +1,105 @@
+"""WAV header checkpoints and repair.
+
+sox writes a placeholder RIFF header and fills in the real sizes only when
+it exits cleanly. After a power cut or kill -9 the backup recording and the
+in-flight chunk are left with lengths that don't match their audio, so the
+wave module and whisper see a truncated (or empty) file.
+
+HeaderCheckpointer rewrites the two size fields of files that are still
+being recorded every few seconds, so at most the last checkpoint interval
+is unaccounted for after a crash; repair() fixes any file from its size.
+"""
+
+import struct
+import threading
+from pathlib import Path
+from typing import Optional
+
+import config
+
+
+def _data_chunk(f) -> Optional[tuple[int, int]]:
+    """(offset of the data size field, block align) for an open WAV file, or None."""
+    f.seek(0)
+    riff = f.read(12)
+    if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+        return None
+    block_align = 1
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            return None
+        chunk_id, size = header[:4], struct.unpack("<I", header[4:])[0]
+        if chunk_id == b"data":
+            return f.tell() - 4, block_align
+        body = f.read(size + (size & 1))  # Chunks are word aligned
+        if chunk_id == b"fmt " and len(body) >= 14:
+            block_align = struct.unpack("<H", body[12:14])[0] or 1
+
+
+def repair(path: Path) -> bool:
+    """Set the RIFF and data sizes from the file's actual length. Returns True if the header changed."""
+    try:
+        with open(path, "r+b") as f:
+            found = _data_chunk(f)
+            if found is None:
+                return False
+            size_offset, block_align = found
+            file_size = f.seek(0, 2)
+            data_start = size_offset + 4
+            # Whole frames only; a torn final sample is dropped
+            data_size = max(file_size - data_start, 0) // block_align * block_align
+
+            f.seek(size_offset)
+            if struct.unpack("<I", f.read(4))[0] == data_size:
+                f.seek(4)
+                if struct.unpack("<I", f.read(4))[0] == data_start - 8 + data_size:
+                    return False
+            f.seek(size_offset)
+            f.write(struct.pack("<I", data_size))
+            f.seek(4)
+            f.write(struct.pack("<I", data_start - 8 + data_size))
+            return True
+    except OSError as e:
+        print(f"  [Warning] Could not repair WAV header of {path.name}: {e}")
+        return False
+
+
+class HeaderCheckpointer:
+    """Background thread that keeps the headers of files being recorded up to date."""
+
+    def __init__(self, interval: float = None):
+        self.interval = config.WAV_CHECKPOINT_SECONDS if interval is None else interval
+        self._paths: set[Path] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(self, path: Path):
+        """Checkpoint path until unwatch() (start the thread on first use)."""
+        if self.interval <= 0:
+            return
+        with self._lock:
+            self._paths.add(path)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="wav-checkpoint", daemon=True)
+                self._thread.start()
+
+    def unwatch(self, path: Path):
+        """Stop checkpointing path. Call before stopping its writer, so a late
+        checkpoint can't overwrite the final header the writer puts down."""
+        with self._lock:
+            self._paths.discard(path)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            # Held while writing, so unwatch() waits for an in-progress checkpoint
+            with self._lock:
+                for path in self._paths:
+                    if path.exists():
+                        repair(path)
+
+    def stop(self):
+        self._stop.set()
+        with self._lock:
+            self._paths.clear()